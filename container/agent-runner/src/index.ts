@@ -3,7 +3,9 @@
  * Runs inside a container, receives config via stdin, outputs result to stdout
  *
  * Input protocol:
- *   Stdin: Full ContainerInput JSON (read until EOF, like before)
+ *   Stdin: Full ContainerInput JSON (read until EOF, like before). "ready" is
+ *          logged to stderr first, so a pre-started (warm) container can be
+ *          held until the host hands it a group.
  *   IPC:   Follow-up messages written as JSON files to /workspace/ipc/input/
  *          Files: {type:"message", text:"..."}.json — polled and consumed
  *          Sentinel: /workspace/ipc/input/_close — signals session end
@@ -26,6 +28,7 @@ interface ContainerInput {
   chatJid: string;
   isMain: boolean;
   isScheduledTask?: boolean;
+  env?: Record<string, string>;
 }
 
 interface ContainerOutput {
@@ -54,6 +57,7 @@ interface SDKUserMessage {
 }
 
 const IPC_INPUT_DIR = '/workspace/ipc/input';
+const ENV_FILE = '/workspace/env';
 const IPC_INPUT_CLOSE_SENTINEL = path.join(IPC_INPUT_DIR, '_close');
 const IPC_POLL_MS = 500;
 
@@ -103,8 +107,9 @@ async function readStdin(): Promise<string> {
   });
 }
 
-const OUTPUT_START_MARKER = '---NGB_OUTPUT_START---';
-const OUTPUT_END_MARKER = '---NGB_OUTPUT_END---';
+// Must match OUTPUT_START_MARKER / OUTPUT_END_MARKER in container_runner.py
+const OUTPUT_START_MARKER = '---NANOGRIDBOT_OUTPUT_START---';
+const OUTPUT_END_MARKER = '---NANOGRIDBOT_OUTPUT_END---';
 
 function writeOutput(output: ContainerOutput): void {
   console.log(OUTPUT_START_MARKER);
@@ -116,6 +121,25 @@ function log(message: string): void {
   console.error(`[agent-runner] ${message}`);
 }
 
+/**
+ * Apply the group's environment. Warm containers are started before the
+ * group is known, so the env file and variables are read with the input
+ * rather than at container start.
+ */
+function applyInputEnv(containerInput: ContainerInput): void {
+  if (fs.existsSync(ENV_FILE) && fs.statSync(ENV_FILE).isFile()) {
+    for (const line of fs.readFileSync(ENV_FILE, 'utf-8').split('\n')) {
+      const trimmed = line.trim();
+      const eq = trimmed.indexOf('=');
+      if (!trimmed || trimmed.startsWith('#') || eq <= 0) continue;
+      process.env[trimmed.slice(0, eq)] = trimmed.slice(eq + 1);
+    }
+  }
+  for (const [key, value] of Object.entries(containerInput.env ?? {})) {
+    process.env[key] = value;
+  }
+}
+
 function getSessionSummary(sessionId: string, transcriptPath: string): string | null {
   const projectDir = path.dirname(transcriptPath);
   const indexPath = path.join(projectDir, 'sessions-index.json');
@@ -448,9 +472,12 @@ async function main(): Promise<void> {
   let containerInput: ContainerInput;
 
   try {
+    log('ready');
     const stdinData = await readStdin();
     containerInput = JSON.parse(stdinData);
-    log(`Received input for group: ${containerInput.groupFolder}`);
+    // The host derives start latency from this timestamp
+    log(`Received input for group: ${containerInput.groupFolder} (at ${Date.now()})`);
+    applyInputEnv(containerInput);
   } catch (err) {
     writeOutput({
       status: 'error',
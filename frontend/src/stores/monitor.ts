@@ -18,6 +18,12 @@ export interface SystemStatus {
     pendingTasks: number;
     containerName: string | null;
     displayName: string | null;
+    queued?: boolean;
+    queueDepth?: number;
+    waitingSeconds?: number;
+    avgWaitSeconds?: number;
+    retriesRemaining?: number | null;
+    nextRetryAt?: string | null;
   }>;
 }
 
@@ -13,6 +13,12 @@ if TYPE_CHECKING:
 class Channel(ABC, EventEmitter):
     """Abstract base class for messaging channel implementations."""
 
+    # Longest message the platform accepts, in characters; None if unlimited
+    max_message_length: int | None = None
+
+    # Times the platform lets one message be edited; None if unlimited
+    max_edits: int | None = None
+
     def __init__(self, channel_type: ChannelType) -> None:
         """Initialize the channel.
 
@@ -33,6 +39,27 @@ class Channel(ABC, EventEmitter):
         """Check if the channel is currently connected."""
         return self._connected
 
+    @property
+    def name(self) -> str:
+        """Get the channel name."""
+        return self._channel_type.value
+
+    @property
+    def supports_edit(self) -> bool:
+        """Check if the channel can edit messages it has sent."""
+        return type(self).edit_message is not Channel.edit_message
+
+    def owns_jid(self, jid: str) -> bool:
+        """Check if a JID belongs to this channel.
+
+        Args:
+            jid: The JID to check.
+
+        Returns:
+            True if the JID carries this channel's prefix.
+        """
+        return jid.startswith(f"{self._channel_type.value}:")
+
     @abstractmethod
     async def connect(self) -> None:
         """Establish connection to the messaging platform.
@@ -63,6 +90,34 @@ class Channel(ABC, EventEmitter):
         """
         ...
 
+    async def edit_message(self, chat_jid: str, message_id: str, content: str) -> None:
+        """Replace the content of a message sent earlier.
+
+        Channels that can edit messages override this together with
+        ``edit_interval``.
+
+        Args:
+            chat_jid: The JID of the chat the message was sent to.
+            message_id: The message ID returned by ``send_message``.
+            content: The new message content.
+
+        Raises:
+            NotImplementedError: If the platform cannot edit messages.
+            RuntimeError: If not connected.
+        """
+        raise NotImplementedError(f"{self.name} channel cannot edit messages")
+
+    def edit_interval(self, chat_jid: str) -> float:
+        """Get the minimum time between edits of one message.
+
+        Args:
+            chat_jid: The JID of the chat the message was sent to.
+
+        Returns:
+            Seconds to wait between edits to stay within rate limits.
+        """
+        return 1.0
+
     @abstractmethod
     async def receive_message(self, raw_data: dict[str, Any]) -> Message | None:
         """Parse and convert raw platform message to Message model.
@@ -13,6 +13,8 @@ from .base import Channel, ChannelRegistry
 class DiscordChannel(Channel):
     """Discord channel implementation using discord.py."""
 
+    max_message_length = 2000
+
     def __init__(
         self,
         channel_type: ChannelType = ChannelType.DISCORD,
@@ -102,6 +104,46 @@ class DiscordChannel(Channel):
         await self._on_message_sent(str(sent.id), chat_jid, content)
         return str(sent.id)
 
+    async def edit_message(self, chat_jid: str, message_id: str, content: str) -> None:
+        """Replace the content of a message sent to a Discord channel.
+
+        Args:
+            chat_jid: The JID of the chat (format: discord:channel:123456789).
+            message_id: The message ID returned by send_message.
+            content: The new message content.
+        """
+        if not self._client:
+            raise RuntimeError("Discord channel not connected")
+
+        _, resource = self.parse_jid(chat_jid)
+        if not resource:
+            raise ValueError(f"Invalid Discord JID: {chat_jid}")
+
+        channel = self._client.get_channel(int(resource))
+        if not channel or not isinstance(channel, discord.abc.Messageable):
+            raise ValueError(f"Cannot find channel: {resource}")
+
+        # A partial message edits without fetching the message first
+        get_partial = getattr(channel, "get_partial_message", None)
+        if get_partial is not None:
+            message = get_partial(int(message_id))
+        else:
+            message = await channel.fetch_message(int(message_id))
+        await message.edit(content=content)
+
+    def edit_interval(self, chat_jid: str) -> float:
+        """Get the minimum time between edits of one Discord message.
+
+        Discord allows five message edits per five seconds in a channel.
+
+        Args:
+            chat_jid: The JID of the chat.
+
+        Returns:
+            Seconds between edits.
+        """
+        return 1.0
+
     async def receive_message(self, raw_data: dict[str, Any]) -> Message | None:
         """Parse and convert raw Discord message to Message model.
 
@@ -1,5 +1,6 @@
 """Feishu (Lark) channel implementation using lark-oapi SDK."""
 
+import json
 from datetime import datetime
 from typing import Any
 
@@ -14,6 +15,10 @@ from .base import Channel, ChannelRegistry
 class FeishuChannel(Channel):
     """Feishu (Lark) channel implementation using lark-oapi SDK."""
 
+    max_message_length = 30000
+    # Feishu lets a text message be edited at most 20 times
+    max_edits = 20
+
     def __init__(
         self,
         channel_type: ChannelType = ChannelType.FEISHU,
@@ -89,6 +94,35 @@ class FeishuChannel(Channel):
 
         return response.data.message_id if response.data else ""
 
+    async def edit_message(self, chat_jid: str, message_id: str, content: str) -> None:
+        """Replace the text of a message sent to a Feishu chat.
+
+        Args:
+            chat_jid: The JID of the chat (format: feishu:open_id).
+            message_id: The message ID returned by send_message.
+            content: The new message content.
+        """
+        if not self._client:
+            raise RuntimeError("Feishu channel not connected")
+
+        from lark_oapi.api.im.v1 import UpdateMessageRequest, UpdateMessageRequestBody
+
+        request = (
+            UpdateMessageRequest.builder()
+            .message_id(message_id)
+            .request_body(
+                UpdateMessageRequestBody.builder()
+                .msg_type("text")
+                .content(json.dumps({"text": content}))
+                .build()
+            )
+            .build()
+        )
+        response = await self._client.im.v1.message.aupdate(request)
+
+        if response.code != 0:
+            raise RuntimeError(f"Failed to edit message: {response.msg}")
+
     async def receive_message(self, raw_data: dict[str, Any]) -> Message | None:
         """Parse and convert raw Feishu message to Message model.
 
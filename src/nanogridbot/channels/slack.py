@@ -15,6 +15,8 @@ from .base import Channel, ChannelRegistry
 class SlackChannel(Channel):
     """Slack channel implementation using python-slack-sdk (Socket Mode)."""
 
+    max_message_length = 40000
+
     def __init__(
         self,
         channel_type: ChannelType = ChannelType.SLACK,
@@ -135,6 +137,39 @@ class SlackChannel(Channel):
         await self._on_message_sent(ts, chat_jid, content)
         return ts
 
+    async def edit_message(self, chat_jid: str, message_id: str, content: str) -> None:
+        """Replace the text of a message sent to a Slack channel.
+
+        Args:
+            chat_jid: The JID of the chat.
+            message_id: The message timestamp returned by send_message.
+            content: The new message content.
+        """
+        if not self._web_client:
+            raise RuntimeError("Slack channel not connected")
+
+        channel_id, _ = self.parse_jid(chat_jid)
+
+        import asyncio
+
+        def _update():
+            self._web_client.chat_update(channel=channel_id, ts=message_id, text=content)
+
+        await asyncio.get_event_loop().run_in_executor(None, _update)
+
+    def edit_interval(self, chat_jid: str) -> float:
+        """Get the minimum time between edits of one Slack message.
+
+        chat.update is a Tier 3 method, about 50 calls per minute.
+
+        Args:
+            chat_jid: The JID of the chat.
+
+        Returns:
+            Seconds between edits.
+        """
+        return 1.2
+
     async def receive_message(self, raw_data: dict[str, Any]) -> Message | None:
         """Parse and convert raw Slack message to Message model.
 
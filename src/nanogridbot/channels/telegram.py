@@ -15,6 +15,8 @@ from .base import Channel, ChannelRegistry
 class TelegramChannel(Channel):
     """Telegram channel implementation using python-telegram-bot."""
 
+    max_message_length = 4096
+
     def __init__(
         self,
         channel_type: ChannelType = ChannelType.TELEGRAM,
@@ -93,6 +95,37 @@ class TelegramChannel(Channel):
         await self._on_message_sent(str(sent.message_id), chat_jid, content)
         return str(sent.message_id)
 
+    async def edit_message(self, chat_jid: str, message_id: str, content: str) -> None:
+        """Replace the text of a message sent to a Telegram chat.
+
+        Args:
+            chat_jid: The JID of the chat (format: telegram:123456789).
+            message_id: The message ID returned by send_message.
+            content: The new message content.
+        """
+        if not self._application:
+            raise RuntimeError("Telegram channel not connected")
+
+        _, user_id = self.parse_jid(chat_jid)
+        await self._application.bot.edit_message_text(
+            chat_id=int(user_id), message_id=int(message_id), text=content
+        )
+
+    def edit_interval(self, chat_jid: str) -> float:
+        """Get the minimum time between edits of one Telegram message.
+
+        Telegram allows about one message per second in a private chat and
+        20 per minute in a group; group chat IDs are negative.
+
+        Args:
+            chat_jid: The JID of the chat.
+
+        Returns:
+            Seconds between edits.
+        """
+        _, user_id = self.parse_jid(chat_jid)
+        return 3.0 if user_id.startswith("-") else 1.0
+
     async def receive_message(self, raw_data: dict[str, Any]) -> Message | None:
         """Parse and convert raw Telegram message to Message model.
 
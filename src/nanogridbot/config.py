@@ -79,14 +79,49 @@ class Config(BaseSettings):
     container_timeout: int = 300
     container_max_output_size: int = 100000
     container_max_concurrent_containers: int = 5
+    container_max_retries: int = 5  # Attempts per message run, including the first
+    container_retry_base_delay: float = 5.0  # Backoff before the first retry (s)
     container_image: str = "nanogridbot-agent:latest"
+    # Resource class (small/medium/large) for groups that do not set one
+    container_default_resource_class: str = "medium"
+    # Admit runs only while their resource classes fit the host's CPU and memory
+    container_admission_enabled: bool = True
+    container_cpu_overcommit: float = 2.0  # CPU reservations per host CPU
+    container_memory_reserve_mb: int = 512  # Memory kept free for the host
+    container_admission_downgrade: bool = True  # Run with a smaller class when busy
+    # Sample running containers' cgroup v2 CPU, memory and IO counters
+    container_resource_sampling_enabled: bool = True
+    container_resource_sample_interval: float = 5.0  # Seconds between samples
+    cgroup_root: Path = Path("/sys/fs/cgroup")
+    # Reuse validated mounts and docker commands while group config is unchanged
+    container_launch_cache_enabled: bool = True
+    # Mount one read-only skills snapshot into every container instead of
+    # copying skills into each group's session directory
+    skills_shared_mount: bool = False
+    # Talk to the Docker Engine API directly; falls back to the docker CLI
+    docker_api_enabled: bool = True
+    docker_socket: str = "/var/run/docker.sock"
+    # Warm pool of pre-started containers (needs root on Linux to bind mounts)
+    container_warm_pool_enabled: bool = False
+    container_warm_pool_min: int = 0
+    container_warm_pool_max: int = 4
+    container_warm_pool_max_idle: int = 600  # Recycle idle containers after (s)
+    # Long-lived per-group containers reused across turns
+    container_session_enabled: bool = False
+    container_session_max: int = 8  # Live session containers across all groups
+    container_session_pause_after: int = 60  # Freeze idle containers after (s)
+    container_session_idle_ttl: int = 600  # Stop idle containers after (s)
 
     # Assistant settings
     assistant_name: str = "Andy"
     trigger_pattern: str | None = None
+    # "send" posts each agent result as a message; "edit" posts a placeholder
+    # and edits it as results stream in, on channels that can edit messages
+    reply_delivery_mode: str = "send"
+    reply_placeholder: str = "…"
 
-    # Poll interval (ms)
-    poll_interval: int = 2000
+    # Catch-up sweep interval (ms); live messages are pushed by channels
+    poll_interval: int = 30000
 
     # Rate limiting
     max_messages_per_minute: int = 10
@@ -107,6 +142,7 @@ class Config(BaseSettings):
     message_cache_size: int = 1000
     batch_size: int = 100
     db_connection_pool_size: int = 5
+    max_concurrent_dispatches: int = 16
     ipc_file_buffer_size: int = 8192
 
     def __init__(self, **kwargs):
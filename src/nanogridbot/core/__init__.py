@@ -1,5 +1,6 @@
 """Core modules for NanoGridBot orchestration."""
 
+from nanogridbot.core.container_pool import WarmContainerPool
 from nanogridbot.core.container_runner import (
     build_docker_command,
     check_docker_available,
@@ -8,15 +9,23 @@ from nanogridbot.core.container_runner import (
     run_container_agent,
 )
 from nanogridbot.core.container_session import ContainerSession
+from nanogridbot.core.docker_api import DockerClient
+from nanogridbot.core.fair_scheduler import FairScheduler
 from nanogridbot.core.group_queue import GroupQueue, GroupState
 from nanogridbot.core.ipc_handler import IpcHandler
+from nanogridbot.core.message_inbox import MessageInbox
 from nanogridbot.core.mount_security import (
     check_path_traversal,
     get_allowed_mount_paths,
     validate_group_mounts,
 )
 from nanogridbot.core.orchestrator import Orchestrator
+from nanogridbot.core.output_stream import OutputStreamParser
+from nanogridbot.core.progressive_reply import ProgressiveReply
+from nanogridbot.core.resources import AdmissionController
 from nanogridbot.core.router import MessageRouter
+from nanogridbot.core.session_containers import SessionContainerManager
+from nanogridbot.core.skills_store import SkillsStore
 from nanogridbot.core.task_scheduler import TaskScheduler
 
 __all__ = [
@@ -25,15 +34,25 @@ __all__ = [
     # Group management
     "GroupQueue",
     "GroupState",
+    "FairScheduler",
+    "AdmissionController",
     # Task scheduling
     "TaskScheduler",
     # IPC
     "IpcHandler",
+    # Ingestion
+    "MessageInbox",
     # Routing
     "MessageRouter",
+    "ProgressiveReply",
     # Container
     "build_docker_command",
+    "WarmContainerPool",
+    "SessionContainerManager",
     "ContainerSession",
+    "DockerClient",
+    "OutputStreamParser",
+    "SkillsStore",
     "run_container_agent",
     "check_docker_available",
     "get_container_status",
@@ -0,0 +1,529 @@
+"""Warm pool of pre-started agent containers."""
+
+import asyncio
+import math
+import os
+import shutil
+import sys
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from nanogridbot.config import get_config
+from nanogridbot.core.docker_api import spawn_container
+from nanogridbot.core.resources import RESOURCE_CLASSES
+
+# Logged by the agent runner once it is booted and waiting for input
+READY_LINE = "[agent-runner] ready"
+
+# Container paths that are staged per slot, mapped to the staging subdirectory
+# bind-mounted over them; group mounts must live under one of these
+STAGED_ROOTS = {
+    "/workspace": "workspace",
+    "/home/node/.claude": "claude",
+}
+
+# How long demand is remembered when sizing the pool (seconds)
+DEMAND_WINDOW_SECONDS = 300.0
+
+# Assumed boot time before any container has been booted (seconds)
+DEFAULT_BOOT_SECONDS = 10.0
+
+# How long a booting container may take to report ready (seconds)
+BOOT_TIMEOUT_SECONDS = 120.0
+
+# Interval between pool maintenance passes (seconds)
+MAINTAIN_INTERVAL_SECONDS = 5.0
+
+
+class StartLatencyTracker:
+    """Keeps recent container start latencies and reports percentiles.
+
+    Start latency is the time from requesting a run to the agent runner
+    receiving its input, for cold (fresh ``docker run``) and warm (claimed
+    from the pool) starts.
+    """
+
+    def __init__(self, max_samples: int = 1000):
+        """Initialize the tracker.
+
+        Args:
+            max_samples: Samples kept per kind; older ones are dropped
+        """
+        self._samples: dict[str, deque[float]] = {
+            "cold": deque(maxlen=max_samples),
+            "warm": deque(maxlen=max_samples),
+        }
+
+    def record(self, kind: str, seconds: float) -> None:
+        """Record a start latency.
+
+        Args:
+            kind: "cold" or "warm"
+            seconds: Latency in seconds
+        """
+        self._samples[kind].append(seconds)
+
+    def percentile(self, kind: str, pct: float) -> float | None:
+        """Get a latency percentile using nearest-rank.
+
+        Args:
+            kind: "cold" or "warm"
+            pct: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, or None without samples
+        """
+        samples = sorted(self._samples[kind])
+        if not samples:
+            return None
+        rank = max(1, math.ceil(pct / 100 * len(samples)))
+        return samples[rank - 1]
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Get sample count, p50 and p99 per kind.
+
+        Returns:
+            Mapping of kind to its statistics
+        """
+        return {
+            kind: {
+                "count": len(samples),
+                "p50": self.percentile(kind, 50),
+                "p99": self.percentile(kind, 99),
+            }
+            for kind, samples in self._samples.items()
+        }
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        for samples in self._samples.values():
+            samples.clear()
+
+
+# Process-wide start latency statistics
+start_latency = StartLatencyTracker()
+
+
+@dataclass
+class WarmContainer:
+    """A pre-started agent container waiting for work."""
+
+    name: str
+    slot_dir: Path
+    process: asyncio.subprocess.Process
+    booted_at: float
+    binds: list[Path] = field(default_factory=list)
+
+    @property
+    def alive(self) -> bool:
+        """Check whether the container process is still running."""
+        return self.process.returncode is None
+
+
+def is_staged(container_path: str) -> bool:
+    """Check whether a container path lies under a staged root.
+
+    Args:
+        container_path: Path inside the container
+
+    Returns:
+        True if a mount at this path can be bound after the container starts
+    """
+    return any(
+        container_path == root or container_path.startswith(root + "/") for root in STAGED_ROOTS
+    )
+
+
+def staging_target(slot_dir: Path, container_path: str) -> Path | None:
+    """Map a container path to its location in a slot's staging directory.
+
+    Args:
+        slot_dir: Slot staging directory
+        container_path: Path inside the container
+
+    Returns:
+        Host path under the staging directory, or None if the container path
+        is not staged
+    """
+    for root, subdir in STAGED_ROOTS.items():
+        if container_path == root or container_path.startswith(root + "/"):
+            relative = container_path[len(root) :].lstrip("/")
+            return slot_dir / subdir / relative
+    return None
+
+
+def pool_supported() -> bool:
+    """Check whether the host can bind group mounts into running containers.
+
+    Binding at claim time needs ``mount`` and the privilege to use it.
+
+    Returns:
+        True if warm containers can be used
+    """
+    return (
+        sys.platform.startswith("linux")
+        and os.geteuid() == 0
+        and shutil.which("mount") is not None
+    )
+
+
+async def _run(*args: str) -> bool:
+    """Run a host command, discarding its output.
+
+    Args:
+        args: Command and arguments
+
+    Returns:
+        True if the command exited successfully
+    """
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await process.communicate()
+    except FileNotFoundError:
+        return False
+    if process.returncode != 0:
+        from loguru import logger
+
+        logger.debug(f"{' '.join(args)} failed: {stderr.decode(errors='replace').strip()}")
+        return False
+    return True
+
+
+class WarmContainerPool:
+    """Keeps generic agent containers booted so runs skip container start.
+
+    Each pooled container is started with per-slot staging directories
+    bind-mounted over ``/workspace`` and ``/home/node/.claude`` using slave
+    propagation. The agent runner boots and then blocks on stdin, so the
+    container stays generic. When a run claims a container, the group's
+    validated mounts are bind-mounted into the slot's staging directories on
+    the host. They appear inside the container before it receives its input.
+    Claimed containers are single-use; their binds are removed once the run
+    ends.
+
+    The pool size follows recent demand: enough containers to cover claims
+    expected during one boot (Little's law), clamped to the configured
+    bounds. Idle containers older than the configured age are recycled.
+    """
+
+    def __init__(self, config: "get_config"):
+        """Initialize the pool.
+
+        Args:
+            config: Application configuration
+        """
+        self.config = config
+        self.root = config.data_dir / "pool"
+        # Pooled containers run with the default class; other runs start cold
+        self.resources = RESOURCE_CLASSES.get(
+            config.container_default_resource_class, RESOURCE_CLASSES["medium"]
+        )
+        self.enabled = False
+        self._idle: deque[WarmContainer] = deque()
+        self._booting: set[asyncio.Task] = set()
+        self._demand: deque[float] = deque()
+        self._boot_times: deque[float] = deque(maxlen=50)
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.hits = 0
+        self.misses = 0
+
+    async def start(self) -> None:
+        """Prepare the staging root and start maintaining the pool."""
+        from loguru import logger
+
+        if not pool_supported():
+            logger.warning("Warm container pool needs root on Linux to bind mounts; disabled")
+            return
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Binds made under the root must propagate into running containers
+        if not os.path.ismount(self.root):
+            if not await _run("mount", "--bind", str(self.root), str(self.root)):
+                logger.warning("Could not bind warm pool root; warm pool disabled")
+                return
+        if not await _run("mount", "--make-rshared", str(self.root)):
+            logger.warning("Could not share warm pool root; warm pool disabled")
+            return
+
+        self.enabled = True
+        self._task = asyncio.create_task(self._maintain_loop(), name="warm-container-pool")
+        logger.info(
+            f"Warm container pool started "
+            f"(min={self.config.container_warm_pool_min}, max={self.config.container_warm_pool_max})"
+        )
+
+    async def stop(self) -> None:
+        """Stop maintenance and remove all idle containers."""
+        self.enabled = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for task in self._booting:
+            task.cancel()
+        if self._booting:
+            await asyncio.gather(*self._booting, return_exceptions=True)
+        self._booting.clear()
+
+        while self._idle:
+            await self._discard(self._idle.popleft())
+
+    @property
+    def idle_count(self) -> int:
+        """Number of warm containers ready to be claimed."""
+        return len(self._idle)
+
+    def target_size(self, now: float | None = None) -> int:
+        """Get the number of warm containers to keep for current demand.
+
+        Args:
+            now: Current monotonic time
+
+        Returns:
+            Target pool size within the configured bounds
+        """
+        now = time.monotonic() if now is None else now
+        while self._demand and now - self._demand[0] > DEMAND_WINDOW_SECONDS:
+            self._demand.popleft()
+
+        rate = len(self._demand) / DEMAND_WINDOW_SECONDS
+        boots = sorted(self._boot_times)
+        boot = boots[len(boots) // 2] if boots else DEFAULT_BOOT_SECONDS
+        wanted = math.ceil(rate * boot)
+        return max(self.config.container_warm_pool_min, min(self.config.container_warm_pool_max, wanted))
+
+    async def claim(self, mounts: list[tuple[str, str, str]]) -> WarmContainer | None:
+        """Take a warm container and bind a group's mounts into it.
+
+        Args:
+            mounts: Validated (host_path, container_path, mode) mounts
+
+        Returns:
+            A container ready for the group's input, or None to start cold
+        """
+        from loguru import logger
+
+        if not self.enabled:
+            return None
+
+        self._demand.append(time.monotonic())
+        self._wakeup.set()
+
+        if not all(is_staged(container_path) for _, container_path, _ in mounts):
+            # A mount outside the staged roots cannot be added after start
+            self.misses += 1
+            return None
+
+        while self._idle:
+            container = self._idle.popleft()
+            if not container.alive:
+                await self._discard(container)
+                continue
+            if await self._bind(container, mounts):
+                self.hits += 1
+                return container
+            logger.warning(f"Could not bind mounts into {container.name}, starting cold")
+            await self._discard(container)
+            break
+
+        self.misses += 1
+        return None
+
+    async def release(self, container: WarmContainer) -> None:
+        """Clean up a claimed container after its run.
+
+        Args:
+            container: Container returned by ``claim``
+        """
+        await self._discard(container)
+        self._wakeup.set()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get pool statistics.
+
+        Returns:
+            Pool size, target, hit/miss counts and start latency percentiles
+        """
+        return {
+            "enabled": self.enabled,
+            "idle": len(self._idle),
+            "booting": len(self._booting),
+            "target": self.target_size() if self.enabled else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "start_latency": start_latency.summary(),
+        }
+
+    async def _bind(self, container: WarmContainer, mounts: list[tuple[str, str, str]]) -> bool:
+        """Bind group mounts into a container's staging directories.
+
+        Args:
+            container: Warm container
+            mounts: Validated (host_path, container_path, mode) mounts
+
+        Returns:
+            True if every mount was bound
+        """
+        # Parents before children so nested mounts are not shadowed
+        for host_path, container_path, mode in sorted(mounts, key=lambda m: len(m[1])):
+            target = staging_target(container.slot_dir, container_path)
+            if Path(host_path).is_dir():
+                target.mkdir(parents=True, exist_ok=True)
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.touch(exist_ok=True)
+
+            if not await _run("mount", "--bind", host_path, str(target)):
+                return False
+            container.binds.append(target)
+            if mode == "ro" and not await _run(
+                "mount", "-o", "remount,bind,ro", str(target)
+            ):
+                return False
+        return True
+
+    async def _discard(self, container: WarmContainer) -> None:
+        """Stop a container and remove its binds and staging directory.
+
+        Args:
+            container: Container to discard
+        """
+        from nanogridbot.core.container_runner import cleanup_container
+
+        if container.alive:
+            await cleanup_container(container.name)
+            try:
+                await asyncio.wait_for(container.process.wait(), timeout=10)
+            except asyncio.TimeoutError:
+                container.process.kill()
+
+        for target in reversed(container.binds):
+            await _run("umount", "-l", str(target))
+        container.binds.clear()
+        shutil.rmtree(container.slot_dir, ignore_errors=True)
+
+    def _build_command(self, name: str, slot_dir: Path) -> list[str]:
+        """Build the docker command for a generic warm container.
+
+        Args:
+            name: Container name
+            slot_dir: Slot staging directory
+
+        Returns:
+            Command as list of strings
+        """
+        cmd = ["docker", "run", "-i", "--rm", "--network=none", "--name", name]
+        for container_path, subdir in STAGED_ROOTS.items():
+            cmd.extend(
+                [
+                    "--mount",
+                    f"type=bind,source={slot_dir / subdir},target={container_path},"
+                    "bind-propagation=rslave",
+                ]
+            )
+        cmd.extend(["--stop-timeout", str(self.config.container_timeout)])
+        cmd.extend(self.resources.docker_args())
+        cmd.append(self.config.container_image)
+        return cmd
+
+    async def _boot(self) -> None:
+        """Start one warm container and add it to the pool once ready."""
+        from loguru import logger
+
+        name = f"ngb-warm-{uuid.uuid4().hex[:8]}"
+        slot_dir = self.root / name
+        for subdir in STAGED_ROOTS.values():
+            (slot_dir / subdir).mkdir(parents=True, exist_ok=True)
+
+        started = time.monotonic()
+        try:
+            process = await spawn_container(self._build_command(name, slot_dir))
+        except FileNotFoundError:
+            logger.warning("Docker not found; warm pool disabled")
+            self.enabled = False
+            shutil.rmtree(slot_dir, ignore_errors=True)
+            return
+
+        container = WarmContainer(name=name, slot_dir=slot_dir, process=process, booted_at=started)
+        try:
+            await asyncio.wait_for(self._wait_ready(process), timeout=BOOT_TIMEOUT_SECONDS)
+        except (asyncio.TimeoutError, EOFError) as e:
+            logger.warning(f"Warm container {name} failed to boot: {e or 'timeout'}")
+            await self._discard(container)
+            return
+
+        self._boot_times.append(time.monotonic() - started)
+        container.booted_at = time.monotonic()
+        self._idle.append(container)
+        logger.debug(f"Warm container {name} ready in {time.monotonic() - started:.1f}s")
+
+    @staticmethod
+    async def _wait_ready(process: asyncio.subprocess.Process) -> None:
+        """Read the container's stderr until the agent runner reports ready.
+
+        Args:
+            process: Container process
+
+        Raises:
+            EOFError: If the container exits before becoming ready
+        """
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                raise EOFError("container exited before becoming ready")
+            if READY_LINE in line.decode(errors="replace"):
+                return
+
+    async def maintain(self) -> None:
+        """Run one maintenance pass: recycle, shrink or grow toward the target."""
+        now = time.monotonic()
+        max_idle = self.config.container_warm_pool_max_idle
+
+        # Drop dead and stale containers
+        kept: deque[WarmContainer] = deque()
+        while self._idle:
+            container = self._idle.popleft()
+            if container.alive and now - container.booted_at < max_idle:
+                kept.append(container)
+            else:
+                await self._discard(container)
+        self._idle = kept
+
+        target = self.target_size(now)
+        # Shrink, oldest first
+        while len(self._idle) > target:
+            await self._discard(self._idle.popleft())
+
+        # Grow
+        for _ in range(target - len(self._idle) - len(self._booting)):
+            task = asyncio.create_task(self._boot())
+            self._booting.add(task)
+            task.add_done_callback(self._booting.discard)
+
+    async def _maintain_loop(self) -> None:
+        """Maintain the pool periodically and whenever demand changes."""
+        from loguru import logger
+
+        while True:
+            self._wakeup.clear()
+            try:
+                await self.maintain()
+            except Exception as e:
+                logger.error(f"Warm pool maintenance failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=MAINTAIN_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
@@ -2,22 +2,154 @@
 
 import asyncio
 import json
+import re
 import time
+import uuid
 from pathlib import Path
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Literal
 
 from nanogridbot.config import get_config
+from nanogridbot.core.container_pool import start_latency
+from nanogridbot.core.docker_api import DockerAPIError, get_docker_client, spawn_container
+from nanogridbot.core.launch_plan import LaunchPlan, LaunchPlanCache, launch_plan_key, stamp_paths
 from nanogridbot.core.mount_security import validate_group_mounts
+from nanogridbot.core.output_stream import (
+    OUTPUT_END_MARKER,
+    OUTPUT_START_MARKER,
+    BoundedLog,
+    OutputStreamParser,
+    parse_output_payload,
+)
+from nanogridbot.core.resources import RESOURCE_CLASSES, ResourceClass, resource_class_for
 from nanogridbot.types import ContainerConfig, ContainerOutput
 from nanogridbot.utils.formatting import format_messages_xml
 
-# Output markers for parsing
-OUTPUT_START_MARKER = "---NANOGRIDBOT_OUTPUT_START---"
-OUTPUT_END_MARKER = "---NANOGRIDBOT_OUTPUT_END---"
-
 # Grace period for container timeout (seconds)
 GRACE_PERIOD_SECONDS = 30
 
+# Bytes read from container output per chunk
+READ_CHUNK_SIZE = 65536
+
+# Callback receiving each result as soon as the container emits it
+OutputCallback = Callable[[ContainerOutput], Awaitable[None]]
+
+# Agent runner log line carrying the wall-clock time (ms) it received input
+_INPUT_RECEIVED_RE = re.compile(r"Received input for group: .* \(at (\d+)\)")
+
+if TYPE_CHECKING:
+    from nanogridbot.core.container_pool import WarmContainer, WarmContainerPool
+    from nanogridbot.core.resource_sampler import ContainerResourceSampler
+
+# Warm pool used by run_container_agent, if one is running
+_warm_pool: "WarmContainerPool | None" = None
+
+# Cache of prepared launches, if enabled
+_launch_plans: LaunchPlanCache | None = None
+
+# Sampler recording the resource usage of runs, if enabled
+_resource_sampler: "ContainerResourceSampler | None" = None
+
+
+def set_warm_pool(pool: "WarmContainerPool | None") -> None:
+    """Set the warm container pool runs are served from.
+
+    Args:
+        pool: Running pool, or None to always start cold containers
+    """
+    global _warm_pool
+    _warm_pool = pool
+
+
+def set_launch_plan_cache(cache: LaunchPlanCache | None) -> None:
+    """Set the cache container launches are prepared from.
+
+    Args:
+        cache: Launch plan cache, or None to prepare every launch afresh
+    """
+    global _launch_plans
+    _launch_plans = cache
+
+
+def set_resource_sampler(sampler: "ContainerResourceSampler | None") -> None:
+    """Set the sampler that records the resource usage of runs.
+
+    Args:
+        sampler: Running sampler, or None to not sample runs
+    """
+    global _resource_sampler
+    _resource_sampler = sampler
+
+
+async def prepare_launch(
+    group_folder: str,
+    container_config: ContainerConfig | None = None,
+    is_main: bool = False,
+    env: dict[str, str] | None = None,
+    timeout: int | None = None,
+    user_id: int | None = None,
+) -> LaunchPlan:
+    """Validate a group's mounts and build its docker command.
+
+    Served from the launch plan cache when the group's configuration and the
+    files it depends on are unchanged since the last launch.
+
+    Args:
+        group_folder: Group folder name
+        container_config: Optional container configuration
+        is_main: Whether this is the main group
+        env: Environment variables for the container
+        timeout: Container timeout in seconds
+        user_id: Optional user ID for user-specific mounts
+
+    Returns:
+        Launch plan
+
+    Raises:
+        MountSecurityError: If a mount is not allowed
+    """
+    from nanogridbot.core.mount_security import create_group_env_file, group_mount_dependencies
+
+    config = get_config()
+    timeout = timeout or config.container_timeout
+    config_dict = container_config.model_dump() if container_config else None
+
+    cache = _launch_plans
+    key = None
+    if cache is not None:
+        key = launch_plan_key(group_folder, config_dict, is_main, user_id, env, timeout, config)
+        plan = cache.get(key)
+        if plan is not None:
+            return plan
+
+    mounts = await validate_group_mounts(
+        group_folder=group_folder,
+        container_config=config_dict,
+        is_main=is_main,
+        user_id=user_id,
+    )
+    env_mount = create_group_env_file(group_folder)
+    resources = resource_class_for(container_config)
+    command = build_docker_command(
+        mounts=mounts,
+        input_data={"groupFolder": group_folder, "isMain": is_main},
+        timeout=timeout,
+        env=env,
+        resources=resources,
+    )
+    plan = LaunchPlan(
+        group_folder=group_folder,
+        mounts=mounts,
+        env_mount=env_mount,
+        command=command,
+        resources=resources,
+    )
+    if cache is not None:
+        plan.stamps = stamp_paths(
+            group_mount_dependencies(group_folder, config_dict, is_main, user_id)
+        )
+        cache.put(key, plan)
+    return plan
+
 
 async def run_container_agent(
     group_folder: str,
@@ -28,6 +160,7 @@ async def run_container_agent(
     container_config: ContainerConfig | None = None,
     timeout: int | None = None,
     env: dict[str, str] | None = None,
+    on_output: OutputCallback | None = None,
 ) -> ContainerOutput:
     """Run Claude Agent in a Docker container.
 
@@ -40,6 +173,8 @@ async def run_container_agent(
         container_config: Optional container configuration
         timeout: Optional timeout in seconds
         env: Optional environment variables for container
+        on_output: Optional callback receiving each result as soon as the
+            container emits it, before the run ends
 
     Returns:
         ContainerOutput with execution result
@@ -69,12 +204,10 @@ async def run_container_agent(
         # Metrics are optional, don't fail if they can't be recorded
         pass
 
-    # Build mounts
+    # Validate mounts and build the command, or reuse an unchanged plan
     try:
-        mounts = await validate_group_mounts(
-            group_folder=group_folder,
-            container_config=container_config.model_dump() if container_config else None,
-            is_main=is_main,
+        plan = await prepare_launch(
+            group_folder, container_config, is_main, merged_env, timeout or config.container_timeout
         )
     except Exception as e:
         logger.error(f"Mount validation failed: {e}")
@@ -95,18 +228,40 @@ async def run_container_agent(
         "isMain": is_main,
     }
 
-    # Build docker command
-    cmd = build_docker_command(
-        mounts=mounts,
-        input_data=input_data,
-        timeout=timeout or config.container_timeout,
-        env=merged_env,
-    )
+    pool = _warm_pool
+    warm = await claim_warm_container(plan, input_data, merged_env)
 
-    logger.debug(f"Starting container for {group_folder}")
+    # Name the container so the sampler can find its cgroup
+    sampler = _resource_sampler
+    name = warm.name if warm is not None else None
+    if sampler is not None:
+        name = name or f"ngb-run-{group_folder}-{uuid.uuid4().hex[:8]}"
+        sampler.track(name, group_folder)
+    usage = None
 
     try:
-        result = await _execute_container(cmd, input_data)
+        try:
+            if warm is not None:
+                logger.debug(f"Using warm container {warm.name} for {group_folder}")
+                try:
+                    result = await _execute_container(
+                        [],
+                        input_data,
+                        process=warm.process,
+                        requested_at=start_time,
+                        on_output=on_output,
+                    )
+                finally:
+                    await pool.release(warm)
+            else:
+                logger.debug(f"Starting container for {group_folder}")
+                result = await _execute_container(
+                    plan.command_for(name), input_data, requested_at=start_time, on_output=on_output
+                )
+        finally:
+            if sampler is not None:
+                usage = await sampler.untrack(name)
+
         # Record container end for metrics
         duration = time.time() - start_time
         status = "success" if result.status == "success" else "error"
@@ -117,6 +272,7 @@ async def run_container_agent(
                     status=status,
                     duration_seconds=duration,
                     error=result.error,
+                    usage=usage,
                 )
             except Exception:
                 pass
@@ -127,34 +283,80 @@ async def run_container_agent(
         duration = time.time() - start_time
         if metric_id:
             try:
-                await metrics_db.record_container_end(metric_id, "error", duration_seconds=duration, error=str(e))
+                await metrics_db.record_container_end(
+                    metric_id, "error", duration_seconds=duration, error=str(e), usage=usage
+                )
             except Exception:
                 pass
         return ContainerOutput(status="error", error=str(e))
 
 
+async def claim_warm_container(
+    plan: LaunchPlan,
+    input_data: dict[str, Any],
+    env: dict[str, str] | None = None,
+) -> "WarmContainer | None":
+    """Claim a warm container for a run, if the pool has one.
+
+    A warm container was started before the group was known, so the env file
+    is bound at claim time and the runner applies the environment when it
+    reads its input, as docker run would have.
+
+    Args:
+        plan: Launch plan with the group's validated mounts and env file
+        input_data: Input for the runner; gains an ``env`` entry when there
+            is no env file to bind
+        env: Environment variables for the container
+
+    Returns:
+        Claimed container, to be released by the caller, or None
+    """
+    pool = _warm_pool
+    if pool is None or plan.resources != pool.resources:
+        return None
+
+    env_mount = plan.env_mount
+    warm = await pool.claim(plan.mounts + [env_mount] if env_mount else plan.mounts)
+    if warm is not None and not env_mount:
+        input_data["env"] = _safe_env(env)
+    return warm
+
+
 async def _execute_container(
     cmd: list[str],
     input_data: dict[str, Any],
+    process: asyncio.subprocess.Process | None = None,
+    requested_at: float | None = None,
+    on_output: OutputCallback | None = None,
 ) -> ContainerOutput:
     """Execute docker container and capture output.
 
+    Output is read incrementally: each marker-delimited result is handed to
+    ``on_output`` as soon as its end marker arrives, and at most
+    ``container_max_output_size`` bytes of a result are kept in memory.
+    Larger results are spilled to ``<data_dir>/output-spill`` and delivered
+    truncated.
+
     Args:
         cmd: Docker command arguments
         input_data: Input data to send to container
+        process: Already running warm container to hand the input to instead
+            of starting ``cmd``
+        requested_at: Wall-clock time the run was requested, for start
+            latency statistics
+        on_output: Optional callback receiving each result as it arrives
 
     Returns:
-        ContainerOutput with result
+        The last result, carrying the newest session ID seen during the run
     """
     from loguru import logger
 
+    requested_at = time.time() if requested_at is None else requested_at
+    start_kind = "cold" if process is None else "warm"
+
     try:
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
+        if process is None:
+            process = await spawn_container(cmd)
 
         # Log container start
         logger.info(
@@ -170,30 +372,57 @@ async def _execute_container(
         await process.stdin.drain()
         process.stdin.close()
 
-        # Read output
-        stdout, stderr = await asyncio.wait_for(
-            process.communicate(),
-            timeout=get_config().container_timeout,
+        # Read output as it arrives
+        config = get_config()
+        parser = OutputStreamParser(
+            config.container_max_output_size, config.data_dir / "output-spill"
         )
-
-        # Parse output
-        if stdout:
-            output_str = stdout.decode("utf-8", errors="replace")
-            result = _parse_output(output_str)
-            if result:
-                # Log container completion
-                logger.info(
-                    "Container completed: group={group}, status={status}",
-                    group=input_data.get("groupFolder"),
-                    status=result.status,
-                )
-                return result
+        stderr_log = BoundedLog()
+        last: ContainerOutput | None = None
+        session_id: str | None = None
+
+        async def deliver(results: list[ContainerOutput]) -> None:
+            nonlocal last, session_id
+            for output in results:
+                last = output
+                session_id = output.new_session_id or session_id
+                if on_output is not None:
+                    try:
+                        await on_output(output)
+                    except Exception as e:
+                        logger.error(f"Failed to deliver container output: {e}")
+
+        async def read_stdout() -> None:
+            while chunk := await process.stdout.read(READ_CHUNK_SIZE):
+                await deliver(parser.feed(chunk))
+            await deliver(parser.finish())
+
+        async def read_stderr() -> None:
+            while chunk := await process.stderr.read(READ_CHUNK_SIZE):
+                stderr_log.feed(chunk)
+
+        await asyncio.wait_for(
+            asyncio.gather(read_stdout(), read_stderr(), process.wait()),
+            timeout=config.container_timeout,
+        )
+        if stderr_log:
+            _record_start_latency(bytes(stderr_log.head), requested_at, start_kind)
+
+        if last is not None:
+            result = last
+            if session_id and not result.new_session_id:
+                result = result.model_copy(update={"new_session_id": session_id})
+            logger.info(
+                "Container completed: group={group}, status={status}, results={count}",
+                group=input_data.get("groupFolder"),
+                status=result.status,
+                count=parser.results,
+            )
+            return result
 
         # Check for stderr errors
-        if stderr:
-            error_str = stderr.decode("utf-8", errors="replace")
-            if error_str:
-                logger.error(f"Container stderr: {error_str}")
+        if stderr_log:
+            logger.error(f"Container stderr: {stderr_log.text()}")
 
         return ContainerOutput(
             status="error",
@@ -243,6 +472,39 @@ async def _execute_container(
         )
 
 
+def _record_start_latency(stderr: bytes, requested_at: float, kind: str) -> None:
+    """Record how long the agent runner took to receive its input.
+
+    The runner logs the wall-clock time it parsed its input; containers share
+    the host clock, so the difference to the request time is the start
+    latency.
+
+    Args:
+        stderr: Container stderr
+        requested_at: Wall-clock time the run was requested
+        kind: "cold" or "warm"
+    """
+    match = _INPUT_RECEIVED_RE.search(stderr.decode("utf-8", errors="replace"))
+    if match:
+        start_latency.record(kind, max(0.0, int(match.group(1)) / 1000 - requested_at))
+
+
+def _safe_env(env: dict[str, str] | None) -> dict[str, str]:
+    """Filter environment variables that may be passed to a container directly.
+
+    API keys are only passed through the group env file.
+
+    Args:
+        env: Environment variables
+
+    Returns:
+        Variables without secrets
+    """
+    return {
+        k: v for k, v in (env or {}).items() if not k.startswith("ANTHROPIC_") or k == "ANTHROPIC_MODEL"
+    }
+
+
 def _parse_output(output: str) -> ContainerOutput | None:
     """Parse container output.
 
@@ -252,8 +514,6 @@ def _parse_output(output: str) -> ContainerOutput | None:
     Returns:
         ContainerOutput or None if parsing fails
     """
-    import json
-
     in_output = False
     output_lines = []
 
@@ -269,21 +529,7 @@ def _parse_output(output: str) -> ContainerOutput | None:
             output_lines.append(line)
 
     if output_lines:
-        try:
-            output_json = "\n".join(output_lines)
-            data = json.loads(output_json)
-            return ContainerOutput(
-                status=data.get("status", "success"),
-                result=data.get("result"),
-                error=data.get("error"),
-                new_session_id=data.get("newSessionId"),
-            )
-        except json.JSONDecodeError:
-            # If not JSON, treat as result text
-            return ContainerOutput(
-                status="success",
-                result="\n".join(output_lines),
-            )
+        return parse_output_payload("\n".join(output_lines))
 
     return None
 
@@ -293,6 +539,8 @@ def build_docker_command(
     input_data: dict[str, Any],
     timeout: int,
     env: dict[str, str] | None = None,
+    name: str | None = None,
+    resources: ResourceClass | None = None,
 ) -> list[str]:
     """Build docker run command.
 
@@ -301,6 +549,8 @@ def build_docker_command(
         input_data: Input data to pass to container
         timeout: Timeout in seconds
         env: Optional environment variables for container
+        name: Optional container name
+        resources: CPU and memory limits; the medium class if None
 
     Returns:
         Command as list of strings
@@ -309,7 +559,10 @@ def build_docker_command(
 
     config = get_config()
 
-    cmd = ["docker", "run", "--rm", "--network=none"]
+    # -i keeps stdin attached so the agent runner receives its input
+    cmd = ["docker", "run", "-i", "--rm", "--network=none"]
+    if name:
+        cmd.extend(["--name", name])
 
     # Add mounts
     for host_path, container_path, mode in mounts:
@@ -327,19 +580,14 @@ def build_docker_command(
         cmd.extend(["-v", f"{host_path}:{container_path}:{mode}"])
     else:
         # Fallback: only pass non-sensitive env vars directly
-        safe_env = {k: v for k, v in (env or {}).items()
-                    if not k.startswith("ANTHROPIC_") or k == "ANTHROPIC_MODEL"}
-        for key, value in safe_env.items():
+        for key, value in _safe_env(env).items():
             cmd.extend(["-e", f"{key}={value}"])
 
     # Set timeout
     cmd.extend(["--stop-timeout", str(timeout)])
 
-    # Memory limit
-    cmd.extend(["--memory", "2g"])
-
-    # CPU limit
-    cmd.extend(["--cpus", "1.0"])
+    # Memory and CPU limits
+    cmd.extend((resources or RESOURCE_CLASSES["medium"]).docker_args())
 
     # Use image
     cmd.append(
@@ -355,6 +603,10 @@ async def check_docker_available() -> bool:
     Returns:
         True if Docker is available, False otherwise
     """
+    client = get_docker_client()
+    if client is not None:
+        return await client.ping()
+
     try:
         process = await asyncio.create_subprocess_exec(
             "docker",
@@ -377,6 +629,13 @@ async def get_container_status(container_name: str) -> Literal["running", "exite
     Returns:
         Container status
     """
+    client = get_docker_client()
+    if client is not None:
+        try:
+            return (await client.inspect(container_name))["State"]["Status"]
+        except (DockerAPIError, OSError):
+            return "not_found"
+
     try:
         process = await asyncio.create_subprocess_exec(
             "docker",
@@ -395,6 +654,40 @@ async def get_container_status(container_name: str) -> Literal["running", "exite
         return "not_found"
 
 
+async def stop_container(container_name: str, timeout: int = 5) -> bool:
+    """Stop a container, killing it after the timeout.
+
+    Args:
+        container_name: Name of container
+        timeout: Seconds to wait before killing it
+
+    Returns:
+        True if the container was stopped
+    """
+    from loguru import logger
+
+    try:
+        client = get_docker_client()
+        if client is not None:
+            await client.stop(container_name, timeout=timeout)
+            return True
+
+        process = await asyncio.create_subprocess_exec(
+            "docker",
+            "stop",
+            "-t",
+            str(timeout),
+            container_name,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        await process.communicate()
+        return process.returncode == 0
+    except Exception as e:
+        logger.error(f"Failed to stop container {container_name}: {e}")
+        return False
+
+
 async def cleanup_container(container_name: str) -> None:
     """Clean up a container.
 
@@ -404,6 +697,17 @@ async def cleanup_container(container_name: str) -> None:
     from loguru import logger
 
     try:
+        client = get_docker_client()
+        if client is not None:
+            try:
+                await client.remove(container_name, force=True)
+                logger.info(f"Cleaned up container: {container_name}")
+            except DockerAPIError as e:
+                # Auto-removed containers may already be gone
+                if e.status != 404:
+                    raise
+            return
+
         process = await asyncio.create_subprocess_exec(
             "docker",
             "rm",
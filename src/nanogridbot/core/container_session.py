@@ -12,6 +12,7 @@ from nanogridbot.core.container_runner import (
     cleanup_container,
     validate_group_mounts,
 )
+from nanogridbot.core.docker_api import spawn_container
 
 
 class ContainerSession:
@@ -67,12 +68,7 @@ class ContainerSession:
         self._ipc_dir = ipc_base
 
         # Start the process
-        self._process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
+        self._process = await spawn_container(cmd)
 
         # Send initial configuration via stdin
         init_data = {
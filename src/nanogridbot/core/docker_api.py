@@ -0,0 +1,659 @@
+"""Async Docker Engine API client over the daemon's unix socket."""
+
+import asyncio
+import json
+import struct
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote, urlencode
+
+from nanogridbot.config import get_config
+
+# Stream ids in the header of multiplexed attach frames
+_STDOUT = 1
+_STDERR = 2
+
+# Successful status codes of the Engine API (304: already started/stopped)
+_OK_STATUSES = frozenset({200, 201, 204, 304})
+
+# Memory size suffixes accepted by ``docker run --memory``
+_MEMORY_UNITS = {"b": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+
+# ``docker run`` options that take a value
+_VALUE_FLAGS = frozenset({"--name", "-v", "--mount", "-e", "--stop-timeout", "--memory", "--cpus", "--network"})
+
+
+class DockerAPIError(Exception):
+    """Raised when the Docker daemon answers with an error status."""
+
+    def __init__(self, status: int, message: str):
+        """Initialize the error.
+
+        Args:
+            status: HTTP status code
+            message: Error message from the daemon
+        """
+        super().__init__(f"Docker API error {status}: {message}")
+        self.status = status
+        self.message = message
+
+
+class _AttachedStdin:
+    """Write end of an attach stream, shaped like a subprocess stdin."""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self._writer = writer
+
+    def write(self, data: bytes) -> None:
+        """Queue bytes for the container's stdin."""
+        self._writer.write(data)
+
+    async def drain(self) -> None:
+        """Wait until the queued bytes are sent."""
+        await self._writer.drain()
+
+    def close(self) -> None:
+        """Close the container's stdin, leaving its output streaming."""
+        if not self._writer.is_closing() and self._writer.can_write_eof():
+            self._writer.write_eof()
+
+
+class ContainerProcess:
+    """A container attached over the Engine API, used like a subprocess.
+
+    Exposes the parts of ``asyncio.subprocess.Process`` the runners use
+    (``stdin``, ``stdout``, ``stderr``, ``returncode``, ``wait``,
+    ``communicate`` and ``kill``), so a container started through the API is
+    a drop-in replacement for a ``docker run`` child process.
+    """
+
+    def __init__(
+        self,
+        client: "DockerClient",
+        container_id: str,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        waiter: asyncio.Task,
+    ):
+        """Initialize the process.
+
+        Args:
+            client: Client the container was started with
+            container_id: Container ID
+            reader: Read end of the attach stream
+            writer: Write end of the attach stream
+            waiter: Task resolving to the container's exit code
+        """
+        self.client = client
+        self.id = container_id
+        self.stdin = _AttachedStdin(writer)
+        self.stdout = asyncio.StreamReader()
+        self.stderr = asyncio.StreamReader()
+        self.returncode: int | None = None
+        self._writer = writer
+        self._waiter = waiter
+        self._waiter.add_done_callback(self._on_exit)
+        self._demux = asyncio.create_task(self._read_frames(reader))
+        self._pending: set[asyncio.Task] = set()
+
+    def _on_exit(self, task: asyncio.Task) -> None:
+        """Record the exit code once the wait request returns."""
+        if task.cancelled() or task.exception() is not None:
+            self.returncode = -1
+        else:
+            self.returncode = task.result()
+
+    async def _read_frames(self, reader: asyncio.StreamReader) -> None:
+        """Split the multiplexed attach stream into stdout and stderr."""
+        try:
+            while True:
+                header = await reader.readexactly(8)
+                size = struct.unpack(">I", header[4:])[0]
+                data = await reader.readexactly(size)
+                if header[0] == _STDOUT:
+                    self.stdout.feed_data(data)
+                elif header[0] == _STDERR:
+                    self.stderr.feed_data(data)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.stdout.feed_eof()
+            self.stderr.feed_eof()
+            self._writer.close()
+
+    async def wait(self) -> int:
+        """Wait for the container to exit.
+
+        Returns:
+            Exit code, or -1 if the daemon could not report one
+        """
+        try:
+            self.returncode = await asyncio.shield(self._waiter)
+        except (OSError, DockerAPIError, asyncio.IncompleteReadError):
+            self.returncode = -1
+        return self.returncode
+
+    async def communicate(self, input: bytes | None = None) -> tuple[bytes, bytes]:
+        """Send input, then read all output and wait for the container to exit.
+
+        Args:
+            input: Bytes for stdin, which is closed afterwards
+
+        Returns:
+            Tuple of (stdout, stderr)
+        """
+        if input is not None:
+            self.stdin.write(input)
+            await self.stdin.drain()
+            self.stdin.close()
+        stdout, stderr = await asyncio.gather(self.stdout.read(), self.stderr.read())
+        await self.wait()
+        return stdout, stderr
+
+    def kill(self) -> None:
+        """Kill the container without waiting for it."""
+        if self.returncode is not None:
+            return
+        task = asyncio.create_task(self.client.kill(self.id))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+
+class DockerClient:
+    """Minimal Engine API client speaking HTTP/1.1 over a unix socket.
+
+    Requests reuse keep-alive connections from a small idle pool, so a
+    container operation costs one request on an open connection instead of
+    forking the docker CLI. Attach streams get their own connection, which is
+    upgraded to a raw stream and never returned to the pool.
+    """
+
+    def __init__(self, socket_path: str = "/var/run/docker.sock", max_idle_connections: int = 4):
+        """Initialize the client.
+
+        Args:
+            socket_path: Path of the daemon's unix socket
+            max_idle_connections: Keep-alive connections kept open for reuse
+        """
+        self.socket_path = socket_path
+        self.max_idle_connections = max_idle_connections
+        self.connections_opened = 0
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Open a new connection to the daemon."""
+        self.connections_opened += 1
+        return await asyncio.open_unix_connection(self.socket_path)
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        body: Any = None,
+    ) -> tuple[tuple[asyncio.StreamReader, asyncio.StreamWriter], bool]:
+        """Send a request, on a pooled connection if one is open.
+
+        Args:
+            method: HTTP method
+            path: Request path
+            params: Query parameters
+            body: JSON body
+
+        Returns:
+            Tuple of (connection to read the response from, whether it came
+            from the pool)
+        """
+        target = quote(path) + (f"?{urlencode(params)}" if params else "")
+        data = json.dumps(body).encode() if body is not None else b""
+        head = f"{method} {target} HTTP/1.1\r\nHost: docker\r\nContent-Length: {len(data)}\r\n"
+        if body is not None:
+            head += "Content-Type: application/json\r\n"
+        request = (head + "\r\n").encode() + data
+
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if writer.is_closing() or reader.at_eof():
+                writer.close()
+                continue
+            try:
+                writer.write(request)
+                await writer.drain()
+                return (reader, writer), True
+            except ConnectionError:
+                writer.close()
+
+        reader, writer = await self._connect()
+        writer.write(request)
+        await writer.drain()
+        return (reader, writer), False
+
+    async def _receive(
+        self, conn: tuple[asyncio.StreamReader, asyncio.StreamWriter], method: str
+    ) -> tuple[int, bytes]:
+        """Read a response and return its connection to the pool.
+
+        Args:
+            conn: Connection the request was sent on
+            method: HTTP method of the request
+
+        Returns:
+            Tuple of (status, body)
+
+        Raises:
+            DockerAPIError: If the daemon answered with an error status
+        """
+        reader, writer = conn
+        try:
+            status, headers = await _read_head(reader)
+            body, reusable = await _read_body(reader, headers, status, method)
+        except BaseException:
+            writer.close()
+            raise
+
+        if reusable and len(self._idle) < self.max_idle_connections:
+            self._idle.append(conn)
+        else:
+            writer.close()
+
+        if status not in _OK_STATUSES:
+            raise DockerAPIError(status, _error_message(body))
+        return status, body
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        body: Any = None,
+    ) -> Any:
+        """Make an API request.
+
+        Args:
+            method: HTTP method
+            path: Request path
+            params: Query parameters
+            body: JSON body
+
+        Returns:
+            Decoded JSON response, or None for an empty body
+
+        Raises:
+            DockerAPIError: If the daemon answered with an error status
+            OSError: If the daemon cannot be reached
+        """
+        while True:
+            conn, pooled = await self._send(method, path, params, body)
+            try:
+                _, payload = await self._receive(conn, method)
+                break
+            except (asyncio.IncompleteReadError, ConnectionError):
+                # The daemon closed an idle keep-alive connection before it
+                # saw the request; send it again on a fresh one
+                if not pooled:
+                    raise
+        return json.loads(payload) if payload.strip() else None
+
+    async def ping(self) -> bool:
+        """Check that the daemon is reachable.
+
+        Returns:
+            True if the daemon answered
+        """
+        try:
+            conn, _ = await self._send("GET", "/_ping")
+            await self._receive(conn, "GET")
+            return True
+        except (OSError, DockerAPIError, asyncio.IncompleteReadError):
+            return False
+
+    async def create_container(self, spec: dict[str, Any], name: str | None = None) -> str:
+        """Create a container.
+
+        Args:
+            spec: Container create body
+            name: Optional container name
+
+        Returns:
+            Container ID
+        """
+        params = {"name": name} if name else None
+        return (await self.request("POST", "/containers/create", params, spec))["Id"]
+
+    async def start(self, container: str) -> None:
+        """Start a created container."""
+        await self.request("POST", f"/containers/{container}/start")
+
+    async def wait(self, container: str, condition: str = "next-exit") -> int:
+        """Wait for a container to exit.
+
+        Args:
+            container: Container ID or name
+            condition: Wait condition
+
+        Returns:
+            Exit code
+        """
+        result = await self.request("POST", f"/containers/{container}/wait", {"condition": condition})
+        return int(result.get("StatusCode", -1))
+
+    async def kill(self, container: str, signal: str = "SIGKILL") -> None:
+        """Send a signal to a container."""
+        await self.request("POST", f"/containers/{container}/kill", {"signal": signal})
+
+    async def stop(self, container: str, timeout: int | None = None) -> None:
+        """Stop a container, killing it after the timeout."""
+        params = {"t": timeout} if timeout is not None else None
+        await self.request("POST", f"/containers/{container}/stop", params)
+
+    async def pause(self, container: str) -> None:
+        """Freeze all processes in a container."""
+        await self.request("POST", f"/containers/{container}/pause")
+
+    async def unpause(self, container: str) -> None:
+        """Resume a frozen container."""
+        await self.request("POST", f"/containers/{container}/unpause")
+
+    async def remove(self, container: str, force: bool = True) -> None:
+        """Remove a container, killing it first if forced."""
+        await self.request("DELETE", f"/containers/{container}", {"force": int(force)})
+
+    async def inspect(self, container: str) -> dict[str, Any]:
+        """Get a container's details."""
+        return await self.request("GET", f"/containers/{container}/json")
+
+    async def attach(self, container: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Attach to a container's stdin, stdout and stderr.
+
+        Args:
+            container: Container ID or name
+
+        Returns:
+            Raw multiplexed stream on a dedicated connection
+        """
+        reader, writer = await self._connect()
+        params = {"stream": 1, "stdin": 1, "stdout": 1, "stderr": 1}
+        request = (
+            f"POST /containers/{quote(container)}/attach?{urlencode(params)} HTTP/1.1\r\n"
+            "Host: docker\r\nContent-Length: 0\r\nConnection: Upgrade\r\nUpgrade: tcp\r\n\r\n"
+        )
+        try:
+            writer.write(request.encode())
+            await writer.drain()
+            status, _ = await _read_head(reader)
+            if status not in (101, 200):
+                body, _ = await _read_body(reader, {}, status, "POST")
+                raise DockerAPIError(status, _error_message(body))
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer
+
+    async def run(self, spec: dict[str, Any], name: str | None = None) -> ContainerProcess:
+        """Create, attach to and start a container.
+
+        The wait request is sent before the container starts so an
+        auto-removed container cannot exit unobserved.
+
+        Args:
+            spec: Container create body
+            name: Optional container name
+
+        Returns:
+            The running container
+        """
+        container = await self.create_container(spec, name)
+        try:
+            reader, writer = await self.attach(container)
+            conn, _ = await self._send("POST", f"/containers/{container}/wait", {"condition": "next-exit"})
+            waiter = asyncio.create_task(self._finish_wait(conn))
+            try:
+                await self.start(container)
+            except BaseException:
+                waiter.cancel()
+                writer.close()
+                raise
+        except BaseException:
+            try:
+                await self.remove(container)
+            except (OSError, DockerAPIError):
+                pass
+            raise
+        return ContainerProcess(self, container, reader, writer, waiter)
+
+    async def _finish_wait(self, conn: tuple[asyncio.StreamReader, asyncio.StreamWriter]) -> int:
+        """Read the response of a wait request sent earlier."""
+        _, payload = await self._receive(conn, "POST")
+        return int(json.loads(payload).get("StatusCode", -1))
+
+
+async def _read_head(reader: asyncio.StreamReader) -> tuple[int, dict[str, str]]:
+    """Read a response status line and headers.
+
+    Args:
+        reader: Connection reader
+
+    Returns:
+        Tuple of (status, lower-cased headers)
+    """
+    status_line = await reader.readuntil(b"\r\n")
+    status = int(status_line.split(b" ", 2)[1])
+    headers: dict[str, str] = {}
+    while True:
+        line = await reader.readuntil(b"\r\n")
+        if line == b"\r\n":
+            return status, headers
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+
+
+async def _read_body(
+    reader: asyncio.StreamReader, headers: dict[str, str], status: int, method: str
+) -> tuple[bytes, bool]:
+    """Read a response body.
+
+    Args:
+        reader: Connection reader
+        headers: Lower-cased response headers
+        status: Response status
+        method: Request method
+
+    Returns:
+        Tuple of (body, whether the connection can be reused)
+    """
+    reusable = headers.get("connection", "").lower() != "close"
+    if status < 200 or status in (204, 304) or method == "HEAD":
+        return b"", reusable
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            if size == 0:
+                # Skip trailers
+                while await reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                return b"".join(chunks), reusable
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"])), reusable
+
+    return await reader.read(), False
+
+
+def _error_message(body: bytes) -> str:
+    """Extract the message from an error response body."""
+    try:
+        return json.loads(body)["message"]
+    except (ValueError, KeyError, TypeError):
+        return body.decode("utf-8", errors="replace").strip()
+
+
+def _parse_memory(value: str) -> int:
+    """Convert a ``--memory`` value such as ``2g`` to bytes."""
+    value = value.strip().lower()
+    unit = _MEMORY_UNITS.get(value[-1:])
+    if unit is None:
+        return int(value)
+    return int(float(value[:-1]) * unit)
+
+
+def _parse_mount(value: str) -> dict[str, Any]:
+    """Convert a ``--mount`` value to an Engine API mount."""
+    options = dict(part.partition("=")[::2] for part in value.split(","))
+    mount: dict[str, Any] = {
+        "Type": options.get("type", "bind"),
+        "Source": options.get("source") or options.get("src"),
+        "Target": options.get("target") or options.get("dst") or options.get("destination"),
+        "ReadOnly": "readonly" in options or "ro" in options,
+    }
+    if "bind-propagation" in options:
+        mount["BindOptions"] = {"Propagation": options["bind-propagation"]}
+    return mount
+
+
+def container_spec_from_args(args: list[str]) -> tuple[str | None, dict[str, Any]]:
+    """Translate ``docker run`` arguments into an Engine API create body.
+
+    Only the options this package uses are understood.
+
+    Args:
+        args: Arguments after ``docker run``
+
+    Returns:
+        Tuple of (container name, create body)
+
+    Raises:
+        ValueError: On an option that is not understood
+    """
+    name: str | None = None
+    interactive = False
+    env: list[str] = []
+    host: dict[str, Any] = {"Binds": [], "Mounts": []}
+    spec: dict[str, Any] = {}
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if not arg.startswith("-"):
+            spec["Image"] = arg
+            if args[i + 1 :]:
+                spec["Cmd"] = args[i + 1 :]
+            break
+
+        flag, eq, value = arg.partition("=")
+        if flag in _VALUE_FLAGS and not eq:
+            if i + 1 >= len(args):
+                raise ValueError(f"Missing value for {flag}")
+            value = args[i + 1]
+            i += 2
+        else:
+            i += 1
+
+        if flag == "-i":
+            interactive = True
+        elif flag == "--rm":
+            host["AutoRemove"] = True
+        elif flag == "--network":
+            host["NetworkMode"] = value
+        elif flag == "--name":
+            name = value
+        elif flag == "-v":
+            host["Binds"].append(value)
+        elif flag == "--mount":
+            host["Mounts"].append(_parse_mount(value))
+        elif flag == "-e":
+            env.append(value)
+        elif flag == "--stop-timeout":
+            spec["StopTimeout"] = int(value)
+        elif flag == "--memory":
+            host["Memory"] = _parse_memory(value)
+        elif flag == "--cpus":
+            host["NanoCpus"] = int(float(value) * 1e9)
+        else:
+            raise ValueError(f"Unsupported docker run option: {arg}")
+
+    if "Image" not in spec:
+        raise ValueError("No image given")
+
+    spec.update(
+        {
+            "Env": env,
+            "AttachStdin": interactive,
+            "OpenStdin": interactive,
+            "StdinOnce": interactive,
+            "AttachStdout": True,
+            "AttachStderr": True,
+            "Tty": False,
+            "HostConfig": host,
+        }
+    )
+    return name, spec
+
+
+# Shared client, created on first use when the daemon socket exists
+_client: DockerClient | None = None
+
+
+def get_docker_client() -> DockerClient | None:
+    """Get the shared Engine API client.
+
+    Returns:
+        The client, or None if the API is disabled or the socket is missing,
+        in which case callers fall back to the docker CLI
+    """
+    global _client
+
+    config = get_config()
+    if not config.docker_api_enabled:
+        return None
+    if _client is None or _client.socket_path != str(config.docker_socket):
+        if not Path(config.docker_socket).is_socket():
+            return None
+        _client = DockerClient(str(config.docker_socket))
+    return _client
+
+
+async def close_docker_client() -> None:
+    """Close the shared client's connections."""
+    global _client
+
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+async def spawn_container(cmd: list[str]) -> "asyncio.subprocess.Process | ContainerProcess":
+    """Start a ``docker run`` command with stdin, stdout and stderr attached.
+
+    Runs it through the Engine API when available, otherwise forks the CLI.
+
+    Args:
+        cmd: Full ``docker run`` command
+
+    Returns:
+        Process-like handle of the container
+    """
+    client = get_docker_client()
+    if client is not None and cmd[:2] == ["docker", "run"]:
+        try:
+            name, spec = container_spec_from_args(cmd[2:])
+        except ValueError:
+            pass
+        else:
+            return await client.run(spec, name=name)
+
+    return await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
@@ -0,0 +1,266 @@
+"""Fair-share scheduling of runnable groups across their owners."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+# Priority classes, served strictly in this order
+PRIORITY_TASK = 0
+PRIORITY_MESSAGE = 1
+PRIORITIES = (PRIORITY_TASK, PRIORITY_MESSAGE)
+
+Owner = int | None
+
+
+@dataclass(slots=True)
+class ScheduledEntry:
+    """A runnable group waiting for a worker.
+
+    Attributes:
+        jid: Group JID
+        owner: Owning user ID, or None for unowned groups
+        priority: Priority class
+        enqueued_at: Monotonic time the group became runnable
+    """
+
+    jid: str
+    owner: Owner
+    priority: int
+    enqueued_at: float
+
+
+class FairScheduler:
+    """Deficit round robin over group owners with strict priority classes.
+
+    Runnable groups are bucketed by priority class and then by owning user.
+    Scheduled tasks are always served before chat messages. Within a class,
+    owners take turns in a ring and an owner may dispatch while its deficit is
+    positive; when no owner in the ring has credit left, every owner in it is
+    credited the same number of quanta. Each dispatch is charged one quantum
+    up front so concurrent workers rotate between owners, and ``charge`` bills
+    the rest of the actual run time once it is known, so an owner with long
+    runs gets proportionally fewer turns. An owner's groups are served FIFO.
+
+    All membership operations are O(1); picking the next owner is O(owners).
+    """
+
+    def __init__(self, quantum: float = 1.0):
+        """Initialize the scheduler.
+
+        Args:
+            quantum: Container-seconds credited to an owner per round
+        """
+        self.quantum = quantum
+        self._entries: dict[str, ScheduledEntry] = {}
+        self._rings: dict[int, OrderedDict[Owner, OrderedDict[str, None]]] = {
+            priority: OrderedDict() for priority in PRIORITIES
+        }
+        self._deficit: dict[Owner, float] = {}
+        self._waiters: list[asyncio.Future[None]] = []
+
+    def __len__(self) -> int:
+        """Get the number of runnable groups."""
+        return len(self._entries)
+
+    def __contains__(self, jid: object) -> bool:
+        """Check whether a group is runnable."""
+        return jid in self._entries
+
+    def push(self, jid: str, owner: Owner, priority: int = PRIORITY_MESSAGE) -> bool:
+        """Mark a group runnable.
+
+        A group already waiting keeps its place in line, but moves up to a
+        higher priority class if one is given.
+
+        Args:
+            jid: Group JID
+            owner: Owning user ID
+            priority: Priority class
+
+        Returns:
+            True if the group was not runnable before
+        """
+        entry = self._entries.get(jid)
+        if entry is not None:
+            if priority < entry.priority:
+                self._unlink(entry)
+                entry.priority = priority
+                self._link(entry)
+            return False
+
+        entry = ScheduledEntry(
+            jid=jid, owner=owner, priority=priority, enqueued_at=time.monotonic()
+        )
+        self._entries[jid] = entry
+        self._link(entry)
+        self._wake()
+        return True
+
+    def remove(self, jid: str) -> bool:
+        """Withdraw a runnable group.
+
+        Args:
+            jid: Group JID
+
+        Returns:
+            True if the group was runnable
+        """
+        entry = self._entries.pop(jid, None)
+        if entry is None:
+            return False
+        self._unlink(entry)
+        return True
+
+    def get_nowait(self) -> ScheduledEntry | None:
+        """Take the next group to run without waiting.
+
+        Returns:
+            The next entry, or None if no group is runnable
+        """
+        for priority in PRIORITIES:
+            ring = self._rings[priority]
+            if not ring:
+                continue
+
+            owner = self._next_owner(ring)
+            groups = ring[owner]
+            jid, _ = groups.popitem(last=False)
+            if groups:
+                ring.move_to_end(owner)
+            else:
+                del ring[owner]
+
+            self._deficit[owner] -= self.quantum
+            entry = self._entries.pop(jid)
+            self._forget_if_idle(owner)
+            return entry
+        return None
+
+    async def get(self) -> ScheduledEntry:
+        """Wait for the next group to run.
+
+        Every push wakes one waiting caller, so a freed worker never sleeps
+        while a group is runnable.
+
+        Returns:
+            The next entry
+        """
+        while True:
+            entry = self.get_nowait()
+            if entry is not None:
+                return entry
+
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.done() and not waiter.cancelled():
+                    # Pass the wake-up on rather than losing it
+                    self._wake()
+                raise
+
+    def charge(self, owner: Owner, elapsed: float) -> None:
+        """Bill an owner for a finished run.
+
+        Args:
+            owner: Owning user ID
+            elapsed: Run time in seconds
+        """
+        self._deficit[owner] = self._deficit.get(owner, 0.0) - (elapsed - self.quantum)
+        self._forget_if_idle(owner)
+
+    def waiting_since(self, jid: str) -> float | None:
+        """Get the monotonic time a runnable group was enqueued.
+
+        Args:
+            jid: Group JID
+
+        Returns:
+            Enqueue time, or None if the group is not runnable
+        """
+        entry = self._entries.get(jid)
+        return entry.enqueued_at if entry is not None else None
+
+    def priority_of(self, jid: str) -> int | None:
+        """Get the priority class of a runnable group.
+
+        Args:
+            jid: Group JID
+
+        Returns:
+            Priority class, or None if the group is not runnable
+        """
+        entry = self._entries.get(jid)
+        return entry.priority if entry is not None else None
+
+    def deficit(self, owner: Owner) -> float:
+        """Get an owner's current deficit in container-seconds.
+
+        Args:
+            owner: Owning user ID
+
+        Returns:
+            Deficit; positive means the owner has credit
+        """
+        return self._deficit.get(owner, 0.0)
+
+    def _link(self, entry: ScheduledEntry) -> None:
+        """Append an entry to its owner's FIFO in its priority ring."""
+        ring = self._rings[entry.priority]
+        groups = ring.get(entry.owner)
+        if groups is None:
+            groups = ring[entry.owner] = OrderedDict()
+            self._deficit.setdefault(entry.owner, 0.0)
+        groups[entry.jid] = None
+
+    def _unlink(self, entry: ScheduledEntry) -> None:
+        """Remove an entry from its priority ring."""
+        ring = self._rings[entry.priority]
+        groups = ring[entry.owner]
+        del groups[entry.jid]
+        if not groups:
+            del ring[entry.owner]
+        self._forget_if_idle(entry.owner)
+
+    def _next_owner(self, ring: OrderedDict[Owner, OrderedDict[str, None]]) -> Owner:
+        """Pick the first owner in ring order that has credit.
+
+        Args:
+            ring: Non-empty owner ring of one priority class
+
+        Returns:
+            Owner to serve next
+        """
+        for owner in ring:
+            if self._deficit[owner] > 0:
+                return owner
+
+        # Nobody has credit: run as many rounds as it takes for the least
+        # indebted owner to get some, crediting everyone equally
+        best = max(self._deficit[owner] for owner in ring)
+        rounds = int(-best // self.quantum) + 1
+        for owner in ring:
+            self._deficit[owner] += rounds * self.quantum
+        return next(owner for owner in ring if self._deficit[owner] > 0)
+
+    def _forget_if_idle(self, owner: Owner) -> None:
+        """Drop unused credit of an owner with nothing runnable.
+
+        Debt is kept so an owner cannot shed it by going idle briefly.
+        """
+        if any(owner in ring for ring in self._rings.values()):
+            return
+        if self._deficit.get(owner, 0.0) >= 0:
+            self._deficit.pop(owner, None)
+
+    def _wake(self) -> None:
+        """Wake one caller blocked in ``get``."""
+        while self._waiters:
+            waiter = self._waiters.pop(0)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
@@ -1,14 +1,32 @@
 """Group queue manager for managing concurrent group processing."""
 
 import asyncio
+import heapq
+import random
+import time
+from datetime import datetime, timedelta
 from dataclasses import dataclass, field
-from typing import Any
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 from nanogridbot.config import get_config
+from nanogridbot.core.fair_scheduler import PRIORITY_MESSAGE, PRIORITY_TASK, FairScheduler
+from nanogridbot.core.resources import ResourceClass, resource_class_for
 from nanogridbot.database import Database
 from nanogridbot.types import ContainerConfig, ContainerOutput, RegisteredGroup, ScheduledTask
 from nanogridbot.utils.formatting import format_messages_xml
 
+if TYPE_CHECKING:
+    from nanogridbot.core.resources import AdmissionController
+    from nanogridbot.core.progressive_reply import ProgressiveReply
+    from nanogridbot.core.router import MessageRouter
+    from nanogridbot.core.session_containers import SessionContainerManager
+
+_PRIORITY_NAMES = {PRIORITY_TASK: "task", PRIORITY_MESSAGE: "message"}
+
+# How often groups waiting for host capacity are offered to workers again,
+# in case memory was freed outside the queue
+ADMISSION_RECHECK_SECONDS = 5.0
+
 
 @dataclass
 class GroupState:
@@ -21,50 +39,172 @@ class GroupState:
     container_name: str | None = None
     group_folder: str | None = None
     retry_count: int = 0
+    group: RegisteredGroup | None = None
+    session_id: str | None = None
+    runs: int = 0
+    total_wait: float = 0.0
+    last_wait: float = 0.0
+    started_at: float | None = None
+    retry_at: float | None = None
+
+    @property
+    def has_pending(self) -> bool:
+        """Check whether the group has work waiting to run.
+
+        Messages of a group backing off after a failure only become runnable
+        once the retry is due; tasks are unaffected.
+        """
+        return bool(self.pending_tasks) or (self.pending_messages and self.retry_at is None)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for the group."""
+        return len(self.pending_tasks) + int(self.pending_messages)
+
+
+@dataclass
+class QueueJob:
+    """A unit of work claimed by a queue worker.
+
+    Attributes:
+        jid: Group JID
+        group: Registered group configuration
+        session_id: Session ID to resume
+        task: Scheduled task to run, or None to process pending messages
+        resources: Resource class admitted for the run, if admission is on
+    """
+
+    jid: str
+    group: RegisteredGroup
+    session_id: str | None
+    task: ScheduledTask | None = None
+    resources: ResourceClass | None = None
 
 
 class GroupQueue:
-    """Manages concurrent processing of group messages and tasks."""
+    """Manages concurrent processing of group messages and tasks.
+
+    Enqueueing only records work on the group's state and marks the group
+    runnable; a fixed pool of workers pulls runnable groups and runs their
+    containers. The lock guards state changes only and is never held while a
+    container runs, so up to ``container_max_concurrent_containers`` groups
+    are processed in parallel while each group runs at most one container.
 
-    def __init__(self, config: "get_config", db: Database):
+    Runnable groups are ordered by a ``FairScheduler``: groups with scheduled
+    tasks go before groups with only chat messages, and container time is
+    shared fairly between the users owning the groups.
+
+    With an ``AdmissionController``, a claimed group also has to fit its
+    resource class into the host's free CPU and memory. A group that does
+    not fit waits aside until another run finishes, or may run with a
+    smaller class.
+    """
+
+    def __init__(
+        self,
+        config: "get_config",
+        db: Database,
+        agent_cursors: dict[str, int] | None = None,
+        session_containers: "SessionContainerManager | None" = None,
+        router: "MessageRouter | None" = None,
+        admission: "AdmissionController | None" = None,
+    ):
         """Initialize the group queue.
 
         Args:
             config: Application configuration
             db: Database instance
+            agent_cursors: Per-chat sequence of the last message handed to the
+                agent; shared with the orchestrator so it gets persisted
+            session_containers: Manager of long-lived per-group containers
+                to run message turns in; each turn starts a container if None
+            router: Router delivering agent results to chats as soon as the
+                container emits them
+            admission: Controller admitting runs by host capacity; runs are
+                only limited by the worker count if None
         """
         self.config = config
         self.db = db
+        self.agent_cursors: dict[str, int] = agent_cursors if agent_cursors is not None else {}
+        self.session_containers = session_containers
+        self.router = router
+        self.admission = admission
         self.states: dict[str, GroupState] = {}
         self.active_count = 0
-        self.waiting_groups: list[str] = []
+        self.scheduler = FairScheduler()
+        self._workers: list[asyncio.Task] = []
+        # Min-heap of (due time, jid) for groups backing off after a failure
+        self._retries: list[tuple[float, str]] = []
+        self._retry_wakeup = asyncio.Event()
+        self._retry_task: asyncio.Task | None = None
+        # Groups refused admission, in arrival order
+        self._awaiting_capacity: dict[str, None] = {}
         self._lock = asyncio.Lock()
 
+    @property
+    def waiting_count(self) -> int:
+        """Number of groups waiting for a free worker."""
+        return len(self.scheduler)
+
+    async def start(self) -> None:
+        """Start the worker pool."""
+        from loguru import logger
+
+        if self._workers:
+            return
+
+        size = max(1, self.config.container_max_concurrent_containers)
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"group-queue-worker-{i}")
+            for i in range(size)
+        ]
+        self._retry_task = asyncio.create_task(self._retry_loop(), name="group-queue-retries")
+        logger.info(f"Group queue started with {size} workers")
+
+    async def shutdown(self) -> None:
+        """Stop the worker pool, cancelling any running jobs."""
+        tasks = list(self._workers)
+        if self._retry_task:
+            tasks.append(self._retry_task)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._retry_task = None
+
     async def enqueue_message_check(
         self,
         jid: str,
         group: RegisteredGroup,
         session_id: str | None,
-        last_timestamp: str | None,
+        last_seq: int | None,
     ) -> None:
         """Enqueue a message check for a group.
 
+        Returns as soon as the check is recorded; a worker runs the container
+        later. Messages for a group with a running container are forwarded to
+        it as follow-ups.
+
         Args:
             jid: Group JID
             group: Registered group configuration
             session_id: Current session ID
-            last_timestamp: Last processed message timestamp
+            last_seq: Sequence of the last message the agent has seen
         """
         async with self._lock:
             state = self._get_state(jid, group.folder)
+            state.group = group
+            state.session_id = session_id
+            state.pending_messages = True
+            if last_seq is not None:
+                self._advance_agent_cursor(jid, last_seq)
 
-            if state.active:
-                # Group is processing, mark as pending
-                state.pending_messages = True
-                await self._send_follow_up_messages(jid, last_timestamp)
-            else:
-                # Try to start container
-                await self._try_start_container(jid, group, session_id, last_timestamp)
+            follow_up = state.active
+            self._schedule(state)
+
+        if follow_up:
+            await self._send_follow_up_messages(jid, last_seq)
 
     async def enqueue_task(
         self,
@@ -83,152 +223,341 @@ class GroupQueue:
         """
         async with self._lock:
             state = self._get_state(jid, group.folder)
+            state.group = group
+            state.session_id = session_id
 
             if state.active:
                 # Tasks have higher priority than messages
                 state.pending_tasks.insert(0, task)
             else:
-                await self._try_start_task(jid, group, task, session_id)
+                state.pending_tasks.append(task)
+            self._schedule(state)
 
-    async def _try_start_container(
-        self,
-        jid: str,
-        group: RegisteredGroup,
-        session_id: str | None,
-        last_timestamp: str | None,
-    ) -> None:
-        """Try to start a container for the group.
+    def _schedule(self, state: GroupState) -> None:
+        """Mark a group runnable unless it is running or has nothing to do.
+
+        A group already waiting keeps its place but is promoted to the task
+        class once it has a task pending. Must be called with the lock held.
 
         Args:
-            jid: Group JID
-            group: Registered group configuration
-            session_id: Current session ID
-            last_timestamp: Last processed message timestamp
+            state: Group state
+        """
+        if state.active or not state.has_pending:
+            return
+        priority = PRIORITY_TASK if state.pending_tasks else PRIORITY_MESSAGE
+        owner = state.group.user_id if state.group else None
+        self.scheduler.push(state.jid, owner, priority)
+
+    async def _worker(self, worker_id: int) -> None:
+        """Pull runnable groups and run their next job until cancelled.
+
+        Args:
+            worker_id: Worker index, used for logging
         """
         from loguru import logger
 
-        # Check concurrency limit
-        if self.active_count >= self.config.container_max_concurrent_containers:
-            if jid not in self.waiting_groups:
-                self.waiting_groups.append(jid)
-            logger.debug(f"Group {jid} waiting, active: {self.active_count}")
-            return
+        while True:
+            entry = await self.scheduler.get()
+            job = await self._claim(entry.jid, time.monotonic() - entry.enqueued_at)
+            if job is None:
+                continue
+
+            logger.debug(f"Worker {worker_id} running {entry.jid}")
+            await self._execute(job)
 
-        # Start container
-        state = self._get_state(jid, group.folder)
-        state.active = True
-        self.active_count += 1
+    async def _execute(self, job: QueueJob) -> None:
+        """Run a claimed job and release its group.
+
+        A message run that raises is scheduled for a delayed retry; the
+        worker moves on immediately instead of sleeping through the backoff.
+
+        Args:
+            job: Claimed job
+        """
+        from loguru import logger
 
+        failed = False
         try:
-            # Get messages since last timestamp
-            messages = await self.db.get_messages_since(jid, last_timestamp)
+            if job.task is not None:
+                await self._run_task(
+                    job.jid, job.group, job.task, job.session_id, resources=job.resources
+                )
+            else:
+                await self._run_messages(
+                    job.jid,
+                    job.group,
+                    job.session_id,
+                    self.agent_cursors.get(job.jid),
+                    resources=job.resources,
+                )
+        except Exception as e:
+            logger.error(f"Container error for {job.jid}: {e}")
+            failed = job.task is None
+        finally:
+            await self._release(job.jid, failed=failed, ran_messages=job.task is None)
 
-            # Format messages as XML
-            prompt = format_messages_xml(
-                [
-                    {
-                        "sender": msg.sender,
-                        "sender_name": msg.sender_name,
-                        "content": msg.content,
-                        "timestamp": msg.timestamp,
-                        "is_from_me": msg.is_from_me,
-                    }
-                    for msg in messages
-                ]
+    async def _claim(self, jid: str, waited: float = 0.0) -> QueueJob | None:
+        """Take the next job for a group and mark the group active.
+
+        Tasks are taken before messages.
+
+        Args:
+            jid: Group JID
+            waited: Seconds the group waited for a worker
+
+        Returns:
+            The claimed job, or None if the group has nothing to run
+        """
+        async with self._lock:
+            state = self.states.get(jid)
+            if state is None:
+                return None
+            if state.active or state.group is None or not state.has_pending:
+                return None
+
+            resources: ResourceClass | None = None
+            if self.admission is not None:
+                resources = self.admission.try_admit(
+                    jid, resource_class_for(state.group.container_config)
+                )
+                if resources is None:
+                    self._awaiting_capacity[jid] = None
+                    return None
+
+            task: ScheduledTask | None = None
+            if state.pending_tasks:
+                task = state.pending_tasks.pop(0)
+            else:
+                state.pending_messages = False
+
+            state.active = True
+            state.started_at = time.monotonic()
+            state.runs += 1
+            state.last_wait = waited
+            state.total_wait += waited
+            self.active_count += 1
+            return QueueJob(
+                jid=jid,
+                group=state.group,
+                session_id=state.session_id,
+                task=task,
+                resources=resources,
             )
 
-            # Create container config if specified
-            container_config: ContainerConfig | None = None
-            if group.container_config:
-                container_config = ContainerConfig(**group.container_config)
+    async def _release(self, jid: str, failed: bool = False, ran_messages: bool = False) -> None:
+        """Mark a group idle after a job and requeue it if more work arrived.
 
-            # Import here to avoid circular dependency
-            from nanogridbot.core.container_runner import run_container_agent
+        Args:
+            jid: Group JID
+            failed: Whether a message run failed and should be retried
+            ran_messages: Whether the job processed messages rather than a task
+        """
+        async with self._lock:
+            state = self.states[jid]
+            if state.started_at is not None:
+                owner = state.group.user_id if state.group else None
+                self.scheduler.charge(owner, time.monotonic() - state.started_at)
+                state.started_at = None
+            state.active = False
+            state.container_name = None
+            self.active_count -= 1
+            if self.admission is not None:
+                self.admission.release(jid)
+                self._offer_capacity()
+
+            if failed:
+                self._schedule_retry(state)
+            elif ran_messages:
+                state.retry_count = 0
+            self._schedule(state)
+
+    def _offer_capacity(self) -> None:
+        """Make groups refused admission runnable again.
+
+        Must be called with the lock held.
+        """
+        waiting = list(self._awaiting_capacity)
+        self._awaiting_capacity.clear()
+        for jid in waiting:
+            state = self.states.get(jid)
+            if state is not None:
+                self._schedule(state)
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Get a jittered exponential backoff delay.
+
+        Args:
+            attempt: Retry attempt number, starting at 1
+
+        Returns:
+            Delay in seconds, between half and all of the exponential step
+        """
+        step = self.config.container_retry_base_delay * (2 ** (attempt - 1))
+        return random.uniform(step / 2, step)
+
+    def _schedule_retry(self, state: GroupState) -> None:
+        """Put a failed group into the retry heap, or drop it when out of retries.
+
+        Must be called with the lock held.
+
+        Args:
+            state: Group state
+        """
+        from loguru import logger
+
+        state.retry_count += 1
+        if state.retry_count >= self.config.container_max_retries:
+            logger.error(f"Max retries reached for {state.jid}, dropping")
+            state.retry_count = 0
+            return
+
+        delay = self._retry_delay(state.retry_count)
+        state.retry_at = time.monotonic() + delay
+        state.pending_messages = True
+        heapq.heappush(self._retries, (state.retry_at, state.jid))
+        self._retry_wakeup.set()
+        logger.info(f"Retrying {state.jid} in {delay:.1f}s (attempt {state.retry_count})")
+
+    def _promote_due_retries(self, now: float) -> float | None:
+        """Hand groups whose retry is due back to the scheduler.
+
+        Must be called with the lock held.
+
+        Args:
+            now: Current monotonic time
+
+        Returns:
+            Seconds until the next retry is due, or None if none are pending
+        """
+        while self._retries and self._retries[0][0] <= now:
+            due, jid = heapq.heappop(self._retries)
+            state = self.states.get(jid)
+            if state is None or state.retry_at != due:
+                # Superseded entry
+                continue
+            state.retry_at = None
+            self._schedule(state)
+        return self._retries[0][0] - now if self._retries else None
+
+    async def _retry_loop(self) -> None:
+        """Sleep until the next retry is due and release it, until cancelled."""
+        while True:
+            async with self._lock:
+                self._retry_wakeup.clear()
+                delay = self._promote_due_retries(time.monotonic())
+                if self._awaiting_capacity:
+                    self._offer_capacity()
+                    delay = min(delay or ADMISSION_RECHECK_SECONDS, ADMISSION_RECHECK_SECONDS)
+            try:
+                await asyncio.wait_for(self._retry_wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_messages(
+        self,
+        jid: str,
+        group: RegisteredGroup,
+        session_id: str | None,
+        last_seq: int | None,
+        resources: ResourceClass | None = None,
+    ) -> None:
+        """Run a container over the messages the agent has not seen yet.
+
+        Args:
+            jid: Group JID
+            group: Registered group configuration
+            session_id: Current session ID
+            last_seq: Sequence of the last message the agent has seen
+            resources: Resource class admitted for the run
 
-            # Run container
-            result = await run_container_agent(
+        Raises:
+            Exception: Container errors propagate so the run can be retried
+        """
+        # Get messages the agent has not seen yet
+        messages = await self.db.get_messages_since(jid, last_seq)
+
+        # Format messages as XML
+        prompt = format_messages_xml(
+            [
+                {
+                    "sender": msg.sender,
+                    "sender_name": msg.sender_name,
+                    "content": msg.content,
+                    "timestamp": msg.timestamp,
+                    "is_from_me": msg.is_from_me,
+                }
+                for msg in messages
+            ]
+        )
+
+        container_config = self._container_config(group, resources)
+
+        # Import here to avoid circular dependency
+        from nanogridbot.core.container_runner import run_container_agent
+
+        # Run in the group's session container if enabled, otherwise in a
+        # fresh one
+        run = self.session_containers.run if self.session_containers else run_container_agent
+        on_output, reply = await self._open_delivery(jid)
+        try:
+            result = await run(
                 group_folder=group.folder,
                 prompt=prompt,
                 session_id=session_id,
                 chat_jid=jid,
                 is_main=(group.folder == "main"),
                 container_config=container_config,
+                on_output=on_output,
             )
-
-            # Handle result
-            await self._handle_container_result(jid, result, group, session_id)
-
-        except Exception as e:
-            logger.error(f"Container error for {jid}: {e}")
-            state.retry_count += 1
-
-            if state.retry_count < 5:
-                # Exponential backoff retry
-                delay = 5 * (2 ** (state.retry_count - 1))
-                logger.info(f"Retrying {jid} in {delay}s (attempt {state.retry_count})")
-                await asyncio.sleep(delay)
-                await self._try_start_container(jid, group, session_id, last_timestamp)
-            else:
-                logger.error(f"Max retries reached for {jid}, dropping")
-
         finally:
-            # Clean up state
-            state.active = False
-            state.retry_count = 0
-            self.active_count -= 1
+            await self._close_delivery(reply)
 
-            # Process pending items
-            await self._drain_pending(jid, group, session_id)
+        # Advance the agent cursor past the messages it has now seen
+        if result.status == "success" and messages and messages[-1].seq is not None:
+            self._advance_agent_cursor(jid, messages[-1].seq)
 
-            # Wake up waiting groups
-            await self._drain_waiting()
+        # Handle result
+        await self._handle_container_result(jid, result, group, session_id)
 
-    async def _try_start_task(
+    async def _run_task(
         self,
         jid: str,
         group: RegisteredGroup,
         task: ScheduledTask,
         session_id: str | None,
+        resources: ResourceClass | None = None,
     ) -> None:
-        """Try to start a task for the group.
+        """Run a scheduled task in a container.
 
         Args:
             jid: Group JID
             group: Registered group configuration
             task: Scheduled task
             session_id: Current session ID
+            resources: Resource class admitted for the run
         """
         from loguru import logger
 
-        # Check concurrency limit
-        if self.active_count >= self.config.container_max_concurrent_containers:
-            if jid not in self.waiting_groups:
-                self.waiting_groups.append(jid)
-            return
-
-        # Start task
-        state = self._get_state(jid, group.folder)
-        state.active = True
-        self.active_count += 1
-
         try:
-            # Create container config if specified
-            container_config: ContainerConfig | None = None
-            if group.container_config:
-                container_config = ContainerConfig(**group.container_config)
+            container_config = self._container_config(group, resources)
 
             # Import here to avoid circular dependency
             from nanogridbot.core.container_runner import run_container_agent
 
             # Run container with task prompt
-            result = await run_container_agent(
-                group_folder=group.folder,
-                prompt=task.prompt,
-                session_id=session_id,
-                chat_jid=jid,
-                is_main=(group.folder == "main"),
-                container_config=container_config,
-            )
+            on_output, reply = await self._open_delivery(jid)
+            try:
+                result = await run_container_agent(
+                    group_folder=group.folder,
+                    prompt=task.prompt,
+                    session_id=session_id,
+                    chat_jid=jid,
+                    is_main=(group.folder == "main"),
+                    container_config=container_config,
+                    on_output=on_output,
+                )
+            finally:
+                await self._close_delivery(reply)
 
             # Handle result
             await self._handle_container_result(jid, result, group, session_id)
@@ -236,32 +565,20 @@ class GroupQueue:
         except Exception as e:
             logger.error(f"Task error for {jid}: {e}")
 
-        finally:
-            # Clean up state
-            state.active = False
-            self.active_count -= 1
-
-            # Process pending items
-            await self._drain_pending(jid, group, session_id)
-
-            # Wake up waiting groups
-            await self._drain_waiting()
-
     async def _send_follow_up_messages(
         self,
         jid: str,
-        last_timestamp: str | None,
+        last_seq: int | None,
     ) -> None:
         """Send follow-up messages to an active container.
 
         Args:
             jid: Group JID
-            last_timestamp: Last processed timestamp
+            last_seq: Sequence of the last message the agent has seen
         """
         import json
-        from pathlib import Path
 
-        messages = await self.db.get_messages_since(jid, last_timestamp)
+        messages = await self.db.get_messages_since(jid, last_seq)
 
         # Write IPC files for each new message
         ipc_dir = self.config.data_dir / "ipc" / jid
@@ -280,38 +597,74 @@ class GroupQueue:
                 )
             )
 
-    async def _drain_pending(
-        self,
-        jid: str,
-        group: RegisteredGroup,
-        session_id: str | None,
-    ) -> None:
-        """Process pending items for a group.
+    def get_status(self) -> dict[str, dict[str, Any]]:
+        """Get per-group queue status.
+
+        Returns:
+            Mapping of group JID to its activity, queue depth, wait times,
+            retry backoff and whether it waits for host capacity
+        """
+        now = time.monotonic()
+        wall_now = datetime.now()
+        max_retries = self.config.container_max_retries
+        status: dict[str, dict[str, Any]] = {}
+        for jid, state in self.states.items():
+            since = self.scheduler.waiting_since(jid)
+            retry_in = max(0.0, state.retry_at - now) if state.retry_at is not None else None
+            status[jid] = {
+                "active": state.active,
+                "queued": since is not None,
+                "awaiting_capacity": jid in self._awaiting_capacity,
+                "priority": _PRIORITY_NAMES.get(self.scheduler.priority_of(jid)),
+                "owner": state.group.user_id if state.group else None,
+                "queue_depth": state.queue_depth,
+                "pending_tasks": len(state.pending_tasks),
+                "pending_messages": state.pending_messages,
+                "waiting_seconds": now - since if since is not None else 0.0,
+                "last_wait_seconds": state.last_wait,
+                "avg_wait_seconds": state.total_wait / state.runs if state.runs else 0.0,
+                "runs": state.runs,
+                "retry_count": state.retry_count,
+                "retries_remaining": max_retries - 1 - state.retry_count,
+                "next_retry_in": retry_in,
+                "next_retry_at": (
+                    (wall_now + timedelta(seconds=retry_in)).isoformat()
+                    if retry_in is not None
+                    else None
+                ),
+            }
+        return status
+
+    @staticmethod
+    def _container_config(
+        group: RegisteredGroup, resources: ResourceClass | None
+    ) -> ContainerConfig | None:
+        """Build the container config for a run.
 
         Args:
-            jid: Group JID
             group: Registered group configuration
-            session_id: Current session ID
+            resources: Resource class admitted for the run; overrides the
+                group's own class when admission downgraded it
+
+        Returns:
+            Container config, or None if the group has none and runs with
+            its own class
+        """
+        if resources is not None and resources != resource_class_for(group.container_config):
+            return ContainerConfig(**{**(group.container_config or {}), "resource_class": resources.name})
+        if group.container_config:
+            return ContainerConfig(**group.container_config)
+        return None
+
+    def _advance_agent_cursor(self, jid: str, seq: int) -> None:
+        """Move a chat's agent cursor forward, never backward.
+
+        Args:
+            jid: Group JID
+            seq: Sequence of the newest message handed to the agent
         """
-        state = self._get_state(jid, group.folder)
-
-        # Priority: tasks first, then messages
-        if state.pending_tasks:
-            task = state.pending_tasks.pop(0)
-            await self._try_start_task(jid, group, task, session_id)
-        elif state.pending_messages:
-            state.pending_messages = False
-            last_timestamp = await self.db.get_last_agent_timestamp(jid)
-            await self._try_start_container(jid, group, session_id, last_timestamp)
-
-    async def _drain_waiting(self) -> None:
-        """Wake up waiting groups if capacity is available."""
-        while (
-            self.waiting_groups
-            and self.active_count < self.config.container_max_concurrent_containers
-        ):
-            jid = self.waiting_groups.pop(0)
-            # TODO: Re-enqueue the group
+        if seq > self.agent_cursors.get(jid, 0):
+            self.agent_cursors[jid] = seq
 
     def _get_state(self, jid: str, group_folder: str) -> GroupState:
         """Get or create state for a group.
@@ -327,6 +680,55 @@ class GroupQueue:
             self.states[jid] = GroupState(jid=jid, group_folder=group_folder)
         return self.states[jid]
 
+    async def _open_delivery(
+        self, jid: str
+    ) -> tuple[Callable[[ContainerOutput], Awaitable[None]] | None, "ProgressiveReply | None"]:
+        """Prepare delivery of a run's results to its chat.
+
+        In edit mode a placeholder is posted now and edited as results
+        arrive; otherwise each result is sent as its own message.
+
+        Args:
+            jid: Group JID
+
+        Returns:
+            Callback for the container runner, or None without a router, and
+            the reply to close once the run ends, if one was opened
+        """
+        router = self.router
+        if router is None:
+            return None, None
+
+        reply = await router.open_reply(jid)
+        parts: list[str] = []
+
+        async def deliver(output: ContainerOutput) -> None:
+            if output.status != "success" or not output.result:
+                return
+            if reply is None:
+                await router.send_response(jid, output.result)
+            else:
+                parts.append(output.result)
+                await reply.update("\n\n".join(parts))
+
+        return deliver, reply
+
+    @staticmethod
+    async def _close_delivery(reply: "ProgressiveReply | None") -> None:
+        """Write the final text of an edited reply.
+
+        Args:
+            reply: Reply opened by ``_open_delivery``, if any
+        """
+        if reply is None:
+            return
+        try:
+            await reply.finish()
+        except Exception as e:
+            from loguru import logger
+
+            logger.error(f"Error finishing reply in {reply.chat_jid}: {e}")
+
     async def _handle_container_result(
         self,
         jid: str,
@@ -345,9 +747,8 @@ class GroupQueue:
         from loguru import logger
 
         if result.status == "success" and result.result:
-            # Send result to channel
+            # Results reach the channel through _open_delivery as they arrive
             logger.info(f"Container completed for {jid}")
-            # TODO: Send via router
         else:
             logger.error(f"Container failed for {jid}: {result.error}")
 
@@ -367,27 +768,16 @@ class GroupQueue:
             if not state or not state.active or not state.container_name:
                 logger.info(f"No active container found for {jid}")
                 return False
-
             container_name = state.container_name
 
-            try:
-                # Import and use docker to stop the container
-                import aiodocker
-
-                docker = aiodocker.Docker()
-                try:
-                    container = docker.containers.get(container_name)
-                    await container.stop(timeout=5)
-                    logger.info(f"Container {container_name} stopped successfully")
-                    state.active = False
-                    state.container_name = None
-                    self.active_count = max(0, self.active_count - 1)
-                    return True
-                finally:
-                    await docker.close()
-            except Exception as e:
-                logger.error(f"Failed to stop container {container_name}: {e}")
-                return False
+        # Stop outside the lock; the worker running the container releases
+        # the group once the run returns
+        from nanogridbot.core.container_runner import stop_container
+
+        if not await stop_container(container_name):
+            return False
+        logger.info(f"Container {container_name} stopped successfully")
+        return True
 
     async def enqueue(self, jid: str, message: Any) -> None:
         """Enqueue a message for processing.
@@ -0,0 +1,217 @@
+"""Cache of prepared container launches, invalidated by filesystem changes."""
+
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Hashable
+
+from nanogridbot.core.resources import ResourceClass
+
+# Stat signature of a path; None if it does not exist
+Stamp = tuple[int, ...] | None
+
+
+def stamp_path(path: Path, contents_matter: bool) -> Stamp:
+    """Get the stat signature of a path.
+
+    Args:
+        path: Host path
+        contents_matter: Include modification time and size; without it only
+            the path's identity (device and inode) is compared
+
+    Returns:
+        Signature, or None if the path does not exist
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if contents_matter:
+        return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+    return (st.st_dev, st.st_ino)
+
+
+def stamp_paths(paths: list[tuple[Path, bool]]) -> tuple[tuple[Path, bool, Stamp], ...]:
+    """Stamp each of a list of paths.
+
+    Args:
+        paths: (path, contents_matter) pairs
+
+    Returns:
+        (path, contents_matter, stamp) triples
+    """
+    return tuple((path, contents, stamp_path(path, contents)) for path, contents in paths)
+
+
+@dataclass
+class LaunchPlan:
+    """Everything needed to start a group's container, prepared once.
+
+    Attributes:
+        group_folder: Group folder name
+        mounts: Validated (host_path, container_path, mode) mounts
+        env_mount: Mount of the group's filtered env file, if it has one
+        command: ``docker run`` command without a container name
+        resources: CPU and memory limits in the command
+        stamps: Stat signatures of the paths the plan was derived from
+    """
+
+    group_folder: str
+    mounts: list[tuple[str, str, str]]
+    env_mount: tuple[str, str, str] | None
+    command: list[str]
+    resources: ResourceClass | None = None
+    stamps: tuple[tuple[Path, bool, Stamp], ...] = field(default_factory=tuple)
+
+    def command_for(self, name: str | None = None) -> list[str]:
+        """Get the docker command, optionally naming the container.
+
+        Args:
+            name: Container name
+
+        Returns:
+            A fresh copy of the command
+        """
+        cmd = list(self.command)
+        if name:
+            # Right after "docker run -i --rm --network=none"
+            cmd[5:5] = ["--name", name]
+        return cmd
+
+    def is_current(self) -> bool:
+        """Check that none of the paths the plan depends on has changed."""
+        return all(stamp_path(path, contents) == stamp for path, contents, stamp in self.stamps)
+
+
+class LaunchPlanCache:
+    """LRU cache of launch plans keyed by group configuration.
+
+    A plan is looked up by everything its preparation depends on besides the
+    filesystem: group folder, container config, main flag, user, environment
+    and relevant settings. The filesystem side is checked on every hit by
+    re-stating the recorded paths, which is a handful of ``stat`` calls
+    instead of directory creation, path resolution, mount validation, env
+    file rewriting and skill copying.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Plans kept; the least recently used is dropped
+        """
+        self.max_entries = max_entries
+        self._plans: OrderedDict[Hashable, LaunchPlan] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        """Get the number of cached plans."""
+        return len(self._plans)
+
+    def get(self, key: Hashable) -> LaunchPlan | None:
+        """Get a plan that is still valid.
+
+        Args:
+            key: Plan key from ``launch_plan_key``
+
+        Returns:
+            The plan, or None if missing or stale
+        """
+        plan = self._plans.get(key)
+        if plan is None:
+            self.misses += 1
+            return None
+        if not plan.is_current():
+            del self._plans[key]
+            self.invalidations += 1
+            self.misses += 1
+            return None
+        self._plans.move_to_end(key)
+        self.hits += 1
+        return plan
+
+    def put(self, key: Hashable, plan: LaunchPlan) -> None:
+        """Store a plan.
+
+        Args:
+            key: Plan key from ``launch_plan_key``
+            plan: Prepared plan
+        """
+        self._plans[key] = plan
+        self._plans.move_to_end(key)
+        while len(self._plans) > self.max_entries:
+            self._plans.popitem(last=False)
+
+    def invalidate(self, group_folder: str | None = None) -> int:
+        """Drop plans.
+
+        Args:
+            group_folder: Only drop this group's plans; all if None
+
+        Returns:
+            Number of plans dropped
+        """
+        if group_folder is None:
+            dropped = len(self._plans)
+            self._plans.clear()
+            return dropped
+        stale = [key for key, plan in self._plans.items() if plan.group_folder == group_folder]
+        for key in stale:
+            del self._plans[key]
+        return len(stale)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Size, hits, misses and invalidations
+        """
+        return {
+            "size": len(self._plans),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+def launch_plan_key(
+    group_folder: str,
+    container_config: dict[str, Any] | None,
+    is_main: bool,
+    user_id: int | None,
+    env: dict[str, str] | None,
+    timeout: int,
+    config: Any,
+) -> Hashable:
+    """Build the cache key for a launch.
+
+    Args:
+        group_folder: Group folder name
+        container_config: Container configuration as a dict
+        is_main: Whether this is the main group
+        user_id: Optional user ID for user-specific mounts
+        env: Environment variables for the container
+        timeout: Container timeout in seconds
+        config: Application configuration
+
+    Returns:
+        Hashable key
+    """
+    return (
+        group_folder,
+        json.dumps(container_config or {}, sort_keys=True, default=str),
+        is_main,
+        user_id,
+        tuple(sorted((env or {}).items())),
+        timeout,
+        str(config.base_dir),
+        str(config.data_dir),
+        str(config.groups_dir),
+        str(config.store_dir),
+        config.container_image,
+        config.container_default_resource_class,
+    )
@@ -0,0 +1,61 @@
+"""In-process per-chat inbox for push-based message ingestion."""
+
+import asyncio
+
+from nanogridbot.types import Message
+
+
+class MessageInbox:
+    """Buffers pushed messages per chat until the dispatcher picks them up.
+
+    Messages for the same chat are batched: a chat appears at most once in the
+    ready queue, and everything that arrived for it in the meantime is handed
+    to the dispatcher in arrival order.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty inbox."""
+        self._pending: dict[str, list[Message]] = {}
+        self._ready: asyncio.Queue[str] = asyncio.Queue()
+
+    def put(self, message: Message) -> None:
+        """Add a message to its chat's pending batch.
+
+        Args:
+            message: Message to enqueue
+        """
+        batch = self._pending.get(message.chat_jid)
+        if batch is None:
+            self._pending[message.chat_jid] = [message]
+            self._ready.put_nowait(message.chat_jid)
+        else:
+            batch.append(message)
+
+    async def get(self) -> tuple[str, list[Message]]:
+        """Wait for the next chat with pending messages.
+
+        Returns:
+            Tuple of (chat JID, messages in arrival order)
+        """
+        while True:
+            jid = await self._ready.get()
+            messages = self._pending.pop(jid, None)
+            if messages:
+                return jid, messages
+
+    def pending_count(self, jid: str | None = None) -> int:
+        """Get the number of buffered messages.
+
+        Args:
+            jid: Optional chat JID to count for; counts all chats if None
+
+        Returns:
+            Number of pending messages
+        """
+        if jid is not None:
+            return len(self._pending.get(jid, []))
+        return sum(len(batch) for batch in self._pending.values())
+
+    def __len__(self) -> int:
+        """Get the number of chats with pending messages."""
+        return len(self._pending)
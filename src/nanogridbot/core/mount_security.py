@@ -1,6 +1,5 @@
 """Mount security validation for container volumes."""
 
-import shutil
 from pathlib import Path
 from typing import Any
 
@@ -163,13 +162,87 @@ async def validate_group_mounts(
         ],
     )
 
-    # Sync skills for this group
-    sync_group_skills(group_folder, user_id)
+    # Skills: one shared read-only snapshot, or synced into the session dir
+    if config.skills_shared_mount:
+        from nanogridbot.core.skills_store import get_skills_store
+
+        shared_skills = get_skills_store().shared_dir()
+        if shared_skills:
+            mounts.append(
+                {
+                    "host_path": str(shared_skills),
+                    "container_path": "/home/node/.claude/skills",
+                    "mode": "ro",
+                }
+            )
+    else:
+        sync_group_skills(group_folder, user_id)
 
     # Validate all mounts
     return await validate_mounts(mounts, is_main=is_main)
 
 
+def group_mount_dependencies(
+    group_folder: str,
+    container_config: dict[str, Any] | None = None,
+    is_main: bool = False,
+    user_id: int | None = None,
+) -> list[tuple[Path, bool]]:
+    """List the host paths whose state decides a group's mounts and env file.
+
+    Covers every path ``validate_group_mounts`` and ``create_group_env_file``
+    look at, including optional ones that may not exist yet, so a change to
+    any of them means the result has to be computed again.
+
+    Args:
+        group_folder: Group folder name
+        container_config: Optional container configuration
+        is_main: Whether this is the main group
+        user_id: Optional user ID for user-specific mounts
+
+    Returns:
+        (path, contents_matter) pairs; for directories mounted as a whole
+        only their identity matters, not their changing contents
+    """
+    from nanogridbot.config import get_config
+
+    config = get_config()
+    user_base = config.data_dir / "users" / str(user_id) if user_id else None
+    root = user_base or config.data_dir
+
+    paths: list[tuple[Path, bool]] = []
+    if user_base:
+        paths += [
+            (user_base / "groups" / group_folder, False),
+            (user_base / "memory", False),
+            (user_base / "archives", False),
+            (user_base / "config.json", True),
+        ]
+    else:
+        paths.append((config.groups_dir / group_folder, False))
+    paths += [
+        (config.groups_dir / "global", False),
+        (root / "sessions" / group_folder / ".claude", False),
+        (root / "ipc" / group_folder, False),
+    ]
+    if is_main:
+        paths.append((config.base_dir, False))
+    for mount in (container_config or {}).get("additional_mounts") or []:
+        paths.append((Path(mount.get("host_path", "")), False))
+
+    # Env file source and the filtered copy mounted into the container
+    paths.append((config.base_dir / ".env", True))
+    paths.append((config.store_dir / "env" / f"{group_folder}.env", True))
+
+    # Skills synced into the session directory or mounted as a snapshot
+    skills_src = config.base_dir / "container" / "skills"
+    paths.append((skills_src, True))
+    if skills_src.is_dir():
+        for path in skills_src.rglob("*"):
+            paths.append((path, True))
+    return paths
+
+
 def check_path_traversal(path: str) -> bool:
     """Check if path contains traversal attempts.
 
@@ -264,6 +337,9 @@ def create_group_env_file(
 def sync_group_skills(group_folder: str, user_id: int | None = None) -> Path | None:
     """Sync skills from container/skills to group's .claude/skills.
 
+    Only files whose content changed since the last sync are copied; see
+    ``SkillsStore.sync_to``.
+
     Args:
         group_folder: Group folder name
         user_id: Optional user ID for user-specific skills
@@ -275,9 +351,10 @@ def sync_group_skills(group_folder: str, user_id: int | None = None) -> Path | N
 
     config = get_config()
 
-    # Source: container/skills/
-    skills_src = config.base_dir / "container" / "skills"
-    if not skills_src.exists():
+    from nanogridbot.core.skills_store import get_skills_store
+
+    store = get_skills_store()
+    if not store.source.exists():
         return None
 
     # Determine destination based on user_id
@@ -287,14 +364,5 @@ def sync_group_skills(group_folder: str, user_id: int | None = None) -> Path | N
         skills_dst = config.data_dir / "sessions" / group_folder / ".claude" / "skills"
     skills_dst.mkdir(parents=True, exist_ok=True)
 
-    # Sync each skill directory
-    for skill_dir in skills_src.iterdir():
-        if not skill_dir.is_dir():
-            continue
-        dst = skills_dst / skill_dir.name
-        dst.mkdir(exist_ok=True)
-        for file in skill_dir.iterdir():
-            if file.is_file():
-                shutil.copy2(file, dst / file.name)
-
+    store.sync_to(skills_dst)
     return skills_dst
@@ -8,11 +8,25 @@ from typing import Any
 from loguru import logger
 
 from nanogridbot.channels.base import Channel
+from nanogridbot.channels.events import Event, EventType, MessageEvent
 from nanogridbot.config import get_config
+from nanogridbot.core.container_pool import WarmContainerPool
+from nanogridbot.core.container_runner import (
+    set_launch_plan_cache,
+    set_resource_sampler,
+    set_warm_pool,
+)
+from nanogridbot.core.docker_api import close_docker_client
 from nanogridbot.core.group_queue import GroupQueue
+from nanogridbot.core.launch_plan import LaunchPlanCache
 from nanogridbot.core.ipc_handler import IpcHandler
+from nanogridbot.core.message_inbox import MessageInbox
+from nanogridbot.core.resource_sampler import ContainerResourceSampler
+from nanogridbot.core.resources import AdmissionController
 from nanogridbot.core.router import MessageRouter
+from nanogridbot.core.session_containers import SessionContainerManager
 from nanogridbot.core.task_scheduler import TaskScheduler
+from nanogridbot.core.trigger import TriggerEngine
 from nanogridbot.database import Database
 from nanogridbot.types import Message, RegisteredGroup
 from nanogridbot.utils.error_handling import GracefulShutdown, with_retry
@@ -38,17 +52,59 @@ class Orchestrator:
         self.db = db
         self.channels = channels
 
-        # Global state
-        self.last_timestamp: str | None = None
+        # Global state: cursors are message ingest sequence numbers
+        self.last_seq: int = 0
         self.sessions: dict[str, str] = {}
         self.registered_groups: dict[str, RegisteredGroup] = {}
-        self.last_agent_timestamp: dict[str, str] = {}
+        self.last_agent_seq: dict[str, int] = {}
+        self._saved_cursors: tuple[int, dict[str, int]] | None = None
 
         # Subsystems
-        self.queue = GroupQueue(config, db)
+        self.session_containers = (
+            SessionContainerManager(config) if config.container_session_enabled else None
+        )
+        self.router = MessageRouter(config, db, channels)
+        self.admission = (
+            AdmissionController(
+                cpu_overcommit=config.container_cpu_overcommit,
+                memory_reserve_mb=config.container_memory_reserve_mb,
+                allow_downgrade=config.container_admission_downgrade,
+            )
+            if config.container_admission_enabled
+            else None
+        )
+        self.queue = GroupQueue(
+            config,
+            db,
+            agent_cursors=self.last_agent_seq,
+            session_containers=self.session_containers,
+            router=self.router,
+            admission=self.admission,
+        )
         self.scheduler = TaskScheduler(config, db, self.queue)
         self.ipc_handler = IpcHandler(config, db, channels)
-        self.router = MessageRouter(config, db, channels)
+        self.triggers = TriggerEngine(config.assistant_name)
+        self.warm_pool = (
+            WarmContainerPool(config) if config.container_warm_pool_enabled else None
+        )
+        self.launch_plans = (
+            LaunchPlanCache() if config.container_launch_cache_enabled else None
+        )
+        self.resource_sampler = (
+            ContainerResourceSampler(config.container_resource_sample_interval, config.cgroup_root)
+            if config.container_resource_sampling_enabled
+            else None
+        )
+
+        # Push-based ingestion: channels and the web API feed the inbox directly,
+        # the DB sweep in _message_loop only catches up after a crash
+        self.inbox = MessageInbox()
+        self._dispatch_task: asyncio.Task | None = None
+
+        # Concurrent dispatch across chats, strictly ordered within a chat
+        self._dispatch_slots = asyncio.Semaphore(config.max_concurrent_dispatches)
+        self._chat_tasks: dict[str, asyncio.Task] = {}
+        self._deferred: dict[str, list[Message]] = {}
 
         # Running flag and graceful shutdown
         self._running = False
@@ -83,9 +139,29 @@ class Orchestrator:
 
         # Start subsystems
         self._running = True
+        if self.launch_plans:
+            set_launch_plan_cache(self.launch_plans)
+        if self.warm_pool:
+            await self.warm_pool.start()
+            set_warm_pool(self.warm_pool)
+        if self.resource_sampler:
+            if self.resource_sampler.supported():
+                await self.resource_sampler.start()
+                set_resource_sampler(self.resource_sampler)
+            else:
+                logger.warning(
+                    f"No cgroup v2 hierarchy at {self.resource_sampler.cgroup_root}; "
+                    "container resource sampling disabled"
+                )
+                self.resource_sampler = None
+        if self.session_containers:
+            await self.session_containers.start()
+        await self.queue.start()
         await self.scheduler.start()
         await self.ipc_handler.start()
         await self.router.start()
+        self._subscribe_channels()
+        self._dispatch_task = asyncio.create_task(self._dispatch_loop())
 
         # Mark startup complete
         self._startup_complete = True
@@ -95,7 +171,7 @@ class Orchestrator:
 
         logger.info("NanoGridBot orchestrator started successfully")
 
-        # Start message polling
+        # Start catch-up sweep
         await self._message_loop()
 
     def _setup_signal_handlers(self) -> None:
@@ -122,10 +198,39 @@ class Orchestrator:
         await self._save_state()
 
         # Disconnect channels
+        self._unsubscribe_channels()
         await self._disconnect_channels()
 
+        # Stop dispatching pushed messages
+        if self._dispatch_task:
+            self._dispatch_task.cancel()
+            try:
+                await self._dispatch_task
+            except asyncio.CancelledError:
+                pass
+            self._dispatch_task = None
+
+        for task in list(self._chat_tasks.values()):
+            task.cancel()
+        if self._chat_tasks:
+            await asyncio.gather(*self._chat_tasks.values(), return_exceptions=True)
+        self._chat_tasks.clear()
+        self._deferred.clear()
+
         # Stop subsystems
         await self.scheduler.stop()
+        await self.queue.shutdown()
+        if self.session_containers:
+            await self.session_containers.stop()
+        if self.warm_pool:
+            set_warm_pool(None)
+            await self.warm_pool.stop()
+        if self.launch_plans:
+            set_launch_plan_cache(None)
+        if self.resource_sampler:
+            set_resource_sampler(None)
+            await self.resource_sampler.stop()
+        await close_docker_client()
         await self.ipc_handler.stop()
         await self.router.stop()
 
@@ -169,28 +274,71 @@ class Orchestrator:
         # Load router state
         state = await self.db.get_router_state()
 
-        self.last_timestamp = state.get("last_timestamp")
+        if "last_seq" not in state and (
+            state.get("last_timestamp") or state.get("last_agent_timestamp")
+        ):
+            state = await self._migrate_timestamp_cursors(state)
+
+        self.last_seq = int(state.get("last_seq") or 0)
         self.sessions = state.get("sessions", {})
-        self.last_agent_timestamp = state.get("last_agent_timestamp", {})
+        # Update in place: the group queue shares this dict
+        self.last_agent_seq.clear()
+        self.last_agent_seq.update(
+            {jid: int(seq) for jid, seq in (state.get("last_agent_seq") or {}).items()}
+        )
 
         # Load registered groups
         groups = await self.db.get_groups()
         self.registered_groups = {g.jid: g for g in groups}
+        self.triggers.load(list(groups))
 
         logger.info(f"Loaded {len(self.registered_groups)} registered groups")
 
+    async def _migrate_timestamp_cursors(self, state: dict[str, Any]) -> dict[str, Any]:
+        """Translate legacy ISO timestamp cursors into sequence cursors.
+
+        Args:
+            state: Router state holding last_timestamp / last_agent_timestamp
+
+        Returns:
+            Router state with last_seq / last_agent_seq filled in
+        """
+        migrated = dict(state)
+
+        last_timestamp = state.get("last_timestamp")
+        migrated["last_seq"] = (
+            await self.db.get_message_seq_at(datetime.fromisoformat(last_timestamp))
+            if last_timestamp
+            else 0
+        )
+
+        migrated["last_agent_seq"] = {
+            jid: await self.db.get_message_seq_at(datetime.fromisoformat(ts), jid)
+            for jid, ts in (state.get("last_agent_timestamp") or {}).items()
+            if ts
+        }
+
+        logger.info(f"Migrated timestamp cursors to sequence cursor {migrated['last_seq']}")
+        return migrated
+
     async def _save_state(self) -> None:
         """Save state to database."""
         await self.db.save_router_state(
             {
-                "last_timestamp": self.last_timestamp,
+                "last_seq": self.last_seq,
                 "sessions": self.sessions,
-                "last_agent_timestamp": self.last_agent_timestamp,
+                "last_agent_seq": self.last_agent_seq,
             }
         )
+        self._saved_cursors = (self.last_seq, dict(self.last_agent_seq))
 
         logger.info("State saved")
 
+    async def _save_cursors_if_changed(self) -> None:
+        """Persist cursors when they moved since the last save."""
+        if self._saved_cursors != (self.last_seq, self.last_agent_seq):
+            await self._save_state()
+
     async def _connect_channels(self) -> None:
         """Connect all channels."""
         for channel in self.channels:
@@ -233,9 +381,126 @@ class Orchestrator:
             except Exception as e:
                 logger.error(f"Error disconnecting channel {channel.name}: {e}")
 
+    def _subscribe_channels(self) -> None:
+        """Subscribe to message events from all channels."""
+        for channel in self.channels:
+            channel.on(EventType.MESSAGE_RECEIVED, self._on_channel_message)
+
+    def _unsubscribe_channels(self) -> None:
+        """Unsubscribe from message events of all channels."""
+        for channel in self.channels:
+            try:
+                channel.off(EventType.MESSAGE_RECEIVED, self._on_channel_message)
+            except ValueError:
+                pass
+
+    async def _on_channel_message(self, event: Event) -> None:
+        """Store a message pushed by a channel and hand it to the dispatcher.
+
+        Args:
+            event: Message event emitted by a channel
+        """
+        if not isinstance(event, MessageEvent):
+            return
+
+        message = Message(
+            id=event.message_id,
+            chat_jid=event.chat_jid,
+            sender=event.sender,
+            sender_name=event.sender_name or None,
+            content=event.content,
+            timestamp=event.timestamp,
+            is_from_me=event.is_from_me,
+        )
+        await self.db.store_message(message)
+        self.ingest(message)
+
+    def ingest(self, message: Message) -> None:
+        """Push an already-stored message straight into the dispatch path.
+
+        Args:
+            message: Message that has been persisted to the database
+        """
+        self.inbox.put(message)
+
+        # Pushed messages are never seen again by the catch-up sweep
+        if message.seq is not None:
+            self._advance_cursor(message.seq)
+
+    def _advance_cursor(self, seq: int) -> None:
+        """Move the ingest cursor forward, never backward.
+
+        Args:
+            seq: Sequence number of the newest ingested message
+        """
+        if seq > self.last_seq:
+            self.last_seq = seq
+
+    async def _dispatch_loop(self) -> None:
+        """Dispatch pushed messages to the group queue as they arrive."""
+        while self._running and not self._shutdown.is_shutting_down:
+            try:
+                jid, messages = await self.inbox.get()
+                await self._dispatch(jid, messages)
+            except asyncio.CancelledError:
+                logger.info("Dispatch loop cancelled")
+                break
+            except Exception as e:
+                logger.error(f"Error in dispatch loop: {e}")
+
+    async def _dispatch(self, jid: str, messages: list[Message]) -> None:
+        """Process a chat's messages concurrently with other chats.
+
+        At most ``max_concurrent_dispatches`` chats are processed at once.
+        Messages for a chat that is already being processed are deferred and
+        handled by that chat's task once the current batch is done, so a
+        chat's messages are always processed in order.
+
+        Args:
+            jid: Chat JID
+            messages: Messages for the chat, in ingest order
+        """
+        if jid in self._chat_tasks:
+            self._deferred.setdefault(jid, []).extend(messages)
+            return
+
+        await self._dispatch_slots.acquire()
+
+        # Another dispatcher may have started this chat while we waited
+        if jid in self._chat_tasks:
+            self._dispatch_slots.release()
+            self._deferred.setdefault(jid, []).extend(messages)
+            return
+
+        self._chat_tasks[jid] = asyncio.create_task(self._run_chat(jid, messages))
+
+    async def _run_chat(self, jid: str, messages: list[Message]) -> None:
+        """Process batches for one chat until no deferred messages remain.
+
+        Args:
+            jid: Chat JID
+            messages: First batch of messages
+        """
+        try:
+            batch: list[Message] | None = messages
+            while batch:
+                try:
+                    await self._process_group_messages(jid, batch)
+                except Exception as e:
+                    logger.error(f"Error processing messages for {jid}: {e}")
+                batch = self._deferred.pop(jid, None)
+        finally:
+            self._chat_tasks.pop(jid, None)
+            self._dispatch_slots.release()
+
     async def _message_loop(self) -> None:
-        """Main message polling loop."""
+        """Catch-up sweep for messages that bypassed the push path.
+
+        Live messages arrive through :meth:`ingest`; this loop only picks up
+        rows written while the process was down or by other writers.
+        """
         poll_interval = self.config.poll_interval / 1000  # Convert ms to seconds
+        batch_size = self.config.batch_size
 
         while self._running and not self._shutdown.is_shutting_down:
             try:
@@ -244,28 +509,34 @@ class Orchestrator:
                     logger.info("Message loop detected shutdown signal, exiting...")
                     break
 
-                # Get new messages from all channels
-                # Convert string timestamp to datetime if needed
-                since_dt = None
-                if self.last_timestamp:
-                    since_dt = datetime.fromisoformat(self.last_timestamp)
-                messages = await self.db.get_new_messages(since_dt)
+                # Page through messages stored after the last ingested one
+                while True:
+                    messages = await self.db.get_new_messages(self.last_seq, batch_size)
+                    if not messages:
+                        break
+
+                    logger.info(f"Catch-up sweep found {len(messages)} messages")
 
-                if messages:
                     # Group messages by chat
                     grouped = self._group_messages(messages)
 
-                    # Process each group
+                    # Dispatch each group
                     for jid, group_messages in grouped.items():
                         # Check for shutdown before each group
                         if self._shutdown.is_shutting_down:
                             break
-                        await self._process_group_messages(jid, group_messages)
+                        await self._dispatch(jid, group_messages)
 
-                    # Update timestamp
-                    self.last_timestamp = messages[-1].timestamp.isoformat()
+                    # Update cursor
+                    self._advance_cursor(messages[-1].seq or 0)
 
-                # Wait for next poll
+                    if len(messages) < batch_size or self._shutdown.is_shutting_down:
+                        break
+
+                # Persist cursors so a crash only replays the last sweep interval
+                await self._save_cursors_if_changed()
+
+                # Wait for next sweep
                 await asyncio.sleep(poll_interval)
 
             except asyncio.CancelledError:
@@ -309,9 +580,7 @@ class Orchestrator:
 
         # Check trigger pattern
         if group.requires_trigger:
-            triggered = any(
-                self._check_trigger(msg.content, group.trigger_pattern) for msg in messages
-            )
+            triggered = any(self.triggers.matches(group, msg.content) for msg in messages)
             if not triggered:
                 return
 
@@ -320,7 +589,7 @@ class Orchestrator:
             jid=jid,
             group=group,
             session_id=self.sessions.get(jid),
-            last_timestamp=self.last_agent_timestamp.get(jid),
+            last_seq=self.last_agent_seq.get(jid),
         )
 
     def _check_trigger(self, content: str, pattern: str | None) -> bool:
@@ -333,12 +602,7 @@ class Orchestrator:
         Returns:
             True if triggered
         """
-        import re
-
-        if not pattern:
-            pattern = rf"^@{self.config.assistant_name}\b"
-
-        return bool(re.search(pattern, content, re.IGNORECASE))
+        return self.triggers.check(content, pattern)
 
     async def register_group(self, group: RegisteredGroup) -> None:
         """Register a new group.
@@ -348,6 +612,7 @@ class Orchestrator:
         """
         await self.db.save_group(group)
         self.registered_groups[group.jid] = group
+        self.triggers.register(group)
         logger.info(f"Registered group: {group.jid}")
 
     async def unregister_group(self, jid: str) -> None:
@@ -357,7 +622,12 @@ class Orchestrator:
             jid: Group JID to unregister
         """
         await self.db.delete_group(jid)
-        self.registered_groups.pop(jid, None)
+        group = self.registered_groups.pop(jid, None)
+        self.triggers.unregister(jid)
+        if group and self.session_containers:
+            await self.session_containers.close(group.folder)
+        if group and self.launch_plans:
+            self.launch_plans.invalidate(group.folder)
         logger.info(f"Unregistered group: {jid}")
 
     async def send_to_group(self, jid: str, text: str) -> None:
@@ -0,0 +1,251 @@
+"""Incremental parsing of agent runner output."""
+
+import json
+import re
+import uuid
+from pathlib import Path
+from typing import BinaryIO
+
+from nanogridbot.types import ContainerOutput
+
+# Output markers written by the agent runner around each result
+OUTPUT_START_MARKER = "---NANOGRIDBOT_OUTPUT_START---"
+OUTPUT_END_MARKER = "---NANOGRIDBOT_OUTPUT_END---"
+
+_START = OUTPUT_START_MARKER.encode()
+_END = OUTPUT_END_MARKER.encode()
+
+# Bytes kept from the end of a spilled payload to recover trailing fields
+_TAIL_BYTES = 4096
+
+# Fields of the runner's JSON output, recovered from a truncated payload
+_STATUS_RE = re.compile(r'"status"\s*:\s*"(\w+)"')
+_RESULT_RE = re.compile(r'"result"\s*:\s*"')
+_SESSION_RE = re.compile(r'"newSessionId"\s*:\s*"([^"\\]+)"')
+_ERROR_RE = re.compile(r'"error"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# Longest prefix of a JSON string body that decodes on its own
+_STRING_BODY_RE = re.compile(r'(?:[^"\\]|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})*')
+
+
+def _decode_json_string(body: str) -> str:
+    """Decode the body of a JSON string, stopping at its end or at a cut.
+
+    Args:
+        body: Text after the opening quote, possibly truncated
+
+    Returns:
+        Decoded string value
+    """
+    prefix = _STRING_BODY_RE.match(body).group(0)
+    try:
+        return json.loads(f'"{prefix}"')
+    except ValueError:
+        return prefix
+
+
+def parse_output_payload(text: str) -> ContainerOutput:
+    """Build a ContainerOutput from the text between one pair of markers.
+
+    Args:
+        text: Marker-delimited payload
+
+    Returns:
+        Parsed output; text that is not JSON is treated as the result
+    """
+    try:
+        data = json.loads(text)
+        return ContainerOutput(
+            status=data.get("status", "success"),
+            result=data.get("result"),
+            error=data.get("error"),
+            new_session_id=data.get("newSessionId"),
+        )
+    except json.JSONDecodeError:
+        return ContainerOutput(status="success", result=text)
+
+
+class OutputStreamParser:
+    """Scans runner stdout incrementally for marker-delimited results.
+
+    Bytes outside the markers are dropped as they arrive. Inside a result,
+    at most ``max_bytes`` are kept in memory; a larger payload is written to
+    a spill file in ``spill_dir`` and delivered truncated, with a note
+    pointing at the full output. Memory per stream therefore stays bounded by
+    ``max_bytes`` plus a few kilobytes whatever the container prints.
+    """
+
+    def __init__(self, max_bytes: int, spill_dir: Path | None = None):
+        """Initialize the parser.
+
+        Args:
+            max_bytes: Payload bytes kept in memory per result
+            spill_dir: Directory for oversized payloads; they are truncated
+                without a copy if None
+        """
+        self.max_bytes = max(1, max_bytes)
+        self.spill_dir = spill_dir
+        self.results = 0
+        self._in_block = False
+        self._carry = b""
+        self._head = bytearray()
+        self._tail = bytearray()
+        self._size = 0
+        self._spill: BinaryIO | None = None
+        self._spill_path: Path | None = None
+        self._truncated = False
+
+    def feed(self, data: bytes) -> list[ContainerOutput]:
+        """Consume a chunk of stdout.
+
+        Args:
+            data: Bytes read from the container
+
+        Returns:
+            Results whose end marker arrived in this chunk
+        """
+        outputs: list[ContainerOutput] = []
+        buf = self._carry + data
+        while True:
+            if not self._in_block:
+                start = buf.find(_START)
+                if start < 0:
+                    # Keep what could be the beginning of a marker
+                    self._carry = buf[-(len(_START) - 1) :]
+                    break
+                newline = buf.find(b"\n", start + len(_START))
+                if newline < 0:
+                    self._carry = buf[start:]
+                    break
+                buf = buf[newline + 1 :]
+                self._open()
+            else:
+                end = buf.find(_END)
+                if end < 0:
+                    keep = len(_END) - 1
+                    self._append(buf[:-keep])
+                    self._carry = buf[-keep:]
+                    break
+                self._append(buf[:end])
+                outputs.append(self._close())
+                newline = buf.find(b"\n", end + len(_END))
+                buf = buf[newline + 1 :] if newline >= 0 else b""
+        return outputs
+
+    def finish(self) -> list[ContainerOutput]:
+        """Flush at end of stream.
+
+        A result whose end marker never arrived is delivered as it stands.
+
+        Returns:
+            The unterminated result, if any
+        """
+        if not self._in_block:
+            self._carry = b""
+            return []
+        self._append(self._carry)
+        self._carry = b""
+        return [self._close()]
+
+    def _open(self) -> None:
+        """Start a new result."""
+        self._in_block = True
+        self._head = bytearray()
+        self._tail = bytearray()
+        self._size = 0
+        self._spill = None
+        self._spill_path = None
+        self._truncated = False
+
+    def _append(self, data: bytes) -> None:
+        """Add payload bytes to the current result."""
+        if not data:
+            return
+        self._size += len(data)
+        if not self._truncated and len(self._head) + len(data) <= self.max_bytes:
+            self._head += data
+            return
+
+        if not self._truncated:
+            self._truncated = True
+            self._tail = self._head[-_TAIL_BYTES:]
+            if self.spill_dir is not None:
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+                self._spill_path = self.spill_dir / f"output-{uuid.uuid4().hex}.json"
+                self._spill = self._spill_path.open("wb")
+                self._spill.write(self._head)
+            room = self.max_bytes - len(self._head)
+            self._head += data[:room]
+        if self._spill is not None:
+            self._spill.write(data)
+        self._tail = (self._tail + data)[-_TAIL_BYTES:]
+
+    def _close(self) -> ContainerOutput:
+        """Finish the current result."""
+        self._in_block = False
+        self.results += 1
+        if not self._truncated:
+            return parse_output_payload(self._head.decode("utf-8", errors="replace").rstrip("\r\n"))
+
+        if self._spill is not None:
+            self._spill.close()
+        head = self._head.decode("utf-8", errors="ignore")
+        tail = self._tail.decode("utf-8", errors="ignore")
+        self._head = bytearray()
+        self._tail = bytearray()
+
+        result_start = _RESULT_RE.search(head)
+        result = _decode_json_string(head[result_start.end() :]) if result_start else head
+        where = f"; full output saved to {self._spill_path}" if self._spill_path else ""
+        result += f"\n\n[Output truncated at {self.max_bytes} of {self._size} bytes{where}]"
+
+        status = _STATUS_RE.search(head)
+        session = _SESSION_RE.search(tail)
+        error = _ERROR_RE.search(tail)
+        return ContainerOutput(
+            status=status.group(1) if status else "success",
+            result=result,
+            error=_decode_json_string(error.group(1)) if error else None,
+            new_session_id=session.group(1) if session else None,
+        )
+
+
+class BoundedLog:
+    """Keeps the start and the end of a stream, dropping the middle.
+
+    Used for container stderr: the start carries the runner's start-up
+    lines, the end the error that made it exit.
+    """
+
+    def __init__(self, limit: int = 16384):
+        """Initialize the log.
+
+        Args:
+            limit: Bytes kept at each end
+        """
+        self.limit = limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.size = 0
+
+    def feed(self, data: bytes) -> None:
+        """Add a chunk of the stream."""
+        self.size += len(data)
+        room = self.limit - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data:
+            self.tail = (self.tail + data)[-self.limit :]
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def text(self) -> str:
+        """Get the kept text, marking any dropped middle."""
+        head = self.head.decode("utf-8", errors="replace")
+        if not self.tail:
+            return head
+        dropped = self.size - len(self.head) - len(self.tail)
+        gap = f"\n[... {dropped} bytes omitted ...]\n" if dropped else ""
+        return head + gap + self.tail.decode("utf-8", errors="replace")
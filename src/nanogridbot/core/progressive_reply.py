@@ -0,0 +1,155 @@
+"""Progressive delivery of agent replies by editing a message in place."""
+
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from nanogridbot.channels.base import Channel
+
+# Shown in place of a reply that produced no text
+EMPTY_REPLY_TEXT = "(no response)"
+
+# Marks text cut to fit an intermediate edit
+_ELLIPSIS = "…"
+
+
+class ProgressiveReply:
+    """A reply posted as a placeholder and edited as output streams in.
+
+    Edits are throttled to the channel's per-message edit interval: an update
+    arriving too soon is held and the newest text is written once the
+    interval has passed, so bursts of output collapse into one edit. On
+    channels that cap edits per message the last edit is saved for the
+    final text. Text longer than the channel allows is shown cut during the
+    run and split over follow-up messages when the reply finishes.
+    """
+
+    def __init__(
+        self,
+        channel: Channel,
+        chat_jid: str,
+        placeholder: str = "…",
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        """Initialize the reply.
+
+        Args:
+            channel: Channel that owns the chat; must support edits
+            chat_jid: Chat to reply in
+            placeholder: Text posted before any output arrives
+            clock: Monotonic clock, replaceable in tests
+            sleep: Sleep function, replaceable in tests
+        """
+        self.channel = channel
+        self.chat_jid = chat_jid
+        self.placeholder = placeholder
+        self.interval = channel.edit_interval(chat_jid)
+        self.message_id: str | None = None
+        self.edits = 0
+        self._clock = clock
+        self._sleep = sleep
+        self._text = ""
+        self._shown = placeholder
+        self._next_edit_at = 0.0
+        self._flush_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """Post the placeholder message."""
+        self.message_id = await self.channel.send_message(self.chat_jid, self.placeholder)
+        self._next_edit_at = self._clock() + self.interval
+
+    async def update(self, text: str) -> None:
+        """Show new reply text, as soon as the rate limit allows.
+
+        Args:
+            text: Full reply text so far
+        """
+        self._text = text
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_when_allowed())
+
+    async def finish(self) -> None:
+        """Write the final reply text, waiting out the rate limit if needed."""
+        from loguru import logger
+
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+
+        text = self._text or EMPTY_REPLY_TEXT
+        chunks = self._split(text)
+        try:
+            await self._wait_for_slot()
+            await self._edit(chunks[0])
+        except Exception as e:
+            logger.warning(f"Could not edit reply in {self.chat_jid}, sending it instead: {e}")
+            await self.channel.send_message(self.chat_jid, chunks[0])
+        for chunk in chunks[1:]:
+            await self.channel.send_message(self.chat_jid, chunk)
+
+    async def _flush_when_allowed(self) -> None:
+        """Edit the message with the newest text once the interval passes."""
+        from loguru import logger
+
+        await self._wait_for_slot()
+        # Keep the last edit for the final text on capped channels
+        max_edits = self.channel.max_edits
+        if max_edits is not None and self.edits >= max_edits - 1:
+            return
+        try:
+            await self._edit(self._preview(self._text))
+        except Exception as e:
+            logger.debug(f"Intermediate edit in {self.chat_jid} failed: {e}")
+
+    async def _wait_for_slot(self) -> None:
+        """Sleep until the next edit is allowed."""
+        delay = self._next_edit_at - self._clock()
+        if delay > 0:
+            await self._sleep(delay)
+
+    async def _edit(self, text: str) -> None:
+        """Replace the message text unless it is already shown.
+
+        Args:
+            text: Text to show
+        """
+        async with self._lock:
+            if text == self._shown:
+                return
+            await self.channel.edit_message(self.chat_jid, self.message_id, text)
+            self._shown = text
+            self.edits += 1
+            self._next_edit_at = self._clock() + self.interval
+
+    def _preview(self, text: str) -> str:
+        """Cut text to fit one message, keeping its newest part.
+
+        Args:
+            text: Reply text so far
+
+        Returns:
+            Text that fits the channel's message length
+        """
+        limit = self.channel.max_message_length
+        if limit is None or len(text) <= limit:
+            return text
+        return _ELLIPSIS + text[-(limit - len(_ELLIPSIS)) :]
+
+    def _split(self, text: str) -> list[str]:
+        """Split text into chunks that each fit one message.
+
+        Args:
+            text: Final reply text
+
+        Returns:
+            Non-empty list of chunks
+        """
+        limit = self.channel.max_message_length
+        if limit is None:
+            return [text]
+        return [text[i : i + limit] for i in range(0, len(text), limit)] or [text]
@@ -0,0 +1,333 @@
+"""Sampling of agent container resource usage from cgroup v2."""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from nanogridbot.core.resources import CGROUP_ROOT
+
+# Resolves a container name to its full container ID, or None if unknown
+IdResolver = Callable[[str], Awaitable[str | None]]
+
+
+@dataclass
+class CgroupStats:
+    """One reading of a container's cgroup counters.
+
+    Attributes:
+        cpu_usec: CPU time used since the container started, in microseconds
+        memory_bytes: Current memory use
+        memory_peak_bytes: Highest memory use so far, if the kernel reports it
+        io_read_bytes: Bytes read from block devices
+        io_write_bytes: Bytes written to block devices
+    """
+
+    cpu_usec: int = 0
+    memory_bytes: int = 0
+    memory_peak_bytes: int | None = None
+    io_read_bytes: int = 0
+    io_write_bytes: int = 0
+
+
+def read_cgroup_stats(path: Path) -> CgroupStats:
+    """Read a cgroup's CPU, memory and IO counters.
+
+    Args:
+        path: cgroup directory
+
+    Returns:
+        Counters
+
+    Raises:
+        OSError: If the cgroup is gone
+    """
+    stats = CgroupStats()
+    for line in (path / "cpu.stat").read_text().splitlines():
+        key, _, value = line.partition(" ")
+        if key == "usage_usec":
+            stats.cpu_usec = int(value)
+    stats.memory_bytes = int((path / "memory.current").read_text())
+    try:
+        stats.memory_peak_bytes = int((path / "memory.peak").read_text())
+    except (OSError, ValueError):
+        pass
+    try:
+        io_lines = (path / "io.stat").read_text().splitlines()
+    except OSError:
+        io_lines = []
+    for line in io_lines:
+        for item in line.split()[1:]:
+            key, _, value = item.partition("=")
+            if key == "rbytes":
+                stats.io_read_bytes += int(value)
+            elif key == "wbytes":
+                stats.io_write_bytes += int(value)
+    return stats
+
+
+@dataclass
+class ResourceUsage:
+    """Resource usage of one container, accumulated over its samples.
+
+    Attributes:
+        name: Container name
+        group_folder: Group the container runs for
+        started_at: Monotonic time tracking started
+        samples: Number of successful samples
+        cpu_usec: Latest cumulative CPU time, in microseconds
+        cpu_percent: CPU use between the last two samples (100 = one core)
+        cpu_peak_percent: Highest ``cpu_percent`` seen
+        memory_bytes: Latest memory use
+        memory_peak_bytes: Highest memory use seen
+        io_read_bytes: Latest cumulative bytes read
+        io_write_bytes: Latest cumulative bytes written
+        cgroup: cgroup directory, once located
+    """
+
+    name: str
+    group_folder: str
+    started_at: float
+    samples: int = 0
+    cpu_usec: int = 0
+    cpu_percent: float = 0.0
+    cpu_peak_percent: float = 0.0
+    memory_bytes: int = 0
+    memory_peak_bytes: int = 0
+    io_read_bytes: int = 0
+    io_write_bytes: int = 0
+    cgroup: Path | None = None
+    _memory_total: int = field(default=0, repr=False)
+    _sampled_at: float | None = field(default=None, repr=False)
+
+    @property
+    def cpu_seconds(self) -> float:
+        """CPU time used, in seconds."""
+        return self.cpu_usec / 1_000_000
+
+    @property
+    def memory_avg_bytes(self) -> int:
+        """Average memory use over the samples."""
+        return self._memory_total // self.samples if self.samples else 0
+
+    def add(self, stats: CgroupStats, now: float) -> None:
+        """Fold a new reading into the totals.
+
+        Args:
+            stats: cgroup counters
+            now: Monotonic time of the reading
+        """
+        if self._sampled_at is not None and now > self._sampled_at:
+            delta = max(0, stats.cpu_usec - self.cpu_usec)
+            self.cpu_percent = delta / 1_000_000 / (now - self._sampled_at) * 100
+            self.cpu_peak_percent = max(self.cpu_peak_percent, self.cpu_percent)
+        self._sampled_at = now
+        self.samples += 1
+        self.cpu_usec = stats.cpu_usec
+        self.memory_bytes = stats.memory_bytes
+        self._memory_total += stats.memory_bytes
+        self.memory_peak_bytes = max(
+            self.memory_peak_bytes, stats.memory_peak_bytes or 0, stats.memory_bytes
+        )
+        self.io_read_bytes = stats.io_read_bytes
+        self.io_write_bytes = stats.io_write_bytes
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the usage as a JSON-friendly dict."""
+        return {
+            "name": self.name,
+            "group_folder": self.group_folder,
+            "uptime_seconds": round(time.monotonic() - self.started_at, 1),
+            "samples": self.samples,
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "cpu_percent": round(self.cpu_percent, 1),
+            "cpu_peak_percent": round(self.cpu_peak_percent, 1),
+            "memory_bytes": self.memory_bytes,
+            "memory_avg_bytes": self.memory_avg_bytes,
+            "memory_peak_bytes": self.memory_peak_bytes,
+            "io_read_bytes": self.io_read_bytes,
+            "io_write_bytes": self.io_write_bytes,
+        }
+
+
+async def resolve_container_id(name: str) -> str | None:
+    """Look up a container's full ID by name.
+
+    Args:
+        name: Container name
+
+    Returns:
+        Container ID, or None if Docker does not know the container
+    """
+    from nanogridbot.core.docker_api import DockerAPIError, get_docker_client
+
+    client = get_docker_client()
+    if client is not None:
+        try:
+            return (await client.inspect(name))["Id"]
+        except (DockerAPIError, OSError, KeyError):
+            return None
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "docker",
+            "inspect",
+            "--format",
+            "{{.Id}}",
+            name,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await process.communicate()
+    except FileNotFoundError:
+        return None
+    container_id = stdout.decode().strip()
+    return container_id if process.returncode == 0 and container_id else None
+
+
+class ContainerResourceSampler:
+    """Samples the cgroup counters of running agent containers.
+
+    Containers are tracked by name for as long as they run. Every interval
+    the sampler reads each one's ``cpu.stat``, ``memory.current``,
+    ``memory.peak`` and ``io.stat``; the cgroup is found from the container
+    ID under the systemd (``system.slice/docker-<id>.scope``) or cgroupfs
+    (``docker/<id>``) layout. Untracking takes a last sample and returns the
+    accumulated usage for the metrics store.
+    """
+
+    def __init__(
+        self,
+        interval: float = 5.0,
+        cgroup_root: Path = CGROUP_ROOT,
+        resolve_id: IdResolver = resolve_container_id,
+    ):
+        """Initialize the sampler.
+
+        Args:
+            interval: Seconds between samples
+            cgroup_root: cgroup v2 mount point
+            resolve_id: Resolves container names to IDs
+        """
+        self.interval = interval
+        self.cgroup_root = cgroup_root
+        self._resolve_id = resolve_id
+        self._tracked: dict[str, ResourceUsage] = {}
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        """Get the number of tracked containers."""
+        return len(self._tracked)
+
+    def supported(self) -> bool:
+        """Check that the cgroup root is a cgroup v2 hierarchy."""
+        return (self.cgroup_root / "cgroup.controllers").exists()
+
+    async def start(self) -> None:
+        """Start sampling in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name="container-resource-sampler")
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def track(self, name: str, group_folder: str) -> None:
+        """Start tracking a container.
+
+        Args:
+            name: Container name
+            group_folder: Group the container runs for
+        """
+        self._tracked[name] = ResourceUsage(
+            name=name, group_folder=group_folder, started_at=time.monotonic()
+        )
+
+    async def untrack(self, name: str) -> ResourceUsage | None:
+        """Stop tracking a container.
+
+        Args:
+            name: Container name
+
+        Returns:
+            Usage accumulated over the container's samples, or None if it
+            was never sampled
+        """
+        usage = self._tracked.get(name)
+        if usage is None:
+            return None
+        await self._sample(usage)
+        self._tracked.pop(name, None)
+        return usage if usage.samples else None
+
+    async def sample_once(self) -> None:
+        """Sample every tracked container."""
+        for usage in list(self._tracked.values()):
+            await self._sample(usage)
+
+    def live(self) -> list[dict[str, Any]]:
+        """Get the latest usage of every tracked container.
+
+        Returns:
+            One dict per container, busiest CPU first
+        """
+        return sorted(
+            (usage.to_dict() for usage in self._tracked.values()),
+            key=lambda item: item["cpu_percent"],
+            reverse=True,
+        )
+
+    async def _sample(self, usage: ResourceUsage) -> None:
+        """Read one container's counters, locating its cgroup first if needed.
+
+        Args:
+            usage: Tracked container
+        """
+        if usage.cgroup is None:
+            usage.cgroup = await self._find_cgroup(usage.name)
+            if usage.cgroup is None:
+                return
+        try:
+            stats = read_cgroup_stats(usage.cgroup)
+        except (OSError, ValueError):
+            # Container already gone
+            return
+        usage.add(stats, time.monotonic())
+
+    async def _find_cgroup(self, name: str) -> Path | None:
+        """Locate a container's cgroup directory.
+
+        Args:
+            name: Container name
+
+        Returns:
+            cgroup directory, or None if not found
+        """
+        container_id = await self._resolve_id(name)
+        if not container_id:
+            return None
+        for candidate in (
+            self.cgroup_root / "system.slice" / f"docker-{container_id}.scope",
+            self.cgroup_root / "docker" / container_id,
+        ):
+            if candidate.is_dir():
+                return candidate
+        return None
+
+    async def _loop(self) -> None:
+        """Sample at the configured interval until cancelled."""
+        from loguru import logger
+
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sample_once()
+            except Exception as e:
+                logger.warning(f"Container resource sampling failed: {e}")
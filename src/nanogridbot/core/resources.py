@@ -0,0 +1,264 @@
+"""Container resource classes and capacity-aware admission."""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+# Where the host's (or our own container's) cgroup v2 limits live
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+PROC_MEMINFO = Path("/proc/meminfo")
+
+
+@dataclass(frozen=True)
+class ResourceClass:
+    """CPU and memory granted to one container.
+
+    Attributes:
+        name: Class name, as set in ``ContainerConfig.resource_class``
+        cpus: CPU limit (``docker run --cpus``)
+        memory_mb: Memory limit in MiB (``docker run --memory``)
+    """
+
+    name: str
+    cpus: float
+    memory_mb: int
+
+    def docker_args(self) -> list[str]:
+        """Get the ``docker run`` flags enforcing the class."""
+        memory = f"{self.memory_mb // 1024}g" if self.memory_mb % 1024 == 0 else f"{self.memory_mb}m"
+        return ["--memory", memory, "--cpus", f"{self.cpus:.1f}"]
+
+
+# Smallest first; admission downgrades along this order
+RESOURCE_CLASSES: dict[str, ResourceClass] = {
+    "small": ResourceClass("small", cpus=0.5, memory_mb=512),
+    "medium": ResourceClass("medium", cpus=1.0, memory_mb=2048),
+    "large": ResourceClass("large", cpus=2.0, memory_mb=4096),
+}
+
+
+def resource_class_for(container_config: Any = None) -> ResourceClass:
+    """Get the resource class a group's containers run with.
+
+    Args:
+        container_config: ``ContainerConfig`` or its dict form, or None
+
+    Returns:
+        The configured class, or the default class if unset or unknown
+    """
+    from nanogridbot.config import get_config
+
+    if isinstance(container_config, dict):
+        name = container_config.get("resource_class")
+    else:
+        name = getattr(container_config, "resource_class", None)
+    default = get_config().container_default_resource_class
+    return RESOURCE_CLASSES.get(name or default) or RESOURCE_CLASSES["medium"]
+
+
+@dataclass(frozen=True)
+class HostCapacity:
+    """CPU and memory the host can give to containers.
+
+    Attributes:
+        cpus: Usable CPUs
+        memory_mb: Memory limit in MiB
+        available_memory_mb: Memory currently free for new processes
+    """
+
+    cpus: float
+    memory_mb: int
+    available_memory_mb: int
+
+
+def _read_meminfo(path: Path = PROC_MEMINFO) -> dict[str, int]:
+    """Read /proc/meminfo values in KiB."""
+    values: dict[str, int] = {}
+    for line in path.read_text().splitlines():
+        key, _, rest = line.partition(":")
+        fields = rest.split()
+        if fields and fields[0].isdigit():
+            values[key] = int(fields[0])
+    return values
+
+
+def _read_cgroup_value(name: str, root: Path = CGROUP_ROOT) -> str | None:
+    """Read a cgroup v2 interface file, or None if unavailable."""
+    try:
+        return (root / name).read_text().strip()
+    except OSError:
+        return None
+
+
+def read_host_capacity(
+    cgroup_root: Path = CGROUP_ROOT, meminfo: Path = PROC_MEMINFO
+) -> HostCapacity:
+    """Read the CPU and memory available to containers.
+
+    CPUs are the scheduler affinity, narrowed by a cgroup v2 ``cpu.max``
+    quota. Memory is ``MemTotal`` narrowed by ``memory.max``; available
+    memory is ``MemAvailable``, narrowed by the cgroup's headroom.
+
+    Args:
+        cgroup_root: cgroup v2 mount point
+        meminfo: Path of /proc/meminfo
+
+    Returns:
+        Host capacity
+    """
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except (AttributeError, OSError):
+        cpus = float(os.cpu_count() or 1)
+    cpu_max = _read_cgroup_value("cpu.max", cgroup_root)
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            cpus = min(cpus, int(quota) / int(period))
+
+    info = _read_meminfo(meminfo)
+    memory_mb = info.get("MemTotal", 0) // 1024
+    available_mb = info.get("MemAvailable", info.get("MemFree", 0)) // 1024
+    memory_max = _read_cgroup_value("memory.max", cgroup_root)
+    if memory_max and memory_max != "max":
+        limit_mb = int(memory_max) // (1024 * 1024)
+        memory_mb = min(memory_mb, limit_mb) if memory_mb else limit_mb
+        current = _read_cgroup_value("memory.current", cgroup_root)
+        if current:
+            headroom_mb = limit_mb - int(current) // (1024 * 1024)
+            available_mb = min(available_mb, headroom_mb) if available_mb else headroom_mb
+    return HostCapacity(cpus=cpus, memory_mb=memory_mb, available_memory_mb=max(0, available_mb))
+
+
+class AdmissionController:
+    """Bin-packs container runs into the host's CPU and memory.
+
+    Each admitted run reserves its resource class until released. A run is
+    admitted while the reservations fit in the host's CPUs (times the
+    overcommit factor) and memory (minus a reserve for the host itself), and
+    the memory the host reports free can still hold it. A run that does not
+    fit may be downgraded to a smaller class that does; otherwise it has to
+    wait. With nothing running, the first run is always admitted so a
+    small host never blocks work entirely.
+    """
+
+    def __init__(
+        self,
+        cpu_overcommit: float = 1.0,
+        memory_reserve_mb: int = 512,
+        allow_downgrade: bool = True,
+        capacity_reader: Callable[[], HostCapacity] = read_host_capacity,
+    ):
+        """Initialize the controller.
+
+        Args:
+            cpu_overcommit: CPU reservations allowed per host CPU
+            memory_reserve_mb: Memory kept free for the host, in MiB
+            allow_downgrade: Admit runs with a smaller class when theirs
+                does not fit
+            capacity_reader: Reads the current host capacity
+        """
+        self.cpu_overcommit = cpu_overcommit
+        self.memory_reserve_mb = memory_reserve_mb
+        self.allow_downgrade = allow_downgrade
+        self._read_capacity = capacity_reader
+        self._reserved: dict[str, ResourceClass] = {}
+        self.admitted = 0
+        self.downgraded = 0
+        self.deferred = 0
+
+    @property
+    def reserved_cpus(self) -> float:
+        """CPUs reserved by admitted runs."""
+        return sum(r.cpus for r in self._reserved.values())
+
+    @property
+    def reserved_memory_mb(self) -> int:
+        """Memory reserved by admitted runs, in MiB."""
+        return sum(r.memory_mb for r in self._reserved.values())
+
+    def try_admit(self, key: str, requested: ResourceClass) -> ResourceClass | None:
+        """Reserve resources for a run if the host has room.
+
+        Args:
+            key: Identifies the run until ``release``, e.g. the group JID
+            requested: Resource class the run asks for
+
+        Returns:
+            The class granted, possibly smaller than requested, or None if
+            the run has to wait
+        """
+        from loguru import logger
+
+        if not self._reserved:
+            return self._grant(key, requested)
+
+        try:
+            capacity = self._read_capacity()
+        except (OSError, ValueError) as e:
+            logger.debug(f"Cannot read host capacity, admitting {key}: {e}")
+            return self._grant(key, requested)
+
+        candidates = [requested]
+        if self.allow_downgrade:
+            candidates += [
+                c for c in RESOURCE_CLASSES.values() if c.memory_mb < requested.memory_mb
+            ][::-1]
+        for candidate in candidates:
+            if self._fits(candidate, capacity):
+                if candidate != requested:
+                    self.downgraded += 1
+                    logger.info(
+                        f"Host busy, running {key} as {candidate.name} instead of {requested.name}"
+                    )
+                return self._grant(key, candidate)
+
+        self.deferred += 1
+        return None
+
+    def release(self, key: str) -> None:
+        """Return a run's reservation.
+
+        Args:
+            key: Key the run was admitted with
+        """
+        self._reserved.pop(key, None)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get admission statistics.
+
+        Returns:
+            Reservations, host capacity and admission counters
+        """
+        try:
+            capacity = self._read_capacity()
+        except (OSError, ValueError):
+            capacity = None
+        return {
+            "running": len(self._reserved),
+            "reserved_cpus": self.reserved_cpus,
+            "reserved_memory_mb": self.reserved_memory_mb,
+            "host_cpus": capacity.cpus if capacity else None,
+            "host_memory_mb": capacity.memory_mb if capacity else None,
+            "host_available_memory_mb": capacity.available_memory_mb if capacity else None,
+            "admitted": self.admitted,
+            "downgraded": self.downgraded,
+            "deferred": self.deferred,
+        }
+
+    def _fits(self, candidate: ResourceClass, capacity: HostCapacity) -> bool:
+        """Check whether one more run of a class fits next to the others."""
+        cpu_budget = capacity.cpus * self.cpu_overcommit
+        memory_budget = capacity.memory_mb - self.memory_reserve_mb
+        return (
+            self.reserved_cpus + candidate.cpus <= cpu_budget
+            and self.reserved_memory_mb + candidate.memory_mb <= memory_budget
+            and candidate.memory_mb <= capacity.available_memory_mb - self.memory_reserve_mb
+        )
+
+    def _grant(self, key: str, granted: ResourceClass) -> ResourceClass:
+        """Record a reservation."""
+        self._reserved[key] = granted
+        self.admitted += 1
+        return granted
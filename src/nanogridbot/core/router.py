@@ -5,6 +5,8 @@ from typing import Any
 
 from nanogridbot.channels.base import Channel
 from nanogridbot.config import get_config
+from nanogridbot.core.progressive_reply import ProgressiveReply
+from nanogridbot.core.trigger import TriggerEngine
 from nanogridbot.database import Database
 from nanogridbot.types import Message
 
@@ -23,6 +25,7 @@ class MessageRouter:
         self.config = config
         self.db = db
         self.channels = channels
+        self.triggers = TriggerEngine(config.assistant_name)
         self._running = False
 
     async def start(self) -> None:
@@ -59,7 +62,7 @@ class MessageRouter:
 
         # Check trigger pattern
         if group.requires_trigger:
-            triggered = self._check_trigger(message.content, group.trigger_pattern)
+            triggered = self.triggers.matches(group, message.content)
             if not triggered:
                 logger.debug(f"Message in {message.chat_jid} did not trigger")
                 return
@@ -76,12 +79,7 @@ class MessageRouter:
         Returns:
             True if triggered
         """
-        import re
-
-        if not pattern:
-            pattern = rf"^@{self.config.assistant_name}\b"
-
-        return bool(re.search(pattern, content, re.IGNORECASE))
+        return self.triggers.check(content, pattern)
 
     async def _get_registered_group(self, jid: str) -> Any:
         """Get registered group for JID.
@@ -116,6 +114,36 @@ class MessageRouter:
         else:
             logger.warning(f"No channel found for JID: {jid}")
 
+    async def open_reply(self, jid: str) -> ProgressiveReply | None:
+        """Start a reply that is edited in place as agent output arrives.
+
+        Only used when ``reply_delivery_mode`` is "edit" and the channel
+        owning the JID can edit messages.
+
+        Args:
+            jid: Target JID
+
+        Returns:
+            Reply with its placeholder posted, or None to send results as
+            separate messages
+        """
+        from loguru import logger
+
+        if self.config.reply_delivery_mode != "edit":
+            return None
+
+        channel = next((c for c in self.channels if c.owns_jid(jid)), None)
+        if channel is None or not channel.supports_edit:
+            return None
+
+        reply = ProgressiveReply(channel, jid, self.config.reply_placeholder)
+        try:
+            await reply.start()
+        except Exception as e:
+            logger.error(f"Error posting placeholder to {channel.name}: {e}")
+            return None
+        return reply
+
     async def broadcast_to_groups(self, text: str, group_folders: list[str] | None = None) -> None:
         """Broadcast message to all or selected groups.
 
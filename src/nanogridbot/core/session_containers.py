@@ -0,0 +1,600 @@
+"""Long-lived agent containers kept per group across turns."""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from nanogridbot.config import get_config
+from nanogridbot.core.container_pool import WarmContainer, WarmContainerPool
+from nanogridbot.core.docker_api import DockerAPIError, get_docker_client, spawn_container
+from nanogridbot.core.output_stream import OutputStreamParser
+from nanogridbot.types import ContainerConfig, ContainerOutput
+
+if TYPE_CHECKING:
+    from nanogridbot.core.container_runner import OutputCallback
+
+# Interval between idle checks (seconds)
+MAINTAIN_INTERVAL_SECONDS = 5.0
+
+# How long a stopped container may take to exit (seconds)
+STOP_TIMEOUT_SECONDS = 10.0
+
+# Bytes read from container stdout at a time
+_READ_CHUNK = 65536
+
+
+@dataclass
+class SessionContainer:
+    """An agent container serving one group's turns.
+
+    Attributes:
+        group_folder: Group folder the container is mounted for
+        name: Docker container name
+        process: ``docker run`` process attached to the container
+        ipc_input_dir: Host path of the container's IPC input directory
+        results: Results in the order the runner emitted them; None once
+            the container has exited
+        warm: Warm container the session was started from, if any
+        pool: Pool the warm container belongs to
+        last_used: Monotonic time the last turn finished
+        turns: Number of completed turns
+        busy: Whether a turn is in progress
+        paused: Whether the container is frozen
+        readers: Tasks draining the container's output
+    """
+
+    group_folder: str
+    name: str
+    process: asyncio.subprocess.Process
+    ipc_input_dir: Path
+    results: asyncio.Queue[ContainerOutput | None] = field(default_factory=asyncio.Queue)
+    warm: WarmContainer | None = None
+    pool: WarmContainerPool | None = None
+    last_used: float = field(default_factory=time.monotonic)
+    turns: int = 0
+    busy: bool = False
+    paused: bool = False
+    readers: list[asyncio.Task] = field(default_factory=list)
+
+    @property
+    def alive(self) -> bool:
+        """Whether the container process is still running."""
+        return self.process.returncode is None
+
+
+async def _docker(action: str, container: str) -> bool:
+    """Pause or unpause a container.
+
+    Args:
+        action: "pause" or "unpause"
+        container: Container name
+
+    Returns:
+        True if the command succeeded
+    """
+    client = get_docker_client()
+    if client is not None:
+        try:
+            if action == "pause":
+                await client.pause(container)
+            else:
+                await client.unpause(container)
+            return True
+        except (DockerAPIError, OSError):
+            return False
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "docker",
+            action,
+            container,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        return await process.wait() == 0
+    except FileNotFoundError:
+        return False
+
+
+class SessionContainerManager:
+    """Keeps one agent container alive per group and routes turns into it.
+
+    The first turn of a group starts a container (from the warm pool when
+    one is available) with the prompt as its input. The agent runner keeps
+    its query open afterwards, so later turns are written to the group's IPC
+    input directory and answered by the same container without any start-up
+    cost.
+
+    Idle containers are frozen (``docker pause``) after
+    ``container_session_pause_after`` seconds and resumed on the next turn.
+    They are stopped after ``container_session_idle_ttl`` seconds, or evicted
+    least recently used first when ``container_session_max`` containers are
+    alive and another group needs one. Evicted containers are always frozen
+    before they are stopped so they stop using CPU straight away.
+    """
+
+    def __init__(self, config: Any = None):
+        """Initialize the manager.
+
+        Args:
+            config: Application configuration
+        """
+        self.config = config or get_config()
+        self._sessions: OrderedDict[str, SessionContainer] = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._starting = 0
+        self._task: asyncio.Task | None = None
+        self.started = 0
+        self.reused = 0
+        self.evicted = 0
+
+    async def start(self) -> None:
+        """Start idle maintenance."""
+        from loguru import logger
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._maintain_loop(), name="session-containers")
+            logger.info(
+                f"Session containers enabled (max={self.config.container_session_max}, "
+                f"idle_ttl={self.config.container_session_idle_ttl}s)"
+            )
+
+    async def stop(self) -> None:
+        """Stop maintenance and all session containers."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        async with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            await self._evict(session, "shutdown")
+
+    def __len__(self) -> int:
+        """Get the number of live session containers."""
+        return len(self._sessions)
+
+    async def run(
+        self,
+        group_folder: str,
+        prompt: str,
+        session_id: str | None,
+        chat_jid: str,
+        is_main: bool = False,
+        container_config: ContainerConfig | None = None,
+        on_output: "OutputCallback | None" = None,
+    ) -> ContainerOutput:
+        """Run one turn for a group in its session container.
+
+        The least recently used idle container makes way when the cap is
+        reached; when every slot is busy the turn runs in a one-off container.
+
+        Args:
+            group_folder: Group folder name
+            prompt: Prompt for this turn
+            session_id: Agent session ID to resume when a container starts
+            chat_jid: Chat JID for context
+            is_main: Whether this is the main group
+            container_config: Optional container configuration
+            on_output: Optional callback receiving the turn's result as soon
+                as the container emits it
+
+        Returns:
+            ContainerOutput of the turn
+        """
+        from nanogridbot.core.container_runner import run_container_agent
+
+        session, reserved, evicted = await self._checkout(group_folder)
+        for old in evicted:
+            await self._evict(old, "exited" if not old.alive else "least recently used")
+
+        if session is None and reserved:
+            started: SessionContainer | ContainerOutput | None = None
+            try:
+                started = await self._start_session(
+                    group_folder, prompt, session_id, chat_jid, is_main, container_config
+                )
+            finally:
+                async with self._lock:
+                    self._starting -= 1
+                    if isinstance(started, SessionContainer):
+                        started.busy = True
+                        self._sessions[group_folder] = started
+            if isinstance(started, ContainerOutput):
+                return started
+            session = started
+        elif session is None:
+            # Every slot is busy; serve this turn from a one-off container
+            return await run_container_agent(
+                group_folder=group_folder,
+                prompt=prompt,
+                session_id=session_id,
+                chat_jid=chat_jid,
+                is_main=is_main,
+                container_config=container_config,
+                on_output=on_output,
+            )
+        else:
+            if session.paused and not await self._unpause(session):
+                session.busy = False
+                await self._drop(session, "could not be resumed")
+                return ContainerOutput(status="error", error="Session container could not be resumed")
+            self._discard_stale_results(session)
+            self._send(session, prompt)
+            self.reused += 1
+
+        try:
+            result = await self._await_result(session)
+        finally:
+            session.busy = False
+            session.last_used = time.monotonic()
+
+        if on_output is not None and result.status == "success":
+            try:
+                await on_output(result)
+            except Exception as e:
+                from loguru import logger
+
+                logger.error(f"Failed to deliver session output: {e}")
+        return result
+
+    async def _checkout(
+        self, group_folder: str
+    ) -> tuple[SessionContainer | None, bool, list[SessionContainer]]:
+        """Take a group's session container, or reserve a slot for a new one.
+
+        Args:
+            group_folder: Group folder name
+
+        Returns:
+            Tuple of (the group's idle session, now marked busy, or None;
+            whether a slot was reserved for starting one; sessions removed to
+            make room, to be evicted by the caller)
+        """
+        evicted: list[SessionContainer] = []
+        async with self._lock:
+            session = self._sessions.get(group_folder)
+            if session is not None and not session.alive:
+                evicted.append(self._sessions.pop(group_folder))
+                session = None
+
+            if session is not None:
+                if session.busy:
+                    # Only one run per group is active at a time, so this is
+                    # a caller outside the group queue; don't interleave
+                    return None, False, evicted
+                session.busy = True
+                self._sessions.move_to_end(group_folder)
+                return session, False, evicted
+
+            if len(self._sessions) + self._starting >= max(1, self.config.container_session_max):
+                victim = next((f for f, s in self._sessions.items() if not s.busy), None)
+                if victim is None:
+                    return None, False, evicted
+                evicted.append(self._sessions.pop(victim))
+            self._starting += 1
+            return None, True, evicted
+
+    async def close(self, group_folder: str) -> bool:
+        """Stop a group's session container, e.g. when the group goes away.
+
+        Args:
+            group_folder: Group folder name
+
+        Returns:
+            True if the group had a session container
+        """
+        async with self._lock:
+            session = self._sessions.pop(group_folder, None)
+        if session is None:
+            return False
+        await self._evict(session, "closed")
+        return True
+
+    async def maintain(self, now: float | None = None) -> None:
+        """Freeze idle containers and stop those idle past the TTL.
+
+        Args:
+            now: Current monotonic time
+        """
+        now = time.monotonic() if now is None else now
+        expired: list[tuple[SessionContainer, str]] = []
+        async with self._lock:
+            for folder, session in list(self._sessions.items()):
+                if session.busy:
+                    continue
+                idle = now - session.last_used
+                if not session.alive:
+                    expired.append((self._sessions.pop(folder), "exited"))
+                elif idle >= self.config.container_session_idle_ttl:
+                    expired.append((self._sessions.pop(folder), f"idle for {idle:.0f}s"))
+                elif not session.paused and idle >= self.config.container_session_pause_after:
+                    await self._pause(session)
+
+        for session, reason in expired:
+            await self._evict(session, reason)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get session container statistics.
+
+        Returns:
+            Live sessions with their idle times, and start/reuse counters
+        """
+        now = time.monotonic()
+        return {
+            "enabled": True,
+            "max": self.config.container_session_max,
+            "live": len(self._sessions),
+            "paused": sum(1 for s in self._sessions.values() if s.paused),
+            "started": self.started,
+            "reused": self.reused,
+            "evicted": self.evicted,
+            "sessions": [
+                {
+                    "group_folder": s.group_folder,
+                    "name": s.name,
+                    "turns": s.turns,
+                    "busy": s.busy,
+                    "paused": s.paused,
+                    "idle_seconds": 0.0 if s.busy else now - s.last_used,
+                }
+                for s in self._sessions.values()
+            ],
+        }
+
+    async def _start_session(
+        self,
+        group_folder: str,
+        prompt: str,
+        session_id: str | None,
+        chat_jid: str,
+        is_main: bool,
+        container_config: ContainerConfig | None,
+    ) -> SessionContainer | ContainerOutput:
+        """Start a container for a group with the first turn as its input.
+
+        Args:
+            group_folder: Group folder name
+            prompt: Prompt for the first turn
+            session_id: Agent session ID to resume
+            chat_jid: Chat JID for context
+            is_main: Whether this is the main group
+            container_config: Optional container configuration
+
+        Returns:
+            The new session, or an error output if it could not be started
+        """
+        from loguru import logger
+
+        from nanogridbot.core import container_runner
+
+        env = dict(container_config.env) if container_config and container_config.env else {}
+        try:
+            plan = await container_runner.prepare_launch(
+                group_folder, container_config, is_main, env, self.config.container_timeout
+            )
+        except Exception as e:
+            logger.error(f"Mount validation failed: {e}")
+            return ContainerOutput(status="error", error=str(e))
+
+        ipc_dir = next(
+            (Path(host) for host, target, _ in plan.mounts if target == "/workspace/ipc"),
+            self.config.data_dir / "ipc" / group_folder,
+        )
+        input_data = {
+            "prompt": prompt,
+            "sessionId": session_id,
+            "groupFolder": group_folder,
+            "chatJid": chat_jid,
+            "isMain": is_main,
+        }
+
+        try:
+            pool = container_runner._warm_pool
+            warm = await container_runner.claim_warm_container(plan, input_data, env)
+            if warm is not None:
+                name, process = warm.name, warm.process
+            else:
+                name = f"ngb-session-{group_folder}-{uuid.uuid4().hex[:8]}"
+                process = await spawn_container(plan.command_for(name))
+
+            process.stdin.write(json.dumps(input_data).encode())
+            await process.stdin.drain()
+            process.stdin.close()
+        except FileNotFoundError:
+            return ContainerOutput(status="error", error="Docker not found. Please install Docker.")
+        except Exception as e:
+            logger.error(f"Failed to start session container for {group_folder}: {e}")
+            return ContainerOutput(status="error", error=str(e))
+
+        session = SessionContainer(
+            group_folder=group_folder,
+            name=name,
+            process=process,
+            ipc_input_dir=ipc_dir / "input",
+            warm=warm,
+            pool=pool if warm is not None else None,
+        )
+        session.readers = [
+            asyncio.create_task(self._read_results(session)),
+            asyncio.create_task(self._drain_stderr(session)),
+        ]
+        if container_runner._resource_sampler is not None:
+            container_runner._resource_sampler.track(name, group_folder)
+        self.started += 1
+        logger.info(f"Started session container {name} for {group_folder}")
+        return session
+
+    def _send(self, session: SessionContainer, prompt: str) -> None:
+        """Hand a turn to a running session container over IPC.
+
+        Args:
+            session: Session container
+            prompt: Prompt for the turn
+        """
+        session.ipc_input_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{time.time_ns()}-{session.turns}"
+        tmp = session.ipc_input_dir / f".{name}.tmp"
+        tmp.write_text(json.dumps({"type": "message", "text": prompt}))
+        # The runner only picks up *.json, so it never sees a partial write
+        os.replace(tmp, session.ipc_input_dir / f"{name}.json")
+
+    async def _await_result(self, session: SessionContainer) -> ContainerOutput:
+        """Wait for the result of the turn in progress.
+
+        Args:
+            session: Session container
+
+        Returns:
+            The turn's output, or an error if the container timed out or exited
+        """
+        timeout = self.config.container_timeout
+        try:
+            result = await asyncio.wait_for(session.results.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            await self._drop(session, "turn timed out")
+            return ContainerOutput(status="error", error=f"Session container timed out after {timeout}s")
+
+        if result is None:
+            await self._drop(session, "exited")
+            return ContainerOutput(status="error", error="Session container exited")
+
+        session.turns += 1
+        return result
+
+    @staticmethod
+    def _discard_stale_results(session: SessionContainer) -> None:
+        """Drop results emitted after the previous turn was answered.
+
+        Args:
+            session: Session container
+        """
+        from loguru import logger
+
+        while not session.results.empty():
+            stale = session.results.get_nowait()
+            if stale is None:
+                # Keep the exit marker for the next wait
+                session.results.put_nowait(None)
+                return
+            logger.debug(f"Discarding late result from {session.name}")
+
+    async def _read_results(self, session: SessionContainer) -> None:
+        """Collect marker-delimited results from the container's stdout.
+
+        Args:
+            session: Session container
+        """
+        parser = OutputStreamParser(
+            self.config.container_max_output_size, self.config.data_dir / "output-spill"
+        )
+        try:
+            while chunk := await session.process.stdout.read(_READ_CHUNK):
+                for output in parser.feed(chunk):
+                    session.results.put_nowait(output)
+        finally:
+            session.results.put_nowait(None)
+
+    @staticmethod
+    async def _drain_stderr(session: SessionContainer) -> None:
+        """Read the container's stderr so a full pipe never blocks it.
+
+        Args:
+            session: Session container
+        """
+        while await session.process.stderr.read(_READ_CHUNK):
+            pass
+
+    async def _pause(self, session: SessionContainer) -> None:
+        """Freeze an idle session container.
+
+        Args:
+            session: Session container
+        """
+        from loguru import logger
+
+        if await _docker("pause", session.name):
+            session.paused = True
+            logger.debug(f"Paused session container {session.name}")
+
+    async def _unpause(self, session: SessionContainer) -> bool:
+        """Resume a frozen session container.
+
+        Args:
+            session: Session container
+
+        Returns:
+            True if the container is running again
+        """
+        if await _docker("unpause", session.name):
+            session.paused = False
+            return True
+        return False
+
+    async def _drop(self, session: SessionContainer, reason: str) -> None:
+        """Forget a session and stop its container.
+
+        Args:
+            session: Session container
+            reason: Why the session is dropped, for the log
+        """
+        async with self._lock:
+            if self._sessions.get(session.group_folder) is session:
+                self._sessions.pop(session.group_folder)
+        await self._evict(session, reason)
+
+    async def _evict(self, session: SessionContainer, reason: str) -> None:
+        """Freeze and then stop a session container that is no longer tracked.
+
+        Args:
+            session: Session container
+            reason: Why the session is evicted, for the log
+        """
+        from loguru import logger
+
+        from nanogridbot.core import container_runner
+        from nanogridbot.core.container_runner import cleanup_container
+
+        logger.info(f"Stopping session container {session.name} ({reason})")
+        self.evicted += 1
+        if container_runner._resource_sampler is not None:
+            await container_runner._resource_sampler.untrack(session.name)
+        if session.alive and not session.paused:
+            await self._pause(session)
+
+        if session.warm is not None and session.pool is not None:
+            await session.pool.release(session.warm)
+        else:
+            await cleanup_container(session.name)
+            try:
+                await asyncio.wait_for(session.process.wait(), timeout=STOP_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                try:
+                    session.process.kill()
+                except ProcessLookupError:
+                    pass
+
+        for task in session.readers:
+            task.cancel()
+
+    async def _maintain_loop(self) -> None:
+        """Run maintenance periodically until cancelled."""
+        from loguru import logger
+
+        while True:
+            try:
+                await self.maintain()
+            except Exception as e:
+                logger.error(f"Session container maintenance failed: {e}")
+            await asyncio.sleep(MAINTAIN_INTERVAL_SECONDS)
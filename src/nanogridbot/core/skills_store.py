@@ -0,0 +1,209 @@
+"""Content-addressed store of the skills shipped to agent containers."""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+# Manifest written into every synced skills directory
+MANIFEST_NAME = ".skills-manifest.json"
+
+# Shared snapshots kept besides the current one, for containers still using them
+KEEP_OLD_SNAPSHOTS = 1
+
+
+@dataclass(frozen=True)
+class SkillsSnapshot:
+    """Content of the skills source at one point in time.
+
+    Attributes:
+        digest: Hash over every file's path and content hash
+        files: Relative file path to the SHA-256 of its content
+    """
+
+    digest: str
+    files: dict[str, str]
+
+
+def _hash_file(path: Path) -> str:
+    """Get the SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SkillsStore:
+    """Hashes the skills source once and syncs it incrementally.
+
+    Files are only rehashed when their size or modification time changes.
+    Each destination keeps a manifest of what was last written to it, so a
+    sync of an unchanged destination touches nothing, and a changed skill
+    only copies the files whose content differs. Alternatively, one
+    read-only snapshot per source version can be shared by all containers.
+    """
+
+    def __init__(self, source: Path, root: Path):
+        """Initialize the store.
+
+        Args:
+            source: Skills source directory (``container/skills``)
+            root: Directory for shared snapshots
+        """
+        self.source = source
+        self.root = root
+        self.files_copied = 0
+        self._hashes: dict[str, tuple[int, int, str]] = {}
+        self._synced: dict[Path, str] = {}
+
+    def snapshot(self) -> SkillsSnapshot | None:
+        """Hash the current skills source.
+
+        Returns:
+            Snapshot, or None if there is no skills source
+        """
+        if not self.source.is_dir():
+            return None
+
+        files: dict[str, str] = {}
+        hashes: dict[str, tuple[int, int, str]] = {}
+        for skill_dir in sorted(self.source.iterdir()):
+            if not skill_dir.is_dir():
+                continue
+            for dirpath, dirnames, filenames in os.walk(skill_dir):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    path = Path(dirpath) / filename
+                    relative = path.relative_to(self.source).as_posix()
+                    st = path.stat()
+                    known = self._hashes.get(relative)
+                    if known and known[:2] == (st.st_mtime_ns, st.st_size):
+                        content = known[2]
+                    else:
+                        content = _hash_file(path)
+                    hashes[relative] = (st.st_mtime_ns, st.st_size, content)
+                    files[relative] = content
+        self._hashes = hashes
+
+        tree = hashlib.sha256()
+        for relative, content in files.items():
+            tree.update(f"{relative}\0{content}\n".encode())
+        return SkillsSnapshot(digest=tree.hexdigest(), files=files)
+
+    def sync_to(self, dest: Path) -> int:
+        """Bring a skills directory up to date with the source.
+
+        Only files whose content changed are copied; files that left the
+        source are removed. Files the agent added itself are kept.
+
+        Args:
+            dest: Destination skills directory
+
+        Returns:
+            Number of files copied
+        """
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return 0
+        if self._synced.get(dest) == snapshot.digest:
+            return 0
+
+        manifest_path = dest / MANIFEST_NAME
+        previous = self._read_manifest(manifest_path)
+        if previous.get("digest") == snapshot.digest:
+            self._synced[dest] = snapshot.digest
+            return 0
+
+        old_files: dict[str, str] = previous.get("files", {})
+        copied = 0
+        for relative, content in snapshot.files.items():
+            target = dest / relative
+            if old_files.get(relative) == content and target.exists():
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(self.source / relative, target)
+            copied += 1
+        for relative in old_files.keys() - snapshot.files.keys():
+            (dest / relative).unlink(missing_ok=True)
+
+        dest.mkdir(parents=True, exist_ok=True)
+        tmp = manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"digest": snapshot.digest, "files": snapshot.files}))
+        os.replace(tmp, manifest_path)
+
+        self._synced[dest] = snapshot.digest
+        self.files_copied += copied
+        return copied
+
+    def shared_dir(self) -> Path | None:
+        """Get the shared read-only snapshot of the current skills.
+
+        The snapshot is written once per source version; older ones beyond
+        ``KEEP_OLD_SNAPSHOTS`` are removed.
+
+        Returns:
+            Snapshot directory, or None if there is no skills source
+        """
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return None
+
+        snapshots = self.root / "snapshots"
+        target = snapshots / snapshot.digest[:16]
+        if not target.exists():
+            staging = snapshots / f".staging-{uuid.uuid4().hex[:8]}"
+            for relative in snapshot.files:
+                (staging / relative).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(self.source / relative, staging / relative)
+            staging.mkdir(parents=True, exist_ok=True)
+            try:
+                os.rename(staging, target)
+            except OSError:
+                # Another process published the same snapshot first
+                shutil.rmtree(staging, ignore_errors=True)
+            self.files_copied += len(snapshot.files)
+            self._prune(snapshots, keep=target)
+        return target
+
+    @staticmethod
+    def _read_manifest(path: Path) -> dict:
+        """Read a destination manifest, treating a bad one as empty."""
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _prune(snapshots: Path, keep: Path) -> None:
+        """Remove all but the newest few snapshots besides the current one."""
+        old = sorted(
+            (p for p in snapshots.iterdir() if p != keep and not p.name.startswith(".")),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for path in old[KEEP_OLD_SNAPSHOTS:]:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+# Stores by (source, root), shared by all launches in the process
+_stores: dict[tuple[Path, Path], SkillsStore] = {}
+
+
+def get_skills_store() -> SkillsStore:
+    """Get the skills store for the current configuration.
+
+    Returns:
+        Store for ``<base_dir>/container/skills``
+    """
+    from nanogridbot.config import get_config
+
+    config = get_config()
+    key = (config.base_dir / "container" / "skills", config.data_dir / "skills")
+    store = _stores.get(key)
+    if store is None:
+        store = _stores[key] = SkillsStore(*key)
+    return store
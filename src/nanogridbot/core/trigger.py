@@ -0,0 +1,219 @@
+"""Precompiled trigger pattern matching for group messages."""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from loguru import logger
+
+from nanogridbot.types import RegisteredGroup
+
+# Characters that end a literal run in a regex pattern
+_REGEX_META = frozenset(".^$*+?{}[]|()\\")
+
+# Quantifiers that make the preceding character optional or repeatable
+_QUANTIFIERS = frozenset("*?{")
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledTrigger:
+    """A compiled trigger pattern with an optional literal-prefix fast path.
+
+    Attributes:
+        source: Original pattern string
+        regex: Compiled case-insensitive regex
+        prefix: Lower-cased literal prefix every match must start with, or
+            empty if the pattern has no usable anchored prefix
+        exact: True if matching the prefix (plus ``boundary``) is the whole
+            pattern, so the regex never needs to run
+        boundary: True if the prefix must be followed by a word boundary
+    """
+
+    source: str
+    regex: re.Pattern[str]
+    prefix: str = ""
+    exact: bool = False
+    boundary: bool = False
+
+    def matches(self, content: str) -> bool:
+        """Check whether content triggers this pattern.
+
+        Args:
+            content: Message content
+
+        Returns:
+            True if triggered
+        """
+        prefix = self.prefix
+        if prefix:
+            if content[: len(prefix)].lower() != prefix:
+                return False
+            if self.exact:
+                return not self.boundary or _at_word_boundary(content, len(prefix))
+        return self.regex.search(content) is not None
+
+
+def _is_word_char(char: str) -> bool:
+    """Check whether a character counts as ``\\w`` for boundary purposes."""
+    return char.isalnum() or char == "_"
+
+
+def _at_word_boundary(content: str, index: int) -> bool:
+    """Check for a regex word boundary at ``index`` in content."""
+    before = index > 0 and _is_word_char(content[index - 1])
+    after = index < len(content) and _is_word_char(content[index])
+    return before != after
+
+
+def _split_literal_prefix(pattern: str) -> tuple[str, str]:
+    """Split an anchored pattern into its literal prefix and the remainder.
+
+    Args:
+        pattern: Regex pattern
+
+    Returns:
+        Tuple of (literal prefix, remaining pattern); the prefix is empty when
+        the pattern is not anchored with ``^``
+    """
+    if not pattern.startswith("^"):
+        return "", pattern
+
+    literal: list[str] = []
+    starts: list[int] = []
+    i = 1
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            # Escaped punctuation such as \@ or \. is a literal
+            literal.append(pattern[i + 1])
+            starts.append(i)
+            i += 2
+            continue
+        if char in _REGEX_META:
+            break
+        literal.append(char)
+        starts.append(i)
+        i += 1
+
+    if literal and pattern[i : i + 1] in _QUANTIFIERS:
+        # The last literal character is optional or repeated, so it is not
+        # part of the guaranteed prefix
+        literal.pop()
+        i = starts.pop()
+
+    return "".join(literal), pattern[i:]
+
+
+@lru_cache(maxsize=1024)
+def compile_trigger(pattern: str) -> CompiledTrigger:
+    """Compile a trigger pattern, memoized across groups sharing a pattern.
+
+    Invalid regexes are matched as literal text rather than failing every
+    message of the group.
+
+    Args:
+        pattern: Trigger pattern (regex)
+
+    Returns:
+        CompiledTrigger for the pattern
+    """
+    try:
+        regex = re.compile(pattern, re.IGNORECASE)
+    except re.error as e:
+        logger.warning(f"Invalid trigger pattern {pattern!r}, matching literally: {e}")
+        regex = re.compile(re.escape(pattern), re.IGNORECASE)
+        return CompiledTrigger(source=pattern, regex=regex)
+
+    prefix, rest = _split_literal_prefix(pattern)
+    if not prefix or not prefix.isascii():
+        # Non-ASCII case folding can change lengths; leave it to the regex
+        return CompiledTrigger(source=pattern, regex=regex)
+
+    return CompiledTrigger(
+        source=pattern,
+        regex=regex,
+        prefix=prefix.lower(),
+        exact=rest in ("", r"\b"),
+        boundary=rest == r"\b",
+    )
+
+
+class TriggerEngine:
+    """Matches messages against per-group trigger patterns.
+
+    Patterns are compiled once when a group is registered and reused for
+    every message; groups without a custom pattern share the compiled
+    default ``^@{assistant_name}\\b`` trigger.
+    """
+
+    def __init__(self, assistant_name: str):
+        """Initialize the trigger engine.
+
+        Args:
+            assistant_name: Assistant name used for the default trigger
+        """
+        self.default_pattern = rf"^@{re.escape(assistant_name)}\b"
+        self._default = compile_trigger(self.default_pattern)
+        self._groups: dict[str, CompiledTrigger] = {}
+
+    def _resolve(self, pattern: str | None) -> CompiledTrigger:
+        """Get the compiled trigger for a pattern, falling back to the default."""
+        if not pattern:
+            return self._default
+        return compile_trigger(pattern)
+
+    def register(self, group: RegisteredGroup) -> None:
+        """Compile and cache the trigger for a group.
+
+        Args:
+            group: Registered group
+        """
+        self._groups[group.jid] = self._resolve(group.trigger_pattern)
+
+    def load(self, groups: list[RegisteredGroup]) -> None:
+        """Replace all cached group triggers.
+
+        Args:
+            groups: Registered groups
+        """
+        self._groups = {g.jid: self._resolve(g.trigger_pattern) for g in groups}
+
+    def unregister(self, jid: str) -> None:
+        """Drop the cached trigger for a group.
+
+        Args:
+            jid: Group JID
+        """
+        self._groups.pop(jid, None)
+
+    def matches(self, group: RegisteredGroup, content: str) -> bool:
+        """Check whether content triggers a group.
+
+        Groups registered behind the engine's back, or whose pattern changed
+        since registration, are recompiled on first use.
+
+        Args:
+            group: Registered group
+            content: Message content
+
+        Returns:
+            True if triggered
+        """
+        trigger = self._groups.get(group.jid)
+        expected = group.trigger_pattern or self.default_pattern
+        if trigger is None or trigger.source != expected:
+            trigger = self._resolve(group.trigger_pattern)
+            self._groups[group.jid] = trigger
+        return trigger.matches(content)
+
+    def check(self, content: str, pattern: str | None) -> bool:
+        """Check content against a pattern without a group context.
+
+        Args:
+            content: Message content
+            pattern: Trigger pattern (regex), or None for the default
+
+        Returns:
+            True if triggered
+        """
+        return self._resolve(pattern).matches(content)
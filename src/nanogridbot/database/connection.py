@@ -76,16 +76,28 @@ class Database:
                 content TEXT NOT NULL,
                 timestamp TEXT NOT NULL,
                 is_from_me INTEGER DEFAULT 0,
-                role TEXT DEFAULT 'user'
+                role TEXT DEFAULT 'user',
+                seq INTEGER
             )
         """)
 
-        # Messages index
+        # Databases created before the ingest sequence existed
+        await self._migrate_message_seq(db)
+
+        # Messages indexes
         await db.execute("""
             CREATE INDEX IF NOT EXISTS idx_messages_chat_time
             ON messages(chat_jid, timestamp)
         """)
 
+        await db.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_messages_seq ON messages(seq)
+        """)
+
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_messages_chat_seq ON messages(chat_jid, seq)
+        """)
+
         # Groups table
         await db.execute("""
             CREATE TABLE IF NOT EXISTS groups (
@@ -263,6 +275,24 @@ class Database:
 
         await db.commit()
 
+    @staticmethod
+    async def _migrate_message_seq(db: aiosqlite.Connection) -> None:
+        """Add and backfill the messages.seq column on older databases.
+
+        Existing rows are numbered in insertion (rowid) order.
+
+        Args:
+            db: Open database connection.
+        """
+        async with db.execute("PRAGMA table_info(messages)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+
+        if "seq" not in columns:
+            await db.execute("ALTER TABLE messages ADD COLUMN seq INTEGER")
+            logger.info("Added ingest sequence column to messages")
+
+        await db.execute("UPDATE messages SET seq = rowid WHERE seq IS NULL")
+
     async def execute(
         self,
         query: str,
@@ -348,9 +378,29 @@ class Database:
         """Delete a group. Delegates to GroupRepository."""
         return await self.get_group_repository().delete_group(jid)
 
-    async def get_new_messages(self, since: datetime | None) -> Sequence[Message]:
-        """Get new messages since timestamp. Delegates to MessageRepository."""
-        return await self.get_message_repository().get_new_messages(since)
+    async def store_message(self, message: Message) -> int:
+        """Store a message. Delegates to MessageRepository."""
+        return await self.get_message_repository().store_message(message)
+
+    async def get_new_messages(
+        self, since: int | None, limit: int | None = None
+    ) -> Sequence[Message]:
+        """Get new messages after a sequence number. Delegates to MessageRepository."""
+        return await self.get_message_repository().get_new_messages(since, limit)
+
+    async def get_messages_since(
+        self, chat_jid: str, since: int | None, limit: int | None = None
+    ) -> Sequence[Message]:
+        """Get chat messages after a sequence number. Delegates to MessageRepository."""
+        return await self.get_message_repository().get_messages_since(chat_jid, since, limit)
+
+    async def get_max_message_seq(self) -> int:
+        """Get the highest message sequence number. Delegates to MessageRepository."""
+        return await self.get_message_repository().get_max_seq()
+
+    async def get_message_seq_at(self, timestamp: datetime, chat_jid: str | None = None) -> int:
+        """Translate a timestamp into a sequence cursor. Delegates to MessageRepository."""
+        return await self.get_message_repository().get_seq_at(timestamp, chat_jid)
 
     def get_message_repository(self) -> MessageRepository:
         """Get message repository instance.
@@ -424,7 +474,8 @@ class Database:
         """
         db = await self.get_connection()
         cursor = await db.execute(
-            "SELECT key, value FROM app_state WHERE key IN ('last_timestamp', 'sessions', 'last_agent_timestamp')"
+            "SELECT key, value FROM app_state WHERE key IN "
+            "('last_seq', 'sessions', 'last_agent_seq', 'last_timestamp', 'last_agent_timestamp')"
         )
         rows = await cursor.fetchall()
         state = {}
@@ -487,7 +538,7 @@ class MetricsConnection:
         pass
 
 
-async def get_db_connection() -> MetricsConnection:
+def get_db_connection() -> MetricsConnection:
     """Get a database connection for metrics.
 
     This is a compatibility function for metrics.py that needs
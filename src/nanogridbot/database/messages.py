@@ -73,17 +73,32 @@ class MessageRepository:
         self._db = database
         self._cache = MessageCache(max_size=cache_size)
 
-    async def store_message(self, message: Message) -> None:
+    async def store_message(self, message: Message) -> int:
         """Store a message in the database.
 
+        New messages get the next ingest sequence number; re-storing an
+        existing message ID updates it in place and keeps its sequence.
+
         Args:
             message: Message to store.
+
+        Returns:
+            Ingest sequence number of the stored message.
         """
-        await self._db.execute(
+        cursor = await self._db.execute(
             """
-            INSERT OR REPLACE INTO messages
-            (id, chat_jid, sender, sender_name, content, timestamp, is_from_me, role)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO messages
+            (id, chat_jid, sender, sender_name, content, timestamp, is_from_me, role, seq)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM messages))
+            ON CONFLICT(id) DO UPDATE SET
+                chat_jid = excluded.chat_jid,
+                sender = excluded.sender,
+                sender_name = excluded.sender_name,
+                content = excluded.content,
+                timestamp = excluded.timestamp,
+                is_from_me = excluded.is_from_me,
+                role = excluded.role
+            RETURNING seq
             """,
             (
                 message.id,
@@ -96,67 +111,106 @@ class MessageRepository:
                 message.role.value if isinstance(message.role, MessageRole) else message.role,
             ),
         )
+        row = await cursor.fetchone()
         await self._db.commit()
 
+        message.seq = int(row[0])
+
         # Update cache
         self._cache.put(message.id, message)
+        return message.seq
 
     async def get_messages_since(
         self,
         chat_jid: str,
-        since: datetime,
+        since: int | None,
+        limit: int | None = None,
     ) -> Sequence[Message]:
-        """Get messages for a specific chat since a timestamp.
+        """Get messages for a specific chat after an ingest sequence number.
 
         Args:
             chat_jid: Chat JID to filter by.
-            since: Filter messages after this timestamp.
+            since: Return messages with a sequence greater than this. If None,
+                returns the whole chat history.
+            limit: Optional maximum number of messages to return.
 
         Returns:
-            List of messages.
+            List of messages in ingest order.
         """
         rows = await self._db.fetchall(
             """
-            SELECT id, chat_jid, sender, sender_name, content, timestamp, is_from_me, role
+            SELECT id, chat_jid, sender, sender_name, content, timestamp, is_from_me, role, seq
             FROM messages
-            WHERE chat_jid = ? AND timestamp > ?
-            ORDER BY timestamp ASC
+            WHERE chat_jid = ? AND seq > ?
+            ORDER BY seq ASC
+            LIMIT ?
             """,
-            (chat_jid, since.isoformat()),
+            (chat_jid, since or 0, -1 if limit is None else limit),
         )
         return [self._row_to_message(row) for row in rows]
 
     async def get_new_messages(
         self,
-        since: datetime | None = None,
+        since: int | None = None,
+        limit: int | None = None,
     ) -> Sequence[Message]:
-        """Get all new messages since a timestamp.
+        """Get all new messages after an ingest sequence number.
 
         Args:
-            since: Filter messages after this timestamp. If None, returns all messages.
+            since: Return messages with a sequence greater than this. If None,
+                returns all messages.
+            limit: Optional maximum number of messages to return.
 
         Returns:
-            List of messages.
+            List of messages in ingest order.
         """
-        if since is not None:
-            rows = await self._db.fetchall(
+        rows = await self._db.fetchall(
+            """
+            SELECT id, chat_jid, sender, sender_name, content, timestamp, is_from_me, role, seq
+            FROM messages
+            WHERE seq > ?
+            ORDER BY seq ASC
+            LIMIT ?
+            """,
+            (since or 0, -1 if limit is None else limit),
+        )
+        return [self._row_to_message(row) for row in rows]
+
+    async def get_max_seq(self) -> int:
+        """Get the highest ingest sequence number.
+
+        Returns:
+            Highest sequence number, or 0 if there are no messages.
+        """
+        row = await self._db.fetchone("SELECT COALESCE(MAX(seq), 0) AS max_seq FROM messages")
+        return int(row["max_seq"]) if row else 0
+
+    async def get_seq_at(self, timestamp: datetime, chat_jid: str | None = None) -> int:
+        """Get the highest sequence number of messages at or before a timestamp.
+
+        Used to translate legacy timestamp cursors into sequence cursors.
+
+        Args:
+            timestamp: Upper bound timestamp (inclusive).
+            chat_jid: Optional chat JID to restrict the lookup to.
+
+        Returns:
+            Highest matching sequence number, or 0 if none match.
+        """
+        if chat_jid is not None:
+            row = await self._db.fetchone(
                 """
-                SELECT id, chat_jid, sender, sender_name, content, timestamp, is_from_me, role
-                FROM messages
-                WHERE timestamp > ?
-                ORDER BY timestamp ASC
+                SELECT COALESCE(MAX(seq), 0) AS max_seq FROM messages
+                WHERE chat_jid = ? AND timestamp <= ?
                 """,
-                (since.isoformat(),),
+                (chat_jid, timestamp.isoformat()),
             )
         else:
-            rows = await self._db.fetchall(
-                """
-                SELECT id, chat_jid, sender, sender_name, content, timestamp, is_from_me, role
-                FROM messages
-                ORDER BY timestamp ASC
-                """,
+            row = await self._db.fetchone(
+                "SELECT COALESCE(MAX(seq), 0) AS max_seq FROM messages WHERE timestamp <= ?",
+                (timestamp.isoformat(),),
             )
-        return [self._row_to_message(row) for row in rows]
+        return int(row["max_seq"]) if row else 0
 
     async def get_recent_messages(
         self,
@@ -174,7 +228,7 @@ class MessageRepository:
         """
         rows = await self._db.fetchall(
             """
-            SELECT id, chat_jid, sender, sender_name, content, timestamp, is_from_me, role
+            SELECT id, chat_jid, sender, sender_name, content, timestamp, is_from_me, role, seq
             FROM messages
             WHERE chat_jid = ?
             ORDER BY timestamp DESC
@@ -216,6 +270,7 @@ class MessageRepository:
         """
         sender_name_val = row.get("sender_name")
         sender_name: str | None = str(sender_name_val) if sender_name_val else None
+        seq_val = row.get("seq")
 
         return Message(
             id=str(row["id"]),
@@ -226,4 +281,5 @@ class MessageRepository:
             timestamp=datetime.fromisoformat(str(row["timestamp"])),
             is_from_me=bool(row["is_from_me"]),
             role=MessageRole(str(row["role"])),
+            seq=int(seq_val) if seq_val is not None else None,
         )
@@ -1,10 +1,23 @@
 """Metrics database module for tracking usage statistics."""
 
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel
 
+if TYPE_CHECKING:
+    from nanogridbot.core.resource_sampler import ResourceUsage
+
+# Resource usage columns added to container_metrics after its first release
+_RESOURCE_COLUMNS = {
+    "cpu_seconds": "REAL",
+    "cpu_peak_percent": "REAL",
+    "memory_avg_bytes": "INTEGER",
+    "memory_peak_bytes": "INTEGER",
+    "io_read_bytes": "INTEGER",
+    "io_write_bytes": "INTEGER",
+}
+
 
 class ContainerMetric(BaseModel):
     """Container execution metric."""
@@ -20,6 +33,12 @@ class ContainerMetric(BaseModel):
     completion_tokens: int | None = None
     total_tokens: int | None = None
     error: str | None = None
+    cpu_seconds: float | None = None
+    cpu_peak_percent: float | None = None
+    memory_avg_bytes: int | None = None
+    memory_peak_bytes: int | None = None
+    io_read_bytes: int | None = None
+    io_write_bytes: int | None = None
 
 
 class RequestMetric(BaseModel):
@@ -53,11 +72,24 @@ async def init_metrics_db() -> None:
                 prompt_tokens INTEGER,
                 completion_tokens INTEGER,
                 total_tokens INTEGER,
-                error TEXT
+                error TEXT,
+                cpu_seconds REAL,
+                cpu_peak_percent REAL,
+                memory_avg_bytes INTEGER,
+                memory_peak_bytes INTEGER,
+                io_read_bytes INTEGER,
+                io_write_bytes INTEGER
             )
             """
         )
 
+        # Resource usage columns on databases created before they existed
+        async with conn.execute("PRAGMA table_info(container_metrics)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        for column, column_type in _RESOURCE_COLUMNS.items():
+            if column not in columns:
+                await conn.execute(f"ALTER TABLE container_metrics ADD COLUMN {column} {column_type}")
+
         # Request metrics table
         await conn.execute(
             """
@@ -118,8 +150,19 @@ async def record_container_end(
     prompt_tokens: int | None = None,
     completion_tokens: int | None = None,
     error: str | None = None,
+    usage: "ResourceUsage | None" = None,
 ) -> None:
-    """Record container execution end."""
+    """Record container execution end.
+
+    Args:
+        metric_id: Metric ID from ``record_container_start``
+        status: Final status
+        duration_seconds: Run duration
+        prompt_tokens: Prompt tokens used
+        completion_tokens: Completion tokens used
+        error: Error message
+        usage: CPU, memory and IO usage sampled while the container ran
+    """
     from nanogridbot.database.connection import get_db_connection
 
     total_tokens = None
@@ -131,7 +174,9 @@ async def record_container_end(
             """
             UPDATE container_metrics
             SET end_time = ?, duration_seconds = ?, status = ?,
-                prompt_tokens = ?, completion_tokens = ?, total_tokens = ?, error = ?
+                prompt_tokens = ?, completion_tokens = ?, total_tokens = ?, error = ?,
+                cpu_seconds = ?, cpu_peak_percent = ?, memory_avg_bytes = ?,
+                memory_peak_bytes = ?, io_read_bytes = ?, io_write_bytes = ?
             WHERE id = ?
             """,
             (
@@ -142,6 +187,12 @@ async def record_container_end(
                 completion_tokens,
                 total_tokens,
                 error,
+                usage.cpu_seconds if usage else None,
+                usage.cpu_peak_percent if usage else None,
+                usage.memory_avg_bytes if usage else None,
+                usage.memory_peak_bytes if usage else None,
+                usage.io_read_bytes if usage else None,
+                usage.io_write_bytes if usage else None,
                 metric_id,
             ),
         )
@@ -196,7 +247,13 @@ async def get_container_stats(
             MAX(duration_seconds) as max_duration,
             MIN(duration_seconds) as min_duration,
             SUM(total_tokens) as total_tokens,
-            AVG(total_tokens) as avg_tokens
+            AVG(total_tokens) as avg_tokens,
+            AVG(cpu_seconds) as avg_cpu_seconds,
+            MAX(cpu_peak_percent) as max_cpu_percent,
+            AVG(memory_peak_bytes) as avg_memory_peak_bytes,
+            MAX(memory_peak_bytes) as max_memory_peak_bytes,
+            SUM(io_read_bytes) as io_read_bytes,
+            SUM(io_write_bytes) as io_write_bytes
         FROM container_metrics
         WHERE start_time > datetime('now', '-' || ? || ' days')
     """
@@ -221,6 +278,12 @@ async def get_container_stats(
                     "min_duration": row[6] or 0,
                     "total_tokens": row[7] or 0,
                     "avg_tokens": round(row[8] or 0, 2),
+                    "avg_cpu_seconds": round(row[9] or 0, 2),
+                    "max_cpu_percent": round(row[10] or 0, 1),
+                    "avg_memory_peak_bytes": int(row[11] or 0),
+                    "max_memory_peak_bytes": row[12] or 0,
+                    "io_read_bytes": row[13] or 0,
+                    "io_write_bytes": row[14] or 0,
                 }
             return {
                 "total_runs": 0,
@@ -232,6 +295,12 @@ async def get_container_stats(
                 "min_duration": 0,
                 "total_tokens": 0,
                 "avg_tokens": 0,
+                "avg_cpu_seconds": 0,
+                "max_cpu_percent": 0,
+                "avg_memory_peak_bytes": 0,
+                "max_memory_peak_bytes": 0,
+                "io_read_bytes": 0,
+                "io_write_bytes": 0,
             }
 
 
@@ -42,6 +42,8 @@ class Message(BaseModel):
     is_from_me: bool = False
 
     role: MessageRole = MessageRole.USER
+    # Monotonic ingest sequence assigned by the database on store
+    seq: int | None = None
 
 
 class RegisteredGroup(BaseModel):
@@ -63,6 +65,9 @@ class ContainerConfig(BaseModel):
     timeout: int | None = None
     max_output_size: int | None = None
     env: dict[str, str] = Field(default_factory=dict, description="Environment variables for container")
+    resource_class: Literal["small", "medium", "large"] | None = Field(
+        default=None, description="CPU and memory class; the configured default if unset"
+    )
 
 
 class ScheduleType(str, Enum):
@@ -1131,25 +1131,10 @@ async def send_message(
             detail="Orchestrator not available",
         )
 
-    # Store message in database
-    if web_state.db:
-        message_repo = web_state.db.get_message_repository()
-        from nanogridbot.types import Message
-        msg = Message(
-            id=f"msg_{datetime.now().timestamp()}",
-            chat_jid=request.chatJid,
-            sender=str(user.id),
-            sender_name=user.username,
-            content=request.content,
-            timestamp=datetime.now(),
-            is_from_me=False,
-        )
-        await message_repo.store_message(msg)
+    from nanogridbot.types import Message
 
-    # Queue the message for processing
-    from nanogridbot.types import Message as QueueMessage
-    queue_msg = QueueMessage(
-        id=msg.id,
+    msg = Message(
+        id=f"msg_{datetime.now().timestamp()}",
         chat_jid=request.chatJid,
         sender=str(user.id),
         sender_name=user.username,
@@ -1158,8 +1143,14 @@ async def send_message(
         is_from_me=False,
     )
 
-    if hasattr(web_state.orchestrator, "queue"):
-        await web_state.orchestrator.queue.enqueue(request.chatJid, queue_msg)
+    # Store message in database
+    if web_state.db:
+        message_repo = web_state.db.get_message_repository()
+        await message_repo.store_message(msg)
+
+    # Push the message straight to the orchestrator's dispatcher
+    if hasattr(web_state.orchestrator, "ingest"):
+        web_state.orchestrator.ingest(msg)
 
     return {
         "success": True,
@@ -1287,28 +1278,30 @@ async def get_status():
 
     groups = []
     registered_groups = web_state.orchestrator.registered_groups
-    queue_states = (
-        web_state.orchestrator.queue.states if hasattr(web_state.orchestrator, "queue") else {}
+    queue_status = (
+        web_state.orchestrator.queue.get_status()
+        if hasattr(web_state.orchestrator, "queue")
+        else {}
     )
+    if not isinstance(queue_status, dict):
+        queue_status = {}
 
     for jid, group in registered_groups.items():
-        queue_state = queue_states.get(jid, {})
-        is_active = (
-            queue_state.get("active", False)
-            if isinstance(queue_state, dict)
-            else False
-        )
-        pending_messages = (
-            queue_state.get("pending_messages", 0) > 0
-            if isinstance(queue_state, dict)
-            else False
-        )
+        group_status = queue_status.get(jid, {})
 
         groups.append({
             "jid": jid,
             "name": group.name,
-            "active": is_active,
-            "pendingMessages": pending_messages,
+            "active": group_status.get("active", False),
+            "pendingMessages": group_status.get("pending_messages", False),
+            "pendingTasks": group_status.get("pending_tasks", 0),
+            "queued": group_status.get("queued", False),
+            "awaitingCapacity": group_status.get("awaiting_capacity", False),
+            "queueDepth": group_status.get("queue_depth", 0),
+            "waitingSeconds": group_status.get("waiting_seconds", 0.0),
+            "avgWaitSeconds": group_status.get("avg_wait_seconds", 0.0),
+            "retriesRemaining": group_status.get("retries_remaining"),
+            "nextRetryAt": group_status.get("next_retry_at"),
         })
 
     return {"groups": groups}
@@ -1407,7 +1400,10 @@ async def get_metrics():
     "/api/metrics/containers",
     tags=["metrics"],
     summary="Container execution metrics",
-    description="Returns detailed container execution statistics including token usage and duration.",
+    description=(
+        "Returns detailed container execution statistics including token usage, duration, "
+        "CPU, memory and IO, plus live resource usage of running containers."
+    ),
 )
 async def get_container_metrics(
     group: str | None = Query(None, description="Filter by group folder"),
@@ -1418,12 +1414,45 @@ async def get_container_metrics(
         from nanogridbot.database import metrics
 
         stats = await metrics.get_container_stats(group_folder=group, days=days)
+        orchestrator = web_state.orchestrator
+        sampler = getattr(orchestrator, "resource_sampler", None) if orchestrator else None
+        live = sampler.live() if sampler is not None else []
+        stats["live"] = [item for item in live if group is None or item["group_folder"] == group]
         return stats
     except Exception as e:
         logger.error(f"Error getting container metrics: {e}")
         return {"error": str(e)}
 
 
+@app.get(
+    "/api/metrics/container-starts",
+    tags=["metrics"],
+    summary="Container start latency",
+    description=(
+        "Returns p50/p99 cold and warm container start latencies, warm pool status, "
+        "the long-lived session containers, the launch plan cache and resource admission."
+    ),
+)
+async def get_container_start_metrics():
+    """Get container start latency statistics."""
+    from nanogridbot.core.container_pool import start_latency
+
+    orchestrator = web_state.orchestrator
+    pool = getattr(orchestrator, "warm_pool", None) if orchestrator else None
+    sessions = getattr(orchestrator, "session_containers", None) if orchestrator else None
+    launch_plans = getattr(orchestrator, "launch_plans", None) if orchestrator else None
+    admission = getattr(orchestrator, "admission", None) if orchestrator else None
+    return {
+        "start_latency": start_latency.summary(),
+        "pool": pool.get_stats() if pool is not None else {"enabled": False},
+        "sessions": sessions.get_stats() if sessions is not None else {"enabled": False},
+        "launch_plans": (
+            launch_plans.get_stats() if launch_plans is not None else {"enabled": False}
+        ),
+        "admission": admission.get_stats() if admission is not None else {"enabled": False},
+    }
+
+
 @app.get(
     "/api/metrics/requests",
     tags=["metrics"],
@@ -0,0 +1,64 @@
+"""Microbenchmark: compiled trigger engine vs per-message re.search.
+
+Run with ``pytest tests/benchmarks -s`` to see the timings.
+"""
+
+import re
+import time
+
+from nanogridbot.core.trigger import TriggerEngine
+from nanogridbot.types import RegisteredGroup
+
+GROUPS = 2000
+MESSAGES_PER_GROUP = 10
+
+
+def _legacy_check_trigger(content: str, pattern: str | None, assistant_name: str) -> bool:
+    """The pre-engine Orchestrator._check_trigger implementation."""
+    if not pattern:
+        pattern = rf"^@{assistant_name}\b"
+    return bool(re.search(pattern, content, re.IGNORECASE))
+
+
+def _best_of(runs: int, func) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def test_trigger_engine_vs_legacy_on_busy_non_triggering_groups():
+    """Thousands of chatty groups whose messages never trigger the assistant."""
+    groups = [
+        RegisteredGroup(
+            jid=f"telegram:{i}",
+            name=f"Group {i}",
+            folder=f"group_{i}",
+            trigger_pattern=None if i % 4 else rf"^@Bot{i % 7}\b",
+        )
+        for i in range(GROUPS)
+    ]
+    contents = [f"just chatting about item {n}, nothing for the bot" for n in range(MESSAGES_PER_GROUP)]
+
+    engine = TriggerEngine("Andy")
+    engine.load(groups)
+
+    def legacy():
+        for group in groups:
+            any(_legacy_check_trigger(c, group.trigger_pattern, "Andy") for c in contents)
+
+    def compiled():
+        for group in groups:
+            any(engine.matches(group, c) for c in contents)
+
+    legacy_time = _best_of(5, legacy)
+    engine_time = _best_of(5, compiled)
+
+    checks = GROUPS * MESSAGES_PER_GROUP
+    print(
+        f"\ntrigger check x{checks}: legacy {legacy_time * 1e3:.1f} ms, "
+        f"engine {engine_time * 1e3:.1f} ms ({legacy_time / engine_time:.1f}x)"
+    )
+    assert engine_time < legacy_time
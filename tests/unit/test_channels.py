@@ -167,6 +167,19 @@ class TestChannel:
         message_id = await channel.send_message("chat123", "Hello world")
         assert message_id.startswith("msg_chat123")
 
+    @pytest.mark.asyncio
+    async def test_edit_not_supported_by_default(self) -> None:
+        channel = DummyChannel(ChannelType.TELEGRAM)
+        assert not channel.supports_edit
+        with pytest.raises(NotImplementedError):
+            await channel.edit_message("telegram:1", "m1", "Hello")
+
+    def test_owns_jid(self) -> None:
+        channel = DummyChannel(ChannelType.SLACK)
+        assert channel.name == "slack"
+        assert channel.owns_jid("slack:C123")
+        assert not channel.owns_jid("telegram:123")
+
     @pytest.mark.asyncio
     async def test_parse_jid(self) -> None:
         channel = DummyChannel(ChannelType.TELEGRAM)
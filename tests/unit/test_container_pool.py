@@ -0,0 +1,354 @@
+"""Unit tests for the warm container pool."""
+
+import asyncio
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from nanogridbot.core import container_pool
+from nanogridbot.core.container_pool import (
+    StartLatencyTracker,
+    WarmContainer,
+    WarmContainerPool,
+    is_staged,
+    staging_target,
+)
+
+
+@pytest.fixture
+def mock_config(tmp_path):
+    """Mock configuration."""
+    config = MagicMock()
+    config.data_dir = tmp_path
+    config.container_timeout = 300
+    config.container_image = "nanogridbot-agent:latest"
+    config.container_warm_pool_min = 0
+    config.container_warm_pool_max = 4
+    config.container_warm_pool_max_idle = 600
+    return config
+
+
+@pytest.fixture
+def pool(mock_config):
+    """Create an enabled pool without starting maintenance."""
+    pool = WarmContainerPool(mock_config)
+    pool.enabled = True
+    return pool
+
+
+@pytest.fixture
+def host_commands():
+    """Record host mount commands instead of running them."""
+    calls: list[tuple[str, ...]] = []
+
+    async def fake_run(*args):
+        calls.append(args)
+        return True
+
+    with patch.object(container_pool, "_run", fake_run):
+        yield calls
+
+
+def make_container(pool, name="ngb-warm-1", alive=True, booted_at=None):
+    """Create a warm container with a fake process."""
+    process = MagicMock()
+    process.returncode = None if alive else 0
+    process.wait = AsyncMock(return_value=0)
+    slot_dir = pool.root / name
+    for subdir in container_pool.STAGED_ROOTS.values():
+        (slot_dir / subdir).mkdir(parents=True, exist_ok=True)
+    return WarmContainer(
+        name=name,
+        slot_dir=slot_dir,
+        process=process,
+        booted_at=time.monotonic() if booted_at is None else booted_at,
+    )
+
+
+class TestStartLatencyTracker:
+    """Test latency percentiles."""
+
+    def test_percentiles(self):
+        """Test nearest-rank p50 and p99."""
+        tracker = StartLatencyTracker()
+        for ms in range(1, 101):
+            tracker.record("cold", ms / 1000)
+        tracker.record("warm", 0.05)
+
+        summary = tracker.summary()
+        assert summary["cold"] == {"count": 100, "p50": 0.05, "p99": 0.099}
+        assert summary["warm"] == {"count": 1, "p50": 0.05, "p99": 0.05}
+
+    def test_empty(self):
+        """Test percentiles without samples."""
+        tracker = StartLatencyTracker()
+        assert tracker.percentile("warm", 50) is None
+        assert tracker.summary()["warm"]["count"] == 0
+
+    def test_bounded_samples(self):
+        """Test old samples are dropped."""
+        tracker = StartLatencyTracker(max_samples=3)
+        for seconds in (10.0, 1.0, 2.0, 3.0):
+            tracker.record("cold", seconds)
+        assert tracker.percentile("cold", 100) == 3.0
+
+
+class TestStaging:
+    """Test mapping container paths to staging directories."""
+
+    def test_staging_target(self, tmp_path):
+        """Test staged container paths map under the slot directory."""
+        assert staging_target(tmp_path, "/workspace/group") == tmp_path / "workspace" / "group"
+        assert staging_target(tmp_path, "/home/node/.claude") == tmp_path / "claude"
+        assert staging_target(tmp_path, "/opt/data") is None
+
+    def test_is_staged(self):
+        """Test prefix matching respects path boundaries."""
+        assert is_staged("/workspace/ipc")
+        assert is_staged("/workspace")
+        assert not is_staged("/workspaces")
+        assert not is_staged("/srv/extra")
+
+
+class TestTargetSize:
+    """Test demand-driven pool sizing."""
+
+    def test_idle_pool_shrinks_to_min(self, pool, mock_config):
+        """Test no demand keeps only the minimum."""
+        mock_config.container_warm_pool_min = 1
+        assert pool.target_size() == 1
+
+    def test_follows_demand(self, pool):
+        """Test the target covers claims expected during one boot."""
+        now = time.monotonic()
+        pool._boot_times.extend([10.0, 10.0, 10.0])
+        # 60 claims in the window -> 0.2/s * 10s boot = 2 containers
+        pool._demand.extend([now] * 60)
+        assert pool.target_size(now) == 2
+
+    def test_capped_at_max(self, pool):
+        """Test the target never exceeds the configured maximum."""
+        now = time.monotonic()
+        pool._demand.extend([now] * 10000)
+        assert pool.target_size(now) == 4
+
+    def test_old_demand_expires(self, pool):
+        """Test claims outside the window no longer count."""
+        now = time.monotonic()
+        pool._demand.extend([now - container_pool.DEMAND_WINDOW_SECONDS - 1] * 100)
+        assert pool.target_size(now) == 0
+        assert not pool._demand
+
+
+class TestClaim:
+    """Test claiming warm containers."""
+
+    @pytest.mark.asyncio
+    async def test_disabled_pool_returns_none(self, mock_config):
+        """Test a pool that did not start hands out nothing."""
+        pool = WarmContainerPool(mock_config)
+        assert await pool.claim([]) is None
+
+    @pytest.mark.asyncio
+    async def test_claim_binds_mounts(self, pool, host_commands, tmp_path):
+        """Test group mounts are bound into the slot, read-only ones remounted."""
+        group_dir = tmp_path / "groups" / "g1"
+        group_dir.mkdir(parents=True)
+        env_file = tmp_path / "g1.env"
+        env_file.write_text("ANTHROPIC_MODEL=x\n")
+        container = make_container(pool)
+        pool._idle.append(container)
+
+        claimed = await pool.claim(
+            [
+                (str(env_file), "/workspace/env", "ro"),
+                (str(group_dir), "/workspace/group", "rw"),
+            ]
+        )
+
+        assert claimed is container
+        assert pool.hits == 1
+        group_target = container.slot_dir / "workspace" / "group"
+        env_target = container.slot_dir / "workspace" / "env"
+        assert host_commands == [
+            ("mount", "--bind", str(env_file), str(env_target)),
+            ("mount", "-o", "remount,bind,ro", str(env_target)),
+            ("mount", "--bind", str(group_dir), str(group_target)),
+        ]
+        assert group_target.is_dir()
+        assert env_target.is_file()
+        assert container.binds == [env_target, group_target]
+
+    @pytest.mark.asyncio
+    async def test_unstaged_mount_starts_cold(self, pool, host_commands):
+        """Test a mount outside the staged roots cannot use a warm container."""
+        container = make_container(pool)
+        pool._idle.append(container)
+
+        assert await pool.claim([("/srv/data", "/data", "ro")]) is None
+        assert pool.misses == 1
+        assert pool.idle_count == 1
+        assert host_commands == []
+
+    @pytest.mark.asyncio
+    async def test_dead_containers_skipped(self, pool, host_commands):
+        """Test containers that exited while idle are discarded."""
+        dead = make_container(pool, "ngb-warm-dead", alive=False)
+        live = make_container(pool, "ngb-warm-live")
+        pool._idle.extend([dead, live])
+
+        assert await pool.claim([]) is live
+        assert not dead.slot_dir.exists()
+
+    @pytest.mark.asyncio
+    async def test_empty_pool_records_demand(self, pool):
+        """Test a miss still counts as demand for sizing."""
+        assert await pool.claim([]) is None
+        assert pool.misses == 1
+        assert len(pool._demand) == 1
+
+
+class TestRelease:
+    """Test cleaning up claimed containers."""
+
+    @pytest.mark.asyncio
+    async def test_release_unbinds_and_removes_slot(self, pool, host_commands):
+        """Test binds are removed in reverse order and the slot deleted."""
+        container = make_container(pool)
+        container.process.returncode = 0
+        first = container.slot_dir / "workspace" / "group"
+        second = container.slot_dir / "workspace" / "ipc"
+        container.binds = [first, second]
+
+        await pool.release(container)
+
+        assert host_commands == [
+            ("umount", "-l", str(second)),
+            ("umount", "-l", str(first)),
+        ]
+        assert not container.slot_dir.exists()
+
+    @pytest.mark.asyncio
+    async def test_release_stops_running_container(self, pool, host_commands):
+        """Test a container still running after its run is removed."""
+        container = make_container(pool)
+
+        with patch(
+            "nanogridbot.core.container_runner.cleanup_container", AsyncMock()
+        ) as mock_cleanup:
+            await pool.release(container)
+
+        mock_cleanup.assert_called_once_with(container.name)
+
+
+class TestMaintain:
+    """Test pool maintenance."""
+
+    @pytest.mark.asyncio
+    async def test_grows_to_target(self, pool, mock_config):
+        """Test missing containers are booted."""
+        mock_config.container_warm_pool_min = 2
+        with patch.object(pool, "_boot", AsyncMock()) as mock_boot:
+            await pool.maintain()
+            await asyncio.gather(*pool._booting)
+
+        assert mock_boot.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_counts_booting_containers(self, pool, mock_config):
+        """Test containers already booting are not booted again."""
+        mock_config.container_warm_pool_min = 2
+        release = asyncio.Event()
+
+        async def slow_boot():
+            await release.wait()
+
+        with patch.object(pool, "_boot", side_effect=slow_boot) as mock_boot:
+            await pool.maintain()
+            await pool.maintain()
+            release.set()
+            await asyncio.gather(*pool._booting)
+
+        assert mock_boot.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_recycles_stale_and_shrinks(self, pool, mock_config, host_commands):
+        """Test stale containers are recycled and extras trimmed oldest first."""
+        mock_config.container_warm_pool_min = 1
+        now = time.monotonic()
+        stale = make_container(pool, "ngb-warm-stale", booted_at=now - 1000)
+        older = make_container(pool, "ngb-warm-older", booted_at=now - 10)
+        newer = make_container(pool, "ngb-warm-newer", booted_at=now)
+        pool._idle.extend([stale, older, newer])
+
+        with patch("nanogridbot.core.container_runner.cleanup_container", AsyncMock()):
+            await pool.maintain()
+
+        assert list(pool._idle) == [newer]
+        assert not stale.slot_dir.exists()
+        assert not older.slot_dir.exists()
+
+
+class TestBoot:
+    """Test booting warm containers."""
+
+    def test_build_command(self, pool):
+        """Test warm containers mount only the staging directories."""
+        slot_dir = Path("/data/pool/ngb-warm-1")
+        cmd = pool._build_command("ngb-warm-1", slot_dir)
+
+        assert cmd[:4] == ["docker", "run", "-i", "--rm"]
+        assert "--network=none" in cmd
+        assert (
+            "type=bind,source=/data/pool/ngb-warm-1/workspace,target=/workspace,"
+            "bind-propagation=rslave"
+        ) in cmd
+        assert "-v" not in cmd
+        assert cmd[-1] == "nanogridbot-agent:latest"
+
+    @pytest.mark.asyncio
+    async def test_wait_ready(self):
+        """Test readiness is detected from the runner's stderr."""
+        process = MagicMock()
+        process.stderr.readline = AsyncMock(
+            side_effect=[b"compiling\n", b"[agent-runner] ready\n"]
+        )
+        await WarmContainerPool._wait_ready(process)
+
+    @pytest.mark.asyncio
+    async def test_wait_ready_exit(self):
+        """Test a container exiting during boot is reported."""
+        process = MagicMock()
+        process.stderr.readline = AsyncMock(return_value=b"")
+        with pytest.raises(EOFError):
+            await WarmContainerPool._wait_ready(process)
+
+    @pytest.mark.asyncio
+    async def test_boot_adds_ready_container(self, pool):
+        """Test a booted container joins the idle pool with its boot time."""
+        process = MagicMock()
+        process.returncode = None
+        process.stderr.readline = AsyncMock(return_value=b"[agent-runner] ready\n")
+
+        with patch("asyncio.create_subprocess_exec", AsyncMock(return_value=process)):
+            await pool._boot()
+
+        assert pool.idle_count == 1
+        assert len(pool._boot_times) == 1
+        assert pool._idle[0].slot_dir.joinpath("claude").is_dir()
+
+
+class TestStart:
+    """Test pool start-up."""
+
+    @pytest.mark.asyncio
+    async def test_unsupported_host_stays_disabled(self, mock_config):
+        """Test the pool disables itself when mounts cannot be bound."""
+        pool = WarmContainerPool(mock_config)
+        with patch.object(container_pool, "pool_supported", return_value=False):
+            await pool.start()
+
+        assert pool.enabled is False
+        assert pool.get_stats()["enabled"] is False
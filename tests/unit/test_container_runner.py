@@ -16,7 +16,42 @@ from nanogridbot.core.container_runner import (
     cleanup_container,
     get_container_status,
 )
-from nanogridbot.types import ContainerOutput
+from nanogridbot.core.resources import RESOURCE_CLASSES
+from nanogridbot.types import ContainerConfig, ContainerOutput
+
+
+def _streaming_process(stdout: bytes = b"", stderr: bytes = b"", exits: bool = True) -> MagicMock:
+    """Create a fake container process with readable output streams."""
+    process = MagicMock()
+    process.stdin = MagicMock()
+    process.stdin.drain = AsyncMock()
+    process.stdout = asyncio.StreamReader()
+    process.stderr = asyncio.StreamReader()
+    process.stdout.feed_data(stdout)
+    process.stderr.feed_data(stderr)
+    exited = asyncio.Event()
+    if exits:
+        process.stdout.feed_eof()
+        process.stderr.feed_eof()
+        exited.set()
+
+    async def wait():
+        await exited.wait()
+        return 0
+
+    def kill():
+        process.stdout.feed_eof()
+        process.stderr.feed_eof()
+        exited.set()
+
+    process.wait = wait
+    process.kill = MagicMock(side_effect=kill)
+    return process
+
+
+def _runner_config(tmp_path: Path, timeout: float = 300) -> MagicMock:
+    """Create a config for running containers in tests."""
+    return MagicMock(container_timeout=timeout, container_max_output_size=100000, data_dir=tmp_path)
 
 
 class TestParseOutput:
@@ -141,6 +176,18 @@ class TestBuildDockerCommand:
         assert "/host/a:/container/a:rw" in cmd
         assert "/host/b:/container/b:ro" in cmd
 
+    def test_container_name(self):
+        """Test the container is named when a name is given."""
+        input_data = {"isMain": False, "groupFolder": "test"}
+
+        with patch("nanogridbot.core.container_runner.get_config") as mock_cfg:
+            mock_cfg.return_value = MagicMock(container_image="img:latest")
+            unnamed = build_docker_command([], input_data, 300)
+            named = build_docker_command([], input_data, 300, name="ngb-session-test-1")
+
+        assert "--name" not in unnamed
+        assert named[named.index("--name") + 1] == "ngb-session-test-1"
+
     def test_environment_variables(self):
         """Test environment variables are set."""
         mounts = []
@@ -195,6 +242,17 @@ class TestBuildDockerCommand:
         assert "--cpus" in cmd
         assert "1.0" in cmd
 
+    def test_resource_class_limits(self):
+        """Test a resource class sets its own limits."""
+        input_data = {"isMain": False, "groupFolder": "test"}
+
+        with patch("nanogridbot.core.container_runner.get_config") as mock_cfg:
+            mock_cfg.return_value = MagicMock(container_image="img:latest")
+            cmd = build_docker_command([], input_data, 300, resources=RESOURCE_CLASSES["small"])
+
+        assert cmd[cmd.index("--memory") + 1] == "512m"
+        assert cmd[cmd.index("--cpus") + 1] == "0.5"
+
     def test_timeout_setting(self):
         """Test stop-timeout is set."""
         mounts = []
@@ -356,73 +414,176 @@ class TestRunContainerAgent:
             assert "Docker not found" in result.error
 
     @pytest.mark.asyncio
-    async def test_execute_container_timeout(self):
+    async def test_execute_container_timeout(self, tmp_path):
         """Test _execute_container when container times out."""
         from nanogridbot.core.container_runner import _execute_container
 
-        mock_process = AsyncMock()
-        mock_stdin = AsyncMock()
-        mock_stdin.write = MagicMock()
-        mock_stdin.drain = AsyncMock()
-        mock_stdin.close = MagicMock()
-        mock_process.stdin = mock_stdin
-        mock_process.communicate = AsyncMock(side_effect=asyncio.TimeoutError)
-        mock_process.kill = MagicMock()
+        mock_process = _streaming_process(exits=False)
 
         with patch("asyncio.create_subprocess_exec", return_value=mock_process), patch(
             "nanogridbot.core.container_runner.get_config"
-        ) as mock_cfg:
-            mock_cfg.return_value = MagicMock(container_timeout=1)
+        ) as mock_cfg, patch("nanogridbot.core.container_runner.GRACE_PERIOD_SECONDS", 0.05):
+            mock_cfg.return_value = _runner_config(tmp_path, timeout=0.05)
             result = await _execute_container(["docker", "run"], {"prompt": "test"})
 
             assert result.status == "error"
             assert "timed out" in result.error
+            mock_process.kill.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_execute_container_success(self):
+    async def test_execute_container_success(self, tmp_path):
         """Test _execute_container with successful output."""
         from nanogridbot.core.container_runner import _execute_container
 
         output_json = json.dumps({"status": "success", "result": "done"})
         stdout = f"{OUTPUT_START_MARKER}\n{output_json}\n{OUTPUT_END_MARKER}\n".encode()
-
-        mock_stdin = AsyncMock()
-        mock_stdin.write = MagicMock()
-        mock_stdin.drain = AsyncMock()
-        mock_stdin.close = MagicMock()
-
-        mock_process = AsyncMock()
-        mock_process.stdin = mock_stdin
-        mock_process.communicate = AsyncMock(return_value=(stdout, b""))
+        mock_process = _streaming_process(stdout)
 
         with patch("asyncio.create_subprocess_exec", return_value=mock_process), patch(
             "nanogridbot.core.container_runner.get_config"
         ) as mock_cfg:
-            mock_cfg.return_value = MagicMock(container_timeout=300)
+            mock_cfg.return_value = _runner_config(tmp_path)
             result = await _execute_container(["docker", "run"], {"prompt": "test"})
 
             assert result.status == "success"
             assert result.result == "done"
 
     @pytest.mark.asyncio
-    async def test_execute_container_no_output(self):
+    async def test_execute_container_no_output(self, tmp_path):
         """Test _execute_container with no stdout."""
         from nanogridbot.core.container_runner import _execute_container
 
-        mock_stdin = AsyncMock()
-        mock_stdin.write = MagicMock()
-        mock_stdin.drain = AsyncMock()
-        mock_stdin.close = MagicMock()
-
-        mock_process = AsyncMock()
-        mock_process.stdin = mock_stdin
-        mock_process.communicate = AsyncMock(return_value=(b"", b""))
+        mock_process = _streaming_process()
 
         with patch("asyncio.create_subprocess_exec", return_value=mock_process), patch(
             "nanogridbot.core.container_runner.get_config"
         ) as mock_cfg:
-            mock_cfg.return_value = MagicMock(container_timeout=300)
+            mock_cfg.return_value = _runner_config(tmp_path)
             result = await _execute_container(["docker", "run"], {"prompt": "test"})
 
             assert result.status == "error"
             assert "No output" in result.error
+
+    @pytest.mark.asyncio
+    async def test_execute_container_delivers_results_early(self, tmp_path):
+        """Test each result reaches on_output before the container exits."""
+        from nanogridbot.core.container_runner import _execute_container
+
+        mock_process = _streaming_process(exits=False)
+        delivered: list[ContainerOutput] = []
+
+        async def on_output(output: ContainerOutput) -> None:
+            delivered.append(output)
+            if len(delivered) == 1:
+                # The container is still running when the first result lands
+                assert mock_process.kill.call_count == 0
+                second = json.dumps({"status": "success", "result": "two", "newSessionId": "s2"})
+                mock_process.stdout.feed_data(
+                    f"{OUTPUT_START_MARKER}\n{second}\n{OUTPUT_END_MARKER}\n".encode()
+                )
+                mock_process.kill()
+
+        first = json.dumps({"status": "success", "result": "one"})
+        mock_process.stdout.feed_data(
+            f"log line\n{OUTPUT_START_MARKER}\n{first}\n{OUTPUT_END_MARKER}\n".encode()
+        )
+
+        with patch("asyncio.create_subprocess_exec", return_value=mock_process), patch(
+            "nanogridbot.core.container_runner.get_config"
+        ) as mock_cfg:
+            mock_cfg.return_value = _runner_config(tmp_path)
+            result = await _execute_container(
+                ["docker", "run"], {"prompt": "test"}, on_output=on_output
+            )
+
+        assert [output.result for output in delivered] == ["one", "two"]
+        assert result.result == "two"
+        assert result.new_session_id == "s2"
+
+
+class TestWarmStart:
+    """Test serving runs from the warm pool and start latency."""
+
+    def test_record_start_latency(self):
+        """Test start latency is derived from the runner's input timestamp."""
+        from nanogridbot.core.container_pool import start_latency
+        from nanogridbot.core.container_runner import _record_start_latency
+
+        start_latency.clear()
+        stderr = b"[agent-runner] ready\n[agent-runner] Received input for group: g1 (at 1000250)\n"
+        _record_start_latency(stderr, 1000.0, "warm")
+
+        assert start_latency.summary()["warm"]["p50"] == pytest.approx(0.25)
+        start_latency.clear()
+
+    @pytest.mark.asyncio
+    async def test_run_uses_warm_container(self):
+        """Test a claimed warm container receives the input and is released."""
+        from nanogridbot.core import container_runner
+
+        warm = MagicMock()
+        warm.name = "ngb-warm-1"
+        pool = MagicMock()
+        pool.claim = AsyncMock(return_value=warm)
+        pool.release = AsyncMock()
+        pool.resources = RESOURCE_CLASSES["medium"]
+        mounts = [("/host/g1", "/workspace/group", "rw")]
+
+        with patch.object(container_runner, "_warm_pool", pool), patch(
+            "nanogridbot.core.container_runner.validate_group_mounts",
+            AsyncMock(return_value=mounts),
+        ), patch(
+            "nanogridbot.core.mount_security.create_group_env_file", return_value=None
+        ), patch(
+            "nanogridbot.core.container_runner.build_docker_command", return_value=["docker", "run"]
+        ), patch(
+            "nanogridbot.core.container_runner._execute_container",
+            AsyncMock(return_value=ContainerOutput(status="success", result="ok")),
+        ) as mock_execute, patch(
+            "nanogridbot.core.container_runner.get_config"
+        ) as mock_cfg:
+            mock_cfg.return_value = MagicMock(container_timeout=300)
+            result = await container_runner.run_container_agent(
+                group_folder="g1",
+                prompt="hi",
+                session_id=None,
+                chat_jid="telegram:1",
+                container_config=ContainerConfig(env={"TZ": "UTC", "ANTHROPIC_API_KEY": "k"}),
+            )
+
+        assert result.result == "ok"
+        pool.claim.assert_called_once_with(mounts)
+        args, kwargs = mock_execute.call_args
+        assert kwargs["process"] is warm.process
+        # Secrets never travel in the input
+        assert args[1]["env"] == {"TZ": "UTC"}
+        pool.release.assert_called_once_with(warm)
+
+    @pytest.mark.asyncio
+    async def test_run_falls_back_to_cold(self):
+        """Test runs start a fresh container when the pool has none."""
+        from nanogridbot.core import container_runner
+
+        pool = MagicMock()
+        pool.claim = AsyncMock(return_value=None)
+
+        with patch.object(container_runner, "_warm_pool", pool), patch(
+            "nanogridbot.core.container_runner.validate_group_mounts", AsyncMock(return_value=[])
+        ), patch(
+            "nanogridbot.core.mount_security.create_group_env_file", return_value=None
+        ), patch(
+            "nanogridbot.core.container_runner.build_docker_command", return_value=["docker", "run"]
+        ), patch(
+            "nanogridbot.core.container_runner._execute_container",
+            AsyncMock(return_value=ContainerOutput(status="success", result="ok")),
+        ) as mock_execute, patch(
+            "nanogridbot.core.container_runner.get_config"
+        ) as mock_cfg:
+            mock_cfg.return_value = MagicMock(container_timeout=300)
+            await container_runner.run_container_agent(
+                group_folder="g1", prompt="hi", session_id=None, chat_jid="telegram:1"
+            )
+
+        args, kwargs = mock_execute.call_args
+        assert args[0] == ["docker", "run"]
+        assert "process" not in kwargs
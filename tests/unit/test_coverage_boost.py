@@ -137,6 +137,7 @@ class TestContainerRunnerExtended:
 
         mock_config = MagicMock()
         mock_config.container_timeout = 30
+        mock_config.container_max_output_size = 100000
         mock_config.container_image = "test-image"
         mock_config.container_max_memory = "512m"
         mock_config.container_max_cpus = "1.0"
@@ -174,6 +175,7 @@ class TestContainerRunnerExtended:
 
         mock_config = MagicMock()
         mock_config.container_timeout = 30
+        mock_config.container_max_output_size = 100000
 
         with patch("nanogridbot.core.container_runner.get_config", return_value=mock_config):
             with patch(
@@ -200,7 +202,7 @@ class TestContainerRunnerExtended:
                         assert result.status == "error"
                         assert "docker crashed" in result.error
 
-    def _make_mock_process(self, stdout=b"", stderr=b"", communicate_side_effect=None):
+    def _make_mock_process(self, stdout=b"", stderr=b""):
         """Helper to create a properly mocked subprocess."""
         mock_process = MagicMock()
         mock_stdin = MagicMock()
@@ -208,10 +210,13 @@ class TestContainerRunnerExtended:
         mock_stdin.drain = AsyncMock()
         mock_stdin.close = MagicMock()
         mock_process.stdin = mock_stdin
-        if communicate_side_effect:
-            mock_process.communicate = AsyncMock(side_effect=communicate_side_effect)
-        else:
-            mock_process.communicate = AsyncMock(return_value=(stdout, stderr))
+        mock_process.stdout = asyncio.StreamReader()
+        mock_process.stdout.feed_data(stdout)
+        mock_process.stdout.feed_eof()
+        mock_process.stderr = asyncio.StreamReader()
+        mock_process.stderr.feed_data(stderr)
+        mock_process.stderr.feed_eof()
+        mock_process.wait = AsyncMock(return_value=0 if not stderr else 1)
         mock_process.returncode = 0 if not stderr else 1
         return mock_process
 
@@ -223,6 +228,7 @@ class TestContainerRunnerExtended:
         mock_process = self._make_mock_process(stdout=b"", stderr=b"some error output")
         mock_config = MagicMock()
         mock_config.container_timeout = 30
+        mock_config.container_max_output_size = 100000
 
         with patch("nanogridbot.core.container_runner.get_config", return_value=mock_config):
             with patch("asyncio.create_subprocess_exec", new_callable=AsyncMock, return_value=mock_process):
@@ -238,6 +244,7 @@ class TestContainerRunnerExtended:
         mock_process.kill = MagicMock(side_effect=ProcessLookupError)
         mock_config = MagicMock()
         mock_config.container_timeout = 30
+        mock_config.container_max_output_size = 100000
 
         with patch("nanogridbot.core.container_runner.get_config", return_value=mock_config):
             with patch("asyncio.create_subprocess_exec", new_callable=AsyncMock, return_value=mock_process):
@@ -107,18 +107,20 @@ class TestPluginLoaderHotReloadLoop:
 
 
 # ============================================================================
-# 2. core/group_queue.py — _try_start_task full path & edge cases
+# 2. core/group_queue.py — _run_task full path & edge cases
 #    (lines 143, 172, 201-248)
 # ============================================================================
 
 
-class TestGroupQueueTryStartTask:
-    """Cover _try_start_task full execution path (lines 201-248)."""
+class TestGroupQueueRunTask:
+    """Cover _run_task full execution path."""
 
     @pytest.fixture
     def mock_config(self):
         config = MagicMock()
         config.container_max_concurrent_containers = 5
+        config.container_max_retries = 5
+        config.container_retry_base_delay = 5.0
         config.data_dir = MagicMock()
         return config
 
@@ -151,8 +153,8 @@ class TestGroupQueueTryStartTask:
         )
 
     @pytest.mark.asyncio
-    async def test_try_start_task_success(self, queue, group, task):
-        """Cover lines 201-248: full _try_start_task success path."""
+    async def test_run_task_success(self, queue, group, task):
+        """Cover the full _run_task success path."""
         mock_result = ContainerOutput(status="success", result="done")
 
         with patch(
@@ -160,9 +162,7 @@ class TestGroupQueueTryStartTask:
             new_callable=AsyncMock,
             return_value=mock_result,
         ):
-            with patch.object(queue, "_drain_pending", new_callable=AsyncMock):
-                with patch.object(queue, "_drain_waiting", new_callable=AsyncMock):
-                    await queue._try_start_task("jid1", group, task, "sess1")
+            await queue._run_task("jid1", group, task, "sess1")
 
         # State should be cleaned up
         state = queue._get_state("jid1", "folder1")
@@ -170,32 +170,30 @@ class TestGroupQueueTryStartTask:
         assert queue.active_count == 0
 
     @pytest.mark.asyncio
-    async def test_try_start_task_exception(self, queue, group, task):
-        """Cover lines 236-248: exception in _try_start_task."""
+    async def test_run_task_exception(self, queue, group, task):
+        """Cover an exception in _run_task."""
         with patch(
             "nanogridbot.core.container_runner.run_container_agent",
             new_callable=AsyncMock,
             side_effect=RuntimeError("task failed"),
         ):
-            with patch.object(queue, "_drain_pending", new_callable=AsyncMock):
-                with patch.object(queue, "_drain_waiting", new_callable=AsyncMock):
-                    await queue._try_start_task("jid1", group, task, None)
+            await queue._run_task("jid1", group, task, None)
 
         state = queue._get_state("jid1", "folder1")
         assert state.active is False
 
     @pytest.mark.asyncio
-    async def test_try_start_task_concurrency_limit(self, queue, group, task):
-        """Cover lines 204-207: concurrency limit in _try_start_task."""
-        queue.active_count = 5  # At limit
+    async def test_enqueue_task_waits_for_worker(self, queue, group, task):
+        """Cover enqueue_task: the task is queued until a worker claims it."""
+        await queue.enqueue_task("jid1", group, task, None)
 
-        await queue._try_start_task("jid1", group, task, None)
-
-        assert "jid1" in queue.waiting_groups
+        assert queue.waiting_count == 1
+        job = await queue._claim("jid1")
+        assert job.task == task
 
     @pytest.mark.asyncio
-    async def test_try_start_task_with_container_config(self, queue, group, task):
-        """Cover line 217-218: container_config branch in _try_start_task."""
+    async def test_run_task_with_container_config(self, queue, group, task):
+        """Cover the container_config branch in _run_task."""
         group.container_config = {"image": "custom:latest", "memory": "1g"}
         mock_result = ContainerOutput(status="success", result="done")
 
@@ -204,13 +202,11 @@ class TestGroupQueueTryStartTask:
             new_callable=AsyncMock,
             return_value=mock_result,
         ):
-            with patch.object(queue, "_drain_pending", new_callable=AsyncMock):
-                with patch.object(queue, "_drain_waiting", new_callable=AsyncMock):
-                    await queue._try_start_task("jid1", group, task, None)
+            await queue._run_task("jid1", group, task, None)
 
     @pytest.mark.asyncio
-    async def test_try_start_container_with_container_config(self, queue, group, mock_db):
-        """Cover line 143: container_config branch in _try_start_container."""
+    async def test_run_messages_with_container_config(self, queue, group, mock_db):
+        """Cover the container_config branch in _run_messages."""
         group.container_config = {"image": "custom:latest", "memory": "1g"}
         mock_result = ContainerOutput(status="success", result="done")
 
@@ -219,29 +215,28 @@ class TestGroupQueueTryStartTask:
             new_callable=AsyncMock,
             return_value=mock_result,
         ):
-            with patch.object(queue, "_drain_pending", new_callable=AsyncMock):
-                with patch.object(queue, "_drain_waiting", new_callable=AsyncMock):
-                    await queue._try_start_container("jid1", group, None, None)
+            await queue._run_messages("jid1", group, None, None)
 
     @pytest.mark.asyncio
     async def test_max_retries_drops_group(self, queue, group, mock_db):
-        """Cover line 172: max retries reached, group is dropped."""
+        """Cover max retries reached, group is dropped."""
         # Pre-set retry count to 4 so next failure hits max (5)
         state = queue._get_state("jid1", "folder1")
         state.retry_count = 4
+        state.group = group
+        state.pending_messages = True
 
         with patch(
             "nanogridbot.core.container_runner.run_container_agent",
             new_callable=AsyncMock,
             side_effect=RuntimeError("fail"),
         ):
-            with patch("asyncio.sleep", new_callable=AsyncMock):
-                with patch.object(queue, "_drain_pending", new_callable=AsyncMock):
-                    with patch.object(queue, "_drain_waiting", new_callable=AsyncMock):
-                        await queue._try_start_container("jid1", group, None, None)
+            job = await queue._claim("jid1")
+            await queue._execute(job)
 
-        # retry_count resets in finally block
+        # retry_count resets once the group is dropped
         assert state.retry_count == 0
+        assert queue._retries == []
 
 
 # ============================================================================
@@ -852,6 +847,13 @@ class TestOrchestratorCoverage:
 
         config = MagicMock()
         config.data_dir = MagicMock()
+        config.assistant_name = "Andy"
+        config.max_concurrent_dispatches = 4
+        config.container_warm_pool_enabled = False
+        config.container_session_enabled = False
+        config.container_launch_cache_enabled = False
+        config.container_admission_enabled = False
+        config.container_resource_sampling_enabled = False
         db = AsyncMock()
         db.get_registered_groups = AsyncMock(return_value=[])
 
@@ -116,13 +116,42 @@ class TestMessageRepository:
             role=MessageRole.USER,
         )
 
-        await repo.store_message(msg1)
-        await repo.store_message(msg2)
+        seq1 = await repo.store_message(msg1)
+        seq2 = await repo.store_message(msg2)
+        assert seq2 == seq1 + 1
 
-        # Get messages since now - should only return msg_new
-        messages = await repo.get_messages_since("telegram:123", now - timedelta(minutes=30))
+        # Get messages after the first one's sequence - should only return msg_new
+        messages = await repo.get_messages_since("telegram:123", seq1)
         assert len(messages) == 1
         assert messages[0].id == "msg_new"
+        assert messages[0].seq == seq2
+
+    async def test_sequence_orders_identical_timestamps(self, repo: MessageRepository):
+        """Test messages sharing a timestamp are neither skipped nor duplicated."""
+        now = datetime.now()
+        for i in range(3):
+            await repo.store_message(
+                Message(id=f"same_{i}", chat_jid="telegram:1", sender="u", content=str(i), timestamp=now)
+            )
+
+        first = await repo.get_new_messages(since=None, limit=2)
+        rest = await repo.get_new_messages(since=first[-1].seq)
+
+        assert [m.id for m in first + list(rest)] == ["same_0", "same_1", "same_2"]
+        assert await repo.get_max_seq() == rest[-1].seq
+        assert await repo.get_seq_at(now, "telegram:1") == rest[-1].seq
+
+    async def test_restore_keeps_sequence(self, repo: MessageRepository):
+        """Test re-storing a message updates it without a new sequence."""
+        msg = Message(id="dup", chat_jid="telegram:1", sender="u", content="a", timestamp=datetime.now())
+        seq = await repo.store_message(msg)
+
+        msg.content = "edited"
+        assert await repo.store_message(msg) == seq
+
+        messages = await repo.get_new_messages(since=seq - 1)
+        assert len(messages) == 1
+        assert messages[0].content == "edited"
 
     async def test_get_recent_messages(self, repo: MessageRepository):
         """Test getting recent messages."""
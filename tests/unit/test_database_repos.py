@@ -363,10 +363,9 @@ class TestMessageRepositoryExtended:
 
     @pytest.mark.asyncio
     async def test_get_new_messages_with_since(self, mock_db):
-        """Test get_new_messages with since parameter (lines 141-150)."""
+        """Test get_new_messages with a sequence cursor."""
         repo = MessageRepository(mock_db, cache_size=100)
 
-        since = datetime(2025, 1, 1, 12, 0)
         mock_db.fetchall.return_value = [
             {
                 "id": "msg1",
@@ -377,21 +376,23 @@ class TestMessageRepositoryExtended:
                 "timestamp": "2025-01-01T13:00:00",
                 "is_from_me": 0,
                 "role": "user",
+                "seq": 8,
             }
         ]
 
-        messages = await repo.get_new_messages(since=since)
+        messages = await repo.get_new_messages(since=7, limit=50)
 
         assert len(messages) == 1
         assert messages[0].id == "msg1"
+        assert messages[0].seq == 8
         mock_db.fetchall.assert_called_once()
         call_args = mock_db.fetchall.call_args
-        assert "WHERE timestamp > ?" in call_args[0][0]
-        assert call_args[0][1] == ("2025-01-01T12:00:00",)
+        assert "WHERE seq > ?" in call_args[0][0]
+        assert call_args[0][1] == (7, 50)
 
     @pytest.mark.asyncio
     async def test_get_new_messages_without_since(self, mock_db):
-        """Test get_new_messages without since parameter (lines 151-158)."""
+        """Test get_new_messages without since parameter."""
         repo = MessageRepository(mock_db, cache_size=100)
 
         mock_db.fetchall.return_value = [
@@ -426,5 +427,5 @@ class TestMessageRepositoryExtended:
         assert messages[1].is_from_me is True
         mock_db.fetchall.assert_called_once()
         call_args = mock_db.fetchall.call_args
-        assert "WHERE timestamp > ?" not in call_args[0][0]
-        assert "ORDER BY timestamp ASC" in call_args[0][0]
+        assert "ORDER BY seq ASC" in call_args[0][0]
+        assert call_args[0][1] == (0, -1)
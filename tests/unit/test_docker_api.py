@@ -0,0 +1,432 @@
+"""Unit tests for the Docker Engine API client, against a fake daemon."""
+
+import asyncio
+import json
+import shutil
+import struct
+import tempfile
+import uuid
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+
+from nanogridbot.core import docker_api
+from nanogridbot.core.container_runner import OUTPUT_END_MARKER, OUTPUT_START_MARKER
+from nanogridbot.core.docker_api import (
+    DockerAPIError,
+    DockerClient,
+    container_spec_from_args,
+    get_docker_client,
+)
+
+
+class FakeContainer:
+    """Container state kept by the fake daemon."""
+
+    def __init__(self, name, spec):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.spec = spec
+        self.status = "created"
+        self.exit_code = None
+        self.exited = asyncio.Event()
+        self.stream = None
+
+    def frame(self, stream, data: bytes) -> None:
+        """Write a multiplexed frame to the attached client."""
+        if self.stream is not None:
+            self.stream.write(bytes([stream, 0, 0, 0]) + struct.pack(">I", len(data)) + data)
+
+    def exit(self, code: int) -> None:
+        """Stop the container and end its attach stream."""
+        if self.exited.is_set():
+            return
+        self.status = "exited"
+        self.exit_code = code
+        self.exited.set()
+        if self.stream is not None:
+            self.stream.close()
+
+
+class FakeDaemon:
+    """Answers a subset of the Engine API on a unix socket.
+
+    The containers behave like the agent runner: once their stdin closes they
+    log to stderr, echo the prompt from their input as a marker-delimited
+    result on stdout and exit.
+    """
+
+    def __init__(self):
+        self.containers: dict[str, FakeContainer] = {}
+        self.requests: list[tuple[str, str, dict]] = []
+        self.connections = 0
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    async def start(self, path: str) -> None:
+        self.server = await asyncio.start_unix_server(self._handle, path)
+
+    async def stop(self) -> None:
+        self.drop_connections()
+        self.server.close()
+        await self.server.wait_closed()
+
+    def drop_connections(self) -> None:
+        """Close every open connection, like a daemon idle timeout."""
+        for writer in list(self._writers):
+            writer.close()
+
+    def find(self, ref: str) -> FakeContainer | None:
+        for container in self.containers.values():
+            if ref in (container.id, container.name):
+                return container
+        return None
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                method, target, _ = line.decode().split(" ")
+                headers = {}
+                while (header := await reader.readline()) not in (b"\r\n", b""):
+                    key, _, value = header.decode().partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                url = urlsplit(target)
+                query = dict(parse_qsl(url.query))
+                self.requests.append((method, url.path, query))
+
+                parts = url.path.strip("/").split("/")
+                if parts[-1] == "attach":
+                    await self._attach(self.find(parts[1]), reader, writer)
+                    return
+                if parts[-1] == "wait":
+                    await self._wait(self.find(parts[1]), writer)
+                    continue
+                status, payload = self._route(method, parts, query, body)
+                self._respond(writer, status, payload)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    @staticmethod
+    def _respond(writer, status, payload) -> None:
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        if status == 204:
+            data = b""
+        writer.write(
+            f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n\r\n".encode()
+            + data
+        )
+
+    def _route(self, method, parts, query, body):
+        if parts == ["_ping"]:
+            return 200, b"OK"
+        if parts == ["containers", "create"]:
+            name = query.get("name")
+            if name and self.find(name):
+                return 409, {"message": f'Conflict. The container name "/{name}" is already in use'}
+            container = FakeContainer(name, json.loads(body))
+            self.containers[container.id] = container
+            return 201, {"Id": container.id, "Warnings": []}
+
+        container = self.find(parts[1])
+        if container is None:
+            return 404, {"message": f"No such container: {parts[1]}"}
+        action = parts[2] if len(parts) > 2 else None
+
+        if method == "DELETE":
+            if container.status == "running" and query.get("force") != "1":
+                return 409, {"message": "container is running"}
+            container.exit(137)
+            self.containers.pop(container.id, None)
+            return 204, None
+        if action == "json":
+            return 200, {"Id": container.id, "State": {"Status": container.status}}
+        if action == "start":
+            if container.status == "running":
+                return 304, None
+            container.status = "running"
+            return 204, None
+        if action in ("pause", "unpause"):
+            if container.status not in ("running", "paused"):
+                return 409, {"message": "container is not running"}
+            container.status = "paused" if action == "pause" else "running"
+            return 204, None
+        if action == "kill":
+            self._finish(container, 137)
+            return 204, None
+        if action == "stop":
+            self._finish(container, 143)
+            return 204, None
+        return 404, {"message": "page not found"}
+
+    async def _attach(self, container, reader, writer) -> None:
+        writer.write(b"HTTP/1.1 101 UPGRADED\r\nConnection: Upgrade\r\nUpgrade: tcp\r\n\r\n")
+        container.stream = writer
+        stdin = await reader.read()
+        if container.exited.is_set():
+            return
+        prompt = json.loads(stdin)["prompt"] if stdin else ""
+        container.frame(2, b"[agent-runner] working\n")
+        result = json.dumps({"status": "success", "result": prompt})
+        container.frame(1, f"{OUTPUT_START_MARKER}\n{result}\n{OUTPUT_END_MARKER}\n".encode())
+        self._finish(container, 0)
+
+    def _finish(self, container, code) -> None:
+        container.exit(code)
+        if container.spec.get("HostConfig", {}).get("AutoRemove"):
+            self.containers.pop(container.id, None)
+
+    async def _wait(self, container, writer) -> None:
+        if container is None:
+            self._respond(writer, 404, {"message": "No such container"})
+            return
+        await container.exited.wait()
+        # Chunked, like the real daemon's streaming wait response
+        data = json.dumps({"StatusCode": container.exit_code}).encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nTransfer-Encoding: chunked\r\n\r\n"
+            + f"{len(data):x}\r\n".encode()
+            + data
+            + b"\r\n0\r\n\r\n"
+        )
+
+
+@pytest.fixture
+async def daemon():
+    """Start a fake daemon on a short socket path."""
+    directory = tempfile.mkdtemp(prefix="ngb-docker-", dir="/tmp")
+    daemon = FakeDaemon()
+    daemon.socket_path = str(Path(directory) / "docker.sock")
+    await daemon.start(daemon.socket_path)
+    yield daemon
+    await daemon.stop()
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+async def client(daemon):
+    """Create a client for the fake daemon."""
+    client = DockerClient(daemon.socket_path)
+    yield client
+    await client.close()
+
+
+RUN_ARGS = ["-i", "--rm", "--network=none", "--name", "ngb-test", "--memory", "2g", "--cpus", "1.0", "img:latest"]
+
+
+class TestRequests:
+    """Test plain API requests."""
+
+    @pytest.mark.asyncio
+    async def test_ping(self, client):
+        """Test the daemon is reachable."""
+        assert await client.ping() is True
+
+    @pytest.mark.asyncio
+    async def test_ping_without_daemon(self):
+        """Test a missing socket reports the daemon unreachable."""
+        assert await DockerClient("/tmp/ngb-no-such-docker.sock").ping() is False
+
+    @pytest.mark.asyncio
+    async def test_requests_reuse_connection(self, client, daemon):
+        """Test consecutive requests share one keep-alive connection."""
+        container_id = await client.create_container({"Image": "img"}, name="c1")
+        await client.start(container_id)
+        await client.pause("c1")
+        assert (await client.inspect("c1"))["State"]["Status"] == "paused"
+        await client.unpause("c1")
+        await client.remove("c1")
+
+        assert client.connections_opened == 1
+        assert daemon.connections == 1
+        assert daemon.find("c1") is None
+
+    @pytest.mark.asyncio
+    async def test_closed_pooled_connection_is_replaced(self, client, daemon):
+        """Test a request is resent when the daemon dropped the idle connection."""
+        assert await client.ping()
+        daemon.drop_connections()
+        await asyncio.sleep(0.01)
+
+        await client.create_container({"Image": "img"}, name="c1")
+
+        assert client.connections_opened == 2
+        assert [r for r in daemon.requests if r[1] == "/containers/create"] == [
+            ("POST", "/containers/create", {"name": "c1"})
+        ]
+
+    @pytest.mark.asyncio
+    async def test_error_status(self, client):
+        """Test error responses raise with the daemon's message."""
+        with pytest.raises(DockerAPIError) as exc_info:
+            await client.inspect("missing")
+        assert exc_info.value.status == 404
+        assert "No such container" in exc_info.value.message
+
+        await client.create_container({"Image": "img"}, name="dup")
+        with pytest.raises(DockerAPIError) as exc_info:
+            await client.create_container({"Image": "img"}, name="dup")
+        assert exc_info.value.status == 409
+
+
+class TestRun:
+    """Test running attached containers."""
+
+    @pytest.mark.asyncio
+    async def test_run_and_communicate(self, client, daemon):
+        """Test input goes to stdin and output is demultiplexed."""
+        name, spec = container_spec_from_args(RUN_ARGS)
+        process = await client.run(spec, name=name)
+
+        stdout, stderr = await process.communicate(json.dumps({"prompt": "hello"}).encode())
+
+        assert OUTPUT_START_MARKER in stdout.decode()
+        assert '"result": "hello"' in stdout.decode()
+        assert stderr == b"[agent-runner] working\n"
+        assert process.returncode == 0
+        # Auto-removed after exit
+        assert daemon.find("ngb-test") is None
+        # The wait is registered before the container starts
+        actions = [path.rsplit("/", 1)[-1] for _, path, _ in daemon.requests]
+        assert actions == ["create", "attach", "wait", "start"]
+
+    @pytest.mark.asyncio
+    async def test_kill(self, client, daemon):
+        """Test killing a running container ends its streams."""
+        name, spec = container_spec_from_args(RUN_ARGS)
+        process = await client.run(spec, name=name)
+
+        process.kill()
+
+        assert await asyncio.wait_for(process.wait(), timeout=2) == 137
+        assert await process.stdout.read() == b""
+
+    @pytest.mark.asyncio
+    async def test_failed_start_removes_container(self, client, daemon):
+        """Test a container is removed when it cannot be attached."""
+        with patch.object(client, "attach", side_effect=DockerAPIError(500, "boom")):
+            with pytest.raises(DockerAPIError):
+                await client.run({"Image": "img"}, name="broken")
+
+        assert daemon.find("broken") is None
+
+
+class TestContainerSpec:
+    """Test translating docker run arguments."""
+
+    def test_run_command(self):
+        """Test the options used for agent containers."""
+        name, spec = container_spec_from_args(
+            [
+                "-i", "--rm", "--network=none", "--name", "ngb-1",
+                "-v", "/host/g:/workspace/group:rw",
+                "-e", "TZ=UTC",
+                "--stop-timeout", "300", "--memory", "2g", "--cpus", "1.5",
+                "img:latest",
+            ]
+        )
+
+        assert name == "ngb-1"
+        assert spec["Image"] == "img:latest"
+        assert spec["OpenStdin"] is spec["StdinOnce"] is spec["AttachStdin"] is True
+        assert spec["Env"] == ["TZ=UTC"]
+        assert spec["StopTimeout"] == 300
+        host = spec["HostConfig"]
+        assert host["Binds"] == ["/host/g:/workspace/group:rw"]
+        assert host["AutoRemove"] is True
+        assert host["NetworkMode"] == "none"
+        assert host["Memory"] == 2 * 1024**3
+        assert host["NanoCpus"] == 1_500_000_000
+
+    def test_bind_mount_option(self):
+        """Test --mount with bind propagation, as used by the warm pool."""
+        _, spec = container_spec_from_args(
+            ["--mount", "type=bind,source=/pool/w,target=/workspace,bind-propagation=rslave", "img"]
+        )
+
+        assert spec["HostConfig"]["Mounts"] == [
+            {
+                "Type": "bind",
+                "Source": "/pool/w",
+                "Target": "/workspace",
+                "ReadOnly": False,
+                "BindOptions": {"Propagation": "rslave"},
+            }
+        ]
+        assert spec["OpenStdin"] is False
+
+    def test_unsupported_option(self):
+        """Test unknown options are rejected so the CLI can run them."""
+        with pytest.raises(ValueError):
+            container_spec_from_args(["--privileged", "img"])
+        with pytest.raises(ValueError):
+            container_spec_from_args(["--rm"])
+
+
+class TestRuntimeSelection:
+    """Test choosing between the Engine API and the docker CLI."""
+
+    @pytest.fixture(autouse=True)
+    async def reset_client(self):
+        yield
+        await docker_api.close_docker_client()
+
+    def _config(self, socket_path, enabled=True):
+        return MagicMock(docker_api_enabled=enabled, docker_socket=socket_path)
+
+    @pytest.mark.asyncio
+    async def test_client_when_socket_exists(self, daemon):
+        """Test the shared client is used when the socket exists."""
+        with patch("nanogridbot.core.docker_api.get_config", return_value=self._config(daemon.socket_path)):
+            first = get_docker_client()
+            assert first is not None
+            assert get_docker_client() is first
+
+    @pytest.mark.asyncio
+    async def test_cli_fallback(self, daemon):
+        """Test no client when disabled or the socket is missing."""
+        with patch("nanogridbot.core.docker_api.get_config", return_value=self._config(daemon.socket_path, False)):
+            assert get_docker_client() is None
+        with patch("nanogridbot.core.docker_api.get_config", return_value=self._config("/tmp/ngb-missing.sock")):
+            assert get_docker_client() is None
+
+    @pytest.mark.asyncio
+    async def test_runner_uses_api(self, client, daemon, tmp_path):
+        """Test container runner operations go through the API."""
+        from nanogridbot.core import container_runner
+
+        with patch("nanogridbot.core.docker_api.get_docker_client", return_value=client), patch(
+            "nanogridbot.core.container_runner.get_docker_client", return_value=client
+        ), patch("nanogridbot.core.container_runner.get_config") as mock_cfg, patch(
+            "asyncio.create_subprocess_exec"
+        ) as mock_exec:
+            mock_cfg.return_value = MagicMock(
+                container_timeout=5, container_max_output_size=100000, data_dir=tmp_path
+            )
+            result = await container_runner._execute_container(
+                ["docker", "run", *RUN_ARGS], {"prompt": "via api"}
+            )
+            assert await container_runner.check_docker_available() is True
+            assert await container_runner.get_container_status("ngb-test") == "not_found"
+
+            await client.create_container({"Image": "img"}, name="leftover")
+            await client.start("leftover")
+            assert await container_runner.get_container_status("leftover") == "running"
+            assert await container_runner.stop_container("leftover") is True
+            await container_runner.cleanup_container("leftover")
+            await container_runner.cleanup_container("leftover")
+
+        assert result.status == "success"
+        assert result.result == "via api"
+        assert daemon.find("leftover") is None
+        mock_exec.assert_not_called()
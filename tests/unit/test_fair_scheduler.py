@@ -0,0 +1,163 @@
+"""Unit tests for the fair-share group scheduler."""
+
+import asyncio
+
+import pytest
+
+from nanogridbot.core.fair_scheduler import PRIORITY_MESSAGE, PRIORITY_TASK, FairScheduler
+
+
+def drain(scheduler: FairScheduler) -> list[str]:
+    """Pop every runnable group in scheduling order."""
+    order = []
+    while (entry := scheduler.get_nowait()) is not None:
+        order.append(entry.jid)
+    return order
+
+
+class TestMembership:
+    """Test pushing and removing groups."""
+
+    def test_push_is_idempotent(self):
+        """Test a group is queued at most once."""
+        scheduler = FairScheduler()
+
+        assert scheduler.push("g1", 1) is True
+        assert scheduler.push("g1", 1) is False
+        assert len(scheduler) == 1
+        assert "g1" in scheduler
+
+    def test_remove(self):
+        """Test removing a runnable group."""
+        scheduler = FairScheduler()
+        scheduler.push("g1", 1)
+        scheduler.push("g2", 1)
+
+        assert scheduler.remove("g1") is True
+        assert scheduler.remove("g1") is False
+        assert drain(scheduler) == ["g2"]
+
+    def test_promote_keeps_enqueue_time(self):
+        """Test promotion to the task class keeps the original wait start."""
+        scheduler = FairScheduler()
+        scheduler.push("g1", 1, PRIORITY_MESSAGE)
+        since = scheduler.waiting_since("g1")
+
+        scheduler.push("g1", 1, PRIORITY_TASK)
+
+        assert scheduler.priority_of("g1") == PRIORITY_TASK
+        assert scheduler.waiting_since("g1") == since
+
+    def test_no_demotion(self):
+        """Test a task-class group is not moved back to the message class."""
+        scheduler = FairScheduler()
+        scheduler.push("g1", 1, PRIORITY_TASK)
+        scheduler.push("g1", 1, PRIORITY_MESSAGE)
+
+        assert scheduler.priority_of("g1") == PRIORITY_TASK
+
+
+class TestOrdering:
+    """Test scheduling order."""
+
+    def test_tasks_before_messages(self):
+        """Test the task class is always served first."""
+        scheduler = FairScheduler()
+        scheduler.push("m1", 1, PRIORITY_MESSAGE)
+        scheduler.push("t1", 2, PRIORITY_TASK)
+        scheduler.push("m2", 2, PRIORITY_MESSAGE)
+
+        assert drain(scheduler)[0] == "t1"
+
+    def test_round_robin_across_owners(self):
+        """Test owners alternate regardless of how many groups each has."""
+        scheduler = FairScheduler()
+        for i in range(4):
+            scheduler.push(f"a{i}", 1)
+        scheduler.push("b0", 2)
+        scheduler.push("b1", 2)
+
+        assert drain(scheduler) == ["a0", "b0", "a1", "b1", "a2", "a3"]
+
+    def test_fifo_within_owner(self):
+        """Test an owner's groups are served in arrival order."""
+        scheduler = FairScheduler()
+        scheduler.push("a0", 1)
+        scheduler.push("a1", 1)
+        scheduler.push("a2", 1)
+
+        assert drain(scheduler) == ["a0", "a1", "a2"]
+
+    def test_long_runs_cost_turns(self):
+        """Test an owner charged for long runs yields to the other owner."""
+        scheduler = FairScheduler(quantum=1.0)
+        scheduler.push("a0", 1)
+        scheduler.push("b0", 2)
+        drain(scheduler)
+
+        # Owner 1 ran for 5s, owner 2 for 1s
+        scheduler.charge(1, 5.0)
+        scheduler.charge(2, 1.0)
+        for i in range(1, 4):
+            scheduler.push(f"a{i}", 1)
+            scheduler.push(f"b{i}", 2)
+
+        order = drain(scheduler)
+        assert order[:3] == ["b1", "b2", "b3"]
+        assert order[3:] == ["a1", "a2", "a3"]
+
+    def test_idle_owner_keeps_debt(self):
+        """Test going idle does not wipe an owner's debt."""
+        scheduler = FairScheduler()
+        scheduler.push("a0", 1)
+        drain(scheduler)
+        scheduler.charge(1, 10.0)
+
+        assert scheduler.deficit(1) < 0
+
+
+class TestWaiting:
+    """Test blocking get and wake-ups."""
+
+    @pytest.mark.asyncio
+    async def test_get_wakes_on_push(self):
+        """Test a blocked worker is woken by a push."""
+        scheduler = FairScheduler()
+        getter = asyncio.create_task(scheduler.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+
+        scheduler.push("g1", None)
+        entry = await asyncio.wait_for(getter, timeout=1)
+
+        assert entry.jid == "g1"
+        assert entry.owner is None
+
+    @pytest.mark.asyncio
+    async def test_every_push_wakes_a_worker(self):
+        """Test several blocked workers all get woken."""
+        scheduler = FairScheduler()
+        getters = [asyncio.create_task(scheduler.get()) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        for i in range(3):
+            scheduler.push(f"g{i}", i)
+        entries = await asyncio.wait_for(asyncio.gather(*getters), timeout=1)
+
+        assert sorted(e.jid for e in entries) == ["g0", "g1", "g2"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_passes_wake_up_on(self):
+        """Test a wake-up delivered to a cancelled worker is not lost."""
+        scheduler = FairScheduler()
+        first = asyncio.create_task(scheduler.get())
+        second = asyncio.create_task(scheduler.get())
+        await asyncio.sleep(0)
+
+        scheduler.push("g1", 1)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        entry = await asyncio.wait_for(second, timeout=1)
+        assert entry.jid == "g1"
@@ -0,0 +1,144 @@
+"""Unit tests for the container launch plan cache."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from nanogridbot.core import container_runner
+from nanogridbot.core.launch_plan import LaunchPlan, LaunchPlanCache, stamp_paths
+from nanogridbot.types import ContainerConfig
+
+
+@pytest.fixture
+def cache(mock_config):
+    """Install a launch plan cache over a temporary project."""
+    (mock_config.groups_dir / "g1").mkdir(parents=True)
+    cache = LaunchPlanCache()
+    with patch("nanogridbot.config.get_config", return_value=mock_config), patch(
+        "nanogridbot.core.container_runner.get_config", return_value=mock_config
+    ), patch.object(container_runner, "_launch_plans", cache):
+        yield cache
+
+
+async def _prepare(**kwargs):
+    return await container_runner.prepare_launch("g1", is_main=True, **kwargs)
+
+
+class TestLaunchPlan:
+    """Test LaunchPlan."""
+
+    def test_command_for_inserts_name(self):
+        """Test a container name goes right after the fixed run flags."""
+        plan = LaunchPlan(
+            group_folder="g1",
+            mounts=[],
+            env_mount=None,
+            command=["docker", "run", "-i", "--rm", "--network=none", "img"],
+        )
+
+        assert plan.command_for() == plan.command
+        assert plan.command_for("c1") == [
+            "docker", "run", "-i", "--rm", "--network=none", "--name", "c1", "img"
+        ]
+        assert plan.command == ["docker", "run", "-i", "--rm", "--network=none", "img"]
+
+    def test_is_current(self, tmp_path):
+        """Test identity-only paths ignore content changes but not replacement."""
+        watched = tmp_path / "dir"
+        watched.mkdir()
+        config_file = tmp_path / "config.json"
+        config_file.write_text("{}")
+        plan = LaunchPlan("g1", [], None, [])
+        plan.stamps = stamp_paths([(watched, False), (config_file, True), (tmp_path / "new", False)])
+        assert plan.is_current()
+
+        (watched / "file").write_text("changed contents")
+        assert plan.is_current()
+
+        config_file.write_text('{"changed": true}')
+        assert not plan.is_current()
+
+
+class TestLaunchPlanCache:
+    """Test preparing launches through the cache."""
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_validation(self, cache):
+        """Test an unchanged group is served without validating mounts again."""
+        first = await _prepare()
+        with patch.object(
+            container_runner, "validate_group_mounts", side_effect=AssertionError
+        ), patch("nanogridbot.core.mount_security.create_group_env_file", side_effect=AssertionError):
+            second = await _prepare()
+
+        assert second is first
+        assert cache.get_stats()["hits"] == 1
+        assert any(target == "/workspace/group" for _, target, _ in first.mounts)
+
+    @pytest.mark.asyncio
+    async def test_config_change_is_a_different_plan(self, cache):
+        """Test container config, env and user are part of the key."""
+        base = await _prepare()
+
+        assert await _prepare(env={"TZ": "UTC"}) is not base
+        assert await _prepare(container_config=ContainerConfig(timeout=60)) is not base
+        assert await _prepare(user_id=7) is not base
+        assert len(cache) == 4
+
+    @pytest.mark.asyncio
+    async def test_env_file_change_invalidates(self, cache, mock_config):
+        """Test editing .env rebuilds the plan with the new env file."""
+        first = await _prepare()
+        assert first.env_mount is None
+
+        env_path = mock_config.base_dir / ".env"
+        env_path.write_text("ANTHROPIC_API_KEY=sk-test\n")
+        second = await _prepare()
+
+        assert second is not first
+        assert second.env_mount is not None
+        assert cache.invalidations == 1
+
+    @pytest.mark.asyncio
+    async def test_new_optional_mount_invalidates(self, cache, mock_config):
+        """Test a directory that appears later is picked up."""
+        first = await _prepare()
+        (mock_config.groups_dir / "global").mkdir()
+
+        second = await _prepare()
+
+        assert second is not first
+        assert any(target == "/workspace/global" for _, target, _ in second.mounts)
+
+    @pytest.mark.asyncio
+    async def test_replaced_mount_invalidates(self, cache, mock_config):
+        """Test a mount source swapped for another directory is revalidated."""
+        first = await _prepare()
+        group_dir = mock_config.groups_dir / "g1"
+        os.rename(group_dir, mock_config.groups_dir / "old")
+        group_dir.mkdir()
+
+        assert await _prepare() is not first
+
+    @pytest.mark.asyncio
+    async def test_invalidate_group(self, cache):
+        """Test dropping one group's plans."""
+        await _prepare()
+        await _prepare(env={"TZ": "UTC"})
+
+        assert cache.invalidate("other") == 0
+        assert cache.invalidate("g1") == 2
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_lru_bound(self, cache):
+        """Test the least recently used plan is dropped past the limit."""
+        cache.max_entries = 2
+        first = await _prepare(env={"N": "1"})
+        await _prepare(env={"N": "2"})
+        await _prepare(env={"N": "1"})
+        await _prepare(env={"N": "3"})
+
+        assert len(cache) == 2
+        assert await _prepare(env={"N": "1"}) is first
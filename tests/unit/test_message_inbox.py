@@ -0,0 +1,64 @@
+"""Unit tests for MessageInbox."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from nanogridbot.core.message_inbox import MessageInbox
+from nanogridbot.types import Message
+
+
+def _msg(msg_id: str, jid: str) -> Message:
+    return Message(
+        id=msg_id, chat_jid=jid, sender="u1", content=f"msg {msg_id}", timestamp=datetime.now()
+    )
+
+
+class TestMessageInbox:
+    """Test per-chat batching in MessageInbox."""
+
+    @pytest.mark.asyncio
+    async def test_batches_messages_per_chat(self):
+        inbox = MessageInbox()
+        inbox.put(_msg("1", "jid1"))
+        inbox.put(_msg("2", "jid2"))
+        inbox.put(_msg("3", "jid1"))
+
+        assert len(inbox) == 2
+        assert inbox.pending_count() == 3
+        assert inbox.pending_count("jid1") == 2
+
+        jid, messages = await inbox.get()
+        assert jid == "jid1"
+        assert [m.id for m in messages] == ["1", "3"]
+
+        jid, messages = await inbox.get()
+        assert jid == "jid2"
+        assert [m.id for m in messages] == ["2"]
+        assert len(inbox) == 0
+
+    @pytest.mark.asyncio
+    async def test_get_waits_for_push(self):
+        inbox = MessageInbox()
+        getter = asyncio.create_task(inbox.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+
+        inbox.put(_msg("1", "jid1"))
+        jid, messages = await asyncio.wait_for(getter, timeout=1)
+
+        assert jid == "jid1"
+        assert len(messages) == 1
+
+    @pytest.mark.asyncio
+    async def test_chat_requeued_after_get(self):
+        inbox = MessageInbox()
+        inbox.put(_msg("1", "jid1"))
+        await inbox.get()
+
+        inbox.put(_msg("2", "jid1"))
+        jid, messages = await asyncio.wait_for(inbox.get(), timeout=1)
+
+        assert jid == "jid1"
+        assert [m.id for m in messages] == ["2"]
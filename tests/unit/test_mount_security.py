@@ -308,3 +308,58 @@ class TestSyncGroupSkills:
         # Check files were copied
         assert (result / "test-skill" / "README.md").exists()
         assert (result / "test-skill" / "skill.md").exists()
+
+    def test_sync_group_skills_copies_only_changes(self, tmp_path, monkeypatch):
+        """Test a second sync leaves unchanged files alone."""
+        from nanogridbot.config import Config
+        config = Config(
+            base_dir=tmp_path,
+            data_dir=tmp_path / "data",
+            groups_dir=tmp_path / "groups",
+            store_dir=tmp_path / "store",
+        )
+        monkeypatch.setattr("nanogridbot.config.get_config", lambda: config)
+
+        skills_src = tmp_path / "container" / "skills" / "test-skill"
+        skills_src.mkdir(parents=True)
+        (skills_src / "README.md").write_text("# Test Skill")
+
+        from nanogridbot.core.mount_security import sync_group_skills
+        from nanogridbot.core.skills_store import get_skills_store
+
+        sync_group_skills("test-group")
+        sync_group_skills("test-group")
+        sync_group_skills("test-group", user_id=7)
+
+        assert get_skills_store().files_copied == 2
+
+
+class TestSharedSkillsMount:
+    """Tests for mounting a shared skills snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_shared_snapshot_mounted_read_only(self, tmp_path, monkeypatch):
+        """Test groups get the snapshot mount instead of a per-group copy."""
+        from nanogridbot.config import Config
+        config = Config(
+            base_dir=tmp_path,
+            data_dir=tmp_path / "data",
+            groups_dir=tmp_path / "groups",
+            store_dir=tmp_path / "store",
+            skills_shared_mount=True,
+        )
+        monkeypatch.setattr("nanogridbot.config.get_config", lambda: config)
+        (tmp_path / "groups" / "g1").mkdir(parents=True)
+        skills_src = tmp_path / "container" / "skills" / "test-skill"
+        skills_src.mkdir(parents=True)
+        (skills_src / "README.md").write_text("# Test Skill")
+
+        from nanogridbot.core.mount_security import validate_group_mounts
+        mounts = await validate_group_mounts("g1", is_main=True)
+
+        skills_mounts = [m for m in mounts if m[1] == "/home/node/.claude/skills"]
+        assert len(skills_mounts) == 1
+        host_path, _, mode = skills_mounts[0]
+        assert mode == "ro"
+        assert (Path(host_path) / "test-skill" / "README.md").read_text() == "# Test Skill"
+        assert not (tmp_path / "data" / "sessions" / "g1" / ".claude" / "skills").exists()
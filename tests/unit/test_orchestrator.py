@@ -15,6 +15,13 @@ def mock_config():
     """Mock configuration."""
     config = MagicMock()
     config.poll_interval = 1000
+    config.batch_size = 100
+    config.max_concurrent_dispatches = 4
+    config.container_warm_pool_enabled = False
+    config.container_session_enabled = False
+    config.container_launch_cache_enabled = False
+    config.container_admission_enabled = False
+    config.container_resource_sampling_enabled = False
     config.assistant_name = "TestBot"
     config.data_dir = MagicMock()
     return config
@@ -99,9 +106,9 @@ class TestStateManagement:
         """Test loading empty state."""
         await orchestrator._load_state()
 
-        assert orchestrator.last_timestamp is None
+        assert orchestrator.last_seq == 0
         assert orchestrator.sessions == {}
-        assert orchestrator.last_agent_timestamp == {}
+        assert orchestrator.last_agent_seq == {}
         assert orchestrator.registered_groups == {}
 
     @pytest.mark.asyncio
@@ -109,9 +116,9 @@ class TestStateManagement:
         """Test loading state with data."""
         mock_db.get_router_state = AsyncMock(
             return_value={
-                "last_timestamp": "2024-01-01T00:00:00",
+                "last_seq": 42,
                 "sessions": {"jid1": "session1"},
-                "last_agent_timestamp": {"jid1": "2024-01-01T00:00:00"},
+                "last_agent_seq": {"jid1": 40},
             }
         )
 
@@ -125,26 +132,45 @@ class TestStateManagement:
 
         await orchestrator._load_state()
 
-        assert orchestrator.last_timestamp == "2024-01-01T00:00:00"
+        assert orchestrator.last_seq == 42
         assert orchestrator.sessions == {"jid1": "session1"}
-        assert orchestrator.last_agent_timestamp == {"jid1": "2024-01-01T00:00:00"}
+        assert orchestrator.last_agent_seq == {"jid1": 40}
+        # The group queue shares the agent cursors
+        assert orchestrator.queue.agent_cursors is orchestrator.last_agent_seq
         assert len(orchestrator.registered_groups) == 1
         assert orchestrator.registered_groups["jid1"] == group
 
+    @pytest.mark.asyncio
+    async def test_load_state_migrates_timestamp_cursors(self, orchestrator, mock_db):
+        """Test legacy timestamp cursors are translated to sequence cursors."""
+        mock_db.get_router_state = AsyncMock(
+            return_value={
+                "last_timestamp": "2024-01-01T00:00:00",
+                "sessions": {},
+                "last_agent_timestamp": {"jid1": "2023-12-31T00:00:00"},
+            }
+        )
+        mock_db.get_message_seq_at = AsyncMock(side_effect=lambda ts, jid=None: 7 if jid else 9)
+
+        await orchestrator._load_state()
+
+        assert orchestrator.last_seq == 9
+        assert orchestrator.last_agent_seq == {"jid1": 7}
+
     @pytest.mark.asyncio
     async def test_save_state(self, orchestrator, mock_db):
         """Test saving state."""
-        orchestrator.last_timestamp = "2024-01-01T00:00:00"
+        orchestrator.last_seq = 42
         orchestrator.sessions = {"jid1": "session1"}
-        orchestrator.last_agent_timestamp = {"jid1": "2024-01-01T00:00:00"}
+        orchestrator.last_agent_seq["jid1"] = 40
 
         await orchestrator._save_state()
 
         mock_db.save_router_state.assert_called_once_with(
             {
-                "last_timestamp": "2024-01-01T00:00:00",
+                "last_seq": 42,
                 "sessions": {"jid1": "session1"},
-                "last_agent_timestamp": {"jid1": "2024-01-01T00:00:00"},
+                "last_agent_seq": {"jid1": 40},
             }
         )
 
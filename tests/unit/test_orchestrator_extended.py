@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from nanogridbot.channels.events import EventType, MessageEvent
 from nanogridbot.core.orchestrator import Orchestrator
 from nanogridbot.types import Message, RegisteredGroup
 
@@ -16,6 +17,14 @@ def mock_config():
     """Mock configuration."""
     config = MagicMock()
     config.poll_interval = 100  # 100ms for fast tests
+    config.batch_size = 100
+    config.max_concurrent_dispatches = 2
+    config.container_warm_pool_enabled = False
+    config.container_session_enabled = False
+    config.container_launch_cache_enabled = False
+    config.container_admission_enabled = False
+    config.container_resource_sampling_enabled = False
+    config.container_max_concurrent_containers = 2
     config.assistant_name = "TestBot"
     config.data_dir = MagicMock()
     return config
@@ -43,6 +52,8 @@ def mock_channel():
     channel.disconnect = AsyncMock()
     channel.owns_jid = MagicMock(return_value=True)
     channel.send_message = AsyncMock()
+    channel.on = MagicMock()
+    channel.off = MagicMock()
     channel._connected = False
     return channel
 
@@ -70,9 +81,16 @@ class TestOrchestratorStart:
             mock_db.get_router_state.assert_called_once()
             mock_db.get_groups.assert_called_once()
             mock_channel.connect.assert_called_once()
+            mock_channel.on.assert_called_once_with(
+                EventType.MESSAGE_RECEIVED, orchestrator._on_channel_message
+            )
             assert orchestrator._startup_complete is True
             assert orchestrator._health_status["healthy"] is True
 
+        await orchestrator.stop()
+        mock_channel.off.assert_called_once()
+        assert orchestrator._dispatch_task is None
+
 
 class TestOrchestratorStop:
     """Test orchestrator stop sequence."""
@@ -221,7 +239,7 @@ class TestMessageLoop:
 
         call_count = 0
 
-        async def get_messages_once(ts):
+        async def get_messages_once(last_seq, limit):
             nonlocal call_count
             call_count += 1
             if call_count == 1:
@@ -239,19 +257,19 @@ class TestMessageLoop:
 
     @pytest.mark.asyncio
     async def test_message_loop_updates_timestamp(self, orchestrator, mock_db):
-        """Test message loop updates last_timestamp."""
-        ts = datetime(2025, 1, 15, 10, 0, 0)
+        """Test message loop advances the sequence cursor."""
         msg = Message(
             id="1",
             chat_jid="jid1",
             sender="user1",
             content="hello",
-            timestamp=ts,
+            timestamp=datetime(2025, 1, 15, 10, 0, 0),
+            seq=5,
         )
 
         call_count = 0
 
-        async def get_messages_once(last_ts):
+        async def get_messages_once(last_seq, limit):
             nonlocal call_count
             call_count += 1
             if call_count == 1:
@@ -265,14 +283,16 @@ class TestMessageLoop:
         with patch.object(orchestrator, "_process_group_messages", AsyncMock()):
             await orchestrator._message_loop()
 
-        assert orchestrator.last_timestamp == ts.isoformat()
+        assert orchestrator.last_seq == 5
+        mock_db.get_new_messages.assert_any_call(0, 100)
+        mock_db.save_router_state.assert_called()
 
     @pytest.mark.asyncio
     async def test_message_loop_handles_error(self, orchestrator, mock_db):
         """Test message loop continues after error."""
         call_count = 0
 
-        async def error_then_stop(ts):
+        async def error_then_stop(last_seq, limit):
             nonlocal call_count
             call_count += 1
             if call_count == 1:
@@ -306,7 +326,7 @@ class TestMessageLoop:
 
         call_count = 0
 
-        async def get_messages(ts):
+        async def get_messages(last_seq, limit):
             nonlocal call_count
             call_count += 1
             if call_count == 1:
@@ -317,21 +337,106 @@ class TestMessageLoop:
         mock_db.get_new_messages = AsyncMock(side_effect=get_messages)
         orchestrator._running = True
 
-        process_count = 0
+        dispatch_count = 0
 
-        async def process_and_shutdown(jid, msgs):
-            nonlocal process_count
-            process_count += 1
-            if process_count == 1:
+        async def dispatch_and_shutdown(jid, msgs):
+            nonlocal dispatch_count
+            dispatch_count += 1
+            if dispatch_count == 1:
                 orchestrator._shutdown.request_shutdown()
 
         with patch.object(
-            orchestrator, "_process_group_messages", AsyncMock(side_effect=process_and_shutdown)
+            orchestrator, "_dispatch", AsyncMock(side_effect=dispatch_and_shutdown)
         ):
             await orchestrator._message_loop()
 
-        # Only first group should be processed before shutdown detected
-        assert process_count == 1
+        # Only first group should be dispatched before shutdown detected
+        assert dispatch_count == 1
+
+
+def _batch(jid, *ids):
+    return [
+        Message(id=i, chat_jid=jid, sender="u", content=i, timestamp=datetime.now()) for i in ids
+    ]
+
+
+class TestConcurrentDispatch:
+    """Test concurrent per-chat dispatch."""
+
+    @pytest.mark.asyncio
+    async def test_slow_chat_does_not_block_others(self, orchestrator):
+        """Test a slow chat runs alongside other chats."""
+        release = asyncio.Event()
+        done: list[str] = []
+
+        async def process(jid, msgs):
+            if jid == "slow":
+                await release.wait()
+            done.append(jid)
+
+        with patch.object(orchestrator, "_process_group_messages", AsyncMock(side_effect=process)):
+            await orchestrator._dispatch("slow", _batch("slow", "1"))
+            await orchestrator._dispatch("fast", _batch("fast", "1"))
+            await asyncio.wait_for(orchestrator._chat_tasks["fast"], timeout=1)
+
+            assert done == ["fast"]
+            release.set()
+            await asyncio.wait_for(orchestrator._chat_tasks["slow"], timeout=1)
+
+        assert done == ["fast", "slow"]
+        assert orchestrator._chat_tasks == {}
+
+    @pytest.mark.asyncio
+    async def test_chat_batches_processed_in_order(self, orchestrator):
+        """Test batches for a busy chat are deferred and run in arrival order."""
+        release = asyncio.Event()
+        seen: list[list[str]] = []
+
+        async def process(jid, msgs):
+            seen.append([m.id for m in msgs])
+            await release.wait()
+
+        with patch.object(orchestrator, "_process_group_messages", AsyncMock(side_effect=process)):
+            await orchestrator._dispatch("jid1", _batch("jid1", "1"))
+            await asyncio.sleep(0)
+            await orchestrator._dispatch("jid1", _batch("jid1", "2"))
+            await orchestrator._dispatch("jid1", _batch("jid1", "3", "4"))
+
+            assert seen == [["1"]]
+            release.set()
+            await asyncio.wait_for(orchestrator._chat_tasks["jid1"], timeout=1)
+
+        assert seen == [["1"], ["2", "3", "4"]]
+
+    @pytest.mark.asyncio
+    async def test_dispatch_bounded_by_limit(self, orchestrator):
+        """Test no more than max_concurrent_dispatches chats run at once."""
+        release = asyncio.Event()
+        running = 0
+        peak = 0
+
+        async def process(jid, msgs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await release.wait()
+            running -= 1
+
+        with patch.object(orchestrator, "_process_group_messages", AsyncMock(side_effect=process)):
+            await orchestrator._dispatch("a", _batch("a", "1"))
+            await orchestrator._dispatch("b", _batch("b", "1"))
+            third = asyncio.create_task(orchestrator._dispatch("c", _batch("c", "1")))
+            await asyncio.sleep(0.01)
+
+            assert not third.done()
+            assert peak == 2
+
+            release.set()
+            await asyncio.wait_for(third, timeout=1)
+            await asyncio.gather(*orchestrator._chat_tasks.values())
+
+        assert peak == 2
+        assert orchestrator._chat_tasks == {}
 
 
 class TestProcessGroupMessages:
@@ -345,7 +450,7 @@ class TestProcessGroupMessages:
         )
         orchestrator.registered_groups["jid1"] = group
         orchestrator.sessions["jid1"] = "session123"
-        orchestrator.last_agent_timestamp["jid1"] = "2025-01-01T00:00:00"
+        orchestrator.last_agent_seq["jid1"] = 17
 
         messages = [
             Message(
@@ -360,7 +465,7 @@ class TestProcessGroupMessages:
                 jid="jid1",
                 group=group,
                 session_id="session123",
-                last_timestamp="2025-01-01T00:00:00",
+                last_seq=17,
             )
 
     @pytest.mark.asyncio
@@ -387,3 +492,62 @@ class TestProcessGroupMessages:
         with patch.object(orchestrator.queue, "enqueue_message_check", AsyncMock()) as mock_enqueue:
             await orchestrator._process_group_messages("jid1", messages)
             mock_enqueue.assert_called_once()
+
+
+class TestPushIngestion:
+    """Test push-based message ingestion."""
+
+    @pytest.mark.asyncio
+    async def test_channel_message_is_stored_and_ingested(self, orchestrator, mock_db):
+        """Test a channel event is persisted and pushed into the inbox."""
+        event = MessageEvent(
+            message_id="m1",
+            chat_jid="jid1",
+            sender="u1",
+            sender_name="User",
+            content="@TestBot hi",
+        )
+
+        await orchestrator._on_channel_message(event)
+
+        mock_db.store_message.assert_called_once()
+        stored = mock_db.store_message.call_args[0][0]
+        assert stored.id == "m1"
+        assert stored.sender_name == "User"
+        assert orchestrator.inbox.pending_count("jid1") == 1
+
+    @pytest.mark.asyncio
+    async def test_ingest_never_moves_cursor_backward(self, orchestrator):
+        """Test ingest advances the sweep cursor but never rewinds it."""
+        orchestrator.last_seq = 10
+        for seq in (12, 11):
+            orchestrator.ingest(
+                Message(
+                    id=str(seq), chat_jid="jid1", sender="u1", content="a",
+                    timestamp=datetime(2025, 1, 1), seq=seq,
+                )
+            )
+
+        assert orchestrator.last_seq == 12
+
+    @pytest.mark.asyncio
+    async def test_dispatch_loop_processes_pushed_messages(self, orchestrator):
+        """Test the dispatcher hands pushed batches to the group queue path."""
+        processed = asyncio.Event()
+
+        async def process(jid, messages):
+            assert jid == "jid1"
+            assert [m.id for m in messages] == ["1", "2"]
+            processed.set()
+
+        orchestrator._running = True
+        for i in ("1", "2"):
+            orchestrator.ingest(
+                Message(id=i, chat_jid="jid1", sender="u1", content=i, timestamp=datetime.now())
+            )
+
+        with patch.object(orchestrator, "_process_group_messages", AsyncMock(side_effect=process)):
+            task = asyncio.create_task(orchestrator._dispatch_loop())
+            await asyncio.wait_for(processed.wait(), timeout=1)
+            task.cancel()
+            await task
@@ -0,0 +1,136 @@
+"""Unit tests for incremental container output parsing."""
+
+import json
+
+from nanogridbot.core.output_stream import (
+    OUTPUT_END_MARKER,
+    OUTPUT_START_MARKER,
+    BoundedLog,
+    OutputStreamParser,
+)
+
+
+def _block(payload: dict | str) -> bytes:
+    """Wrap a payload in output markers."""
+    text = payload if isinstance(payload, str) else json.dumps(payload)
+    return f"{OUTPUT_START_MARKER}\n{text}\n{OUTPUT_END_MARKER}\n".encode()
+
+
+class TestOutputStreamParser:
+    """Test OutputStreamParser."""
+
+    def test_single_result(self):
+        """Test a result in one chunk."""
+        parser = OutputStreamParser(1000)
+        outputs = parser.feed(_block({"status": "success", "result": "hi", "newSessionId": "s1"}))
+
+        assert len(outputs) == 1
+        assert outputs[0].result == "hi"
+        assert outputs[0].new_session_id == "s1"
+        assert parser.results == 1
+
+    def test_markers_split_across_chunks(self):
+        """Test markers and payload arriving one byte at a time."""
+        parser = OutputStreamParser(1000)
+        data = b"noise before\n" + _block({"status": "success", "result": "split"})
+
+        outputs = []
+        for i in range(len(data)):
+            outputs.extend(parser.feed(data[i : i + 1]))
+
+        assert [output.result for output in outputs] == ["split"]
+
+    def test_multiple_results_in_order(self):
+        """Test each result is returned as soon as its end marker arrives."""
+        parser = OutputStreamParser(1000)
+
+        first = parser.feed(_block({"status": "success", "result": "one"}) + b"log\n")
+        second = parser.feed(_block({"status": "error", "error": "boom"}))
+
+        assert [output.result for output in first] == ["one"]
+        assert second[0].status == "error"
+        assert second[0].error == "boom"
+
+    def test_plain_text_payload(self):
+        """Test a payload that is not JSON becomes the result."""
+        parser = OutputStreamParser(1000)
+        outputs = parser.feed(_block("plain text\nover two lines"))
+
+        assert outputs[0].result == "plain text\nover two lines"
+
+    def test_finish_flushes_unterminated_result(self):
+        """Test a result cut off by the container exiting is still delivered."""
+        parser = OutputStreamParser(1000)
+        assert parser.feed(f"{OUTPUT_START_MARKER}\npartial".encode()) == []
+
+        outputs = parser.finish()
+        assert outputs[0].result == "partial"
+        assert parser.finish() == []
+
+    def test_noise_is_not_retained(self):
+        """Test output outside the markers is dropped as it arrives."""
+        parser = OutputStreamParser(1000)
+        for _ in range(100):
+            assert parser.feed(b"x" * 10000) == []
+
+        assert len(parser._carry) < len(OUTPUT_START_MARKER)
+
+    def test_oversized_result_spills_to_disk(self, tmp_path):
+        """Test a large result is truncated in memory and kept whole on disk."""
+        parser = OutputStreamParser(100, spill_dir=tmp_path)
+        payload = {"status": "success", "result": "a" * 50000, "newSessionId": "s9"}
+        data = _block(payload)
+
+        outputs = []
+        for i in range(0, len(data), 4096):
+            outputs.extend(parser.feed(data[i : i + 4096]))
+
+        assert len(outputs) == 1
+        output = outputs[0]
+        assert output.status == "success"
+        assert output.new_session_id == "s9"
+        assert output.result.startswith("aaaa")
+        assert "[Output truncated at 100 of" in output.result
+        assert len(parser._head) == 0
+
+        spilled = list(tmp_path.glob("output-*.json"))
+        assert len(spilled) == 1
+        assert str(spilled[0]) in output.result
+        assert json.loads(spilled[0].read_text()) == payload
+
+    def test_oversized_result_without_spill_dir(self):
+        """Test a large result is truncated when there is nowhere to spill."""
+        parser = OutputStreamParser(10)
+        outputs = parser.feed(_block("b" * 1000))
+
+        assert outputs[0].result.startswith("b" * 10)
+        assert "saved to" not in outputs[0].result
+
+
+class TestBoundedLog:
+    """Test BoundedLog."""
+
+    def test_short_stream_kept_whole(self):
+        """Test a stream under the limit is kept as is."""
+        log = BoundedLog(limit=100)
+        log.feed(b"hello ")
+        log.feed(b"world")
+
+        assert log
+        assert log.text() == "hello world"
+
+    def test_middle_dropped(self):
+        """Test a long stream keeps its start and end."""
+        log = BoundedLog(limit=4)
+        log.feed(b"start")
+        log.feed(b"-" * 100)
+        log.feed(b"end!")
+
+        text = log.text()
+        assert text.startswith("star")
+        assert text.endswith("end!")
+        assert "bytes omitted" in text
+
+    def test_empty(self):
+        """Test an empty log is falsy."""
+        assert not BoundedLog()
@@ -0,0 +1,174 @@
+"""Unit tests for progressive reply delivery."""
+
+import asyncio
+
+import pytest
+
+from nanogridbot.channels.base import Channel
+from nanogridbot.core.progressive_reply import EMPTY_REPLY_TEXT, ProgressiveReply
+from nanogridbot.types import ChannelType
+
+
+class FakeClock:
+    """Manual clock; sleeps wait for the test to move time on.
+
+    With ``auto`` set, a sleep moves time on by itself instead.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.auto = True
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        target = self.now + seconds
+        if self.auto:
+            self.now = target
+        while self.now < target:
+            await asyncio.sleep(0)
+
+
+class FakeChannel(Channel):
+    """Channel recording sends and edits with their (fake) times."""
+
+    def __init__(self, clock: FakeClock, interval: float = 1.0, **limits):
+        super().__init__(ChannelType.TELEGRAM)
+        self.clock = clock
+        self.interval = interval
+        self.sent: list[str] = []
+        self.edits: list[tuple[float, str]] = []
+        for key, value in limits.items():
+            setattr(self, key, value)
+
+    async def connect(self) -> None:
+        pass
+
+    async def disconnect(self) -> None:
+        pass
+
+    async def send_message(self, chat_jid: str, content: str) -> str:
+        self.sent.append(content)
+        return f"m{len(self.sent)}"
+
+    async def edit_message(self, chat_jid: str, message_id: str, content: str) -> None:
+        assert message_id == "m1"
+        self.edits.append((self.clock(), content))
+
+    def edit_interval(self, chat_jid: str) -> float:
+        return self.interval
+
+    async def receive_message(self, raw_data):
+        return None
+
+    def parse_jid(self, jid: str) -> tuple[str, str]:
+        return tuple(jid.split(":", 1))
+
+    def build_jid(self, platform_id: str, resource: str | None = None) -> str:
+        return f"telegram:{platform_id}"
+
+
+async def _settle() -> None:
+    """Let pending flush tasks run."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _reply(channel: FakeChannel, clock: FakeClock) -> ProgressiveReply:
+    return ProgressiveReply(channel, "telegram:1", "…", clock=clock, sleep=clock.sleep)
+
+
+class TestProgressiveReply:
+    """Test ProgressiveReply."""
+
+    async def test_placeholder_then_edits(self, clock):
+        """Test the placeholder is posted and replaced by the final text."""
+        channel = FakeChannel(clock)
+        reply = _reply(channel, clock)
+
+        await reply.start()
+        await reply.update("hello")
+        await _settle()
+        await reply.finish()
+
+        assert channel.sent == ["…"]
+        assert [text for _, text in channel.edits] == ["hello"]
+
+    async def test_edits_are_throttled(self, clock):
+        """Test a burst of updates collapses into edits spaced by the interval."""
+        channel = FakeChannel(clock, interval=2.0)
+        reply = _reply(channel, clock)
+        await reply.start()
+
+        clock.auto = False
+        for i in range(10):
+            await reply.update(f"part {i}")
+            clock.now += 0.5
+            await _settle()
+        clock.auto = True
+        await reply.finish()
+
+        times = [at for at, _ in channel.edits]
+        assert all(b - a >= 2.0 for a, b in zip(times, times[1:]))
+        assert times[0] >= 2.0
+        assert len(channel.edits) < 10
+        assert channel.edits[-1][1] == "part 9"
+
+    async def test_last_edit_kept_for_final_text(self, clock):
+        """Test a channel's edit cap never swallows the final text."""
+        channel = FakeChannel(clock, interval=1.0, max_edits=2)
+        reply = _reply(channel, clock)
+        await reply.start()
+
+        for i in range(5):
+            await reply.update(f"part {i}")
+            clock.now += 5
+            await _settle()
+        await reply.finish()
+
+        assert len(channel.edits) == 2
+        assert channel.edits[-1][1] == "part 4"
+
+    async def test_long_text_split_on_finish(self, clock):
+        """Test text over the message length is cut while streaming and split at the end."""
+        channel = FakeChannel(clock, max_message_length=10)
+        reply = _reply(channel, clock)
+        await reply.start()
+
+        await reply.update("abcdefghijklmnopqrstuvwxy")
+        await _settle()
+        assert channel.edits[0][1] == "…qrstuvwxy"
+
+        await reply.finish()
+        assert channel.edits[-1][1] == "abcdefghij"
+        assert channel.sent[1:] == ["klmnopqrst", "uvwxy"]
+
+    async def test_empty_reply(self, clock):
+        """Test a run without output replaces the placeholder with a note."""
+        channel = FakeChannel(clock)
+        reply = _reply(channel, clock)
+        await reply.start()
+        await reply.finish()
+
+        assert channel.edits[-1][1] == EMPTY_REPLY_TEXT
+
+    async def test_failed_final_edit_falls_back_to_send(self, clock):
+        """Test the final text is sent as a message if the edit fails."""
+        channel = FakeChannel(clock)
+
+        async def fail(*args):
+            raise RuntimeError("message to edit not found")
+
+        channel.edit_message = fail
+        reply = _reply(channel, clock)
+        await reply.start()
+        await reply.update("done")
+        await reply.finish()
+
+        assert channel.sent == ["…", "done"]
@@ -0,0 +1,167 @@
+"""Unit tests for container cgroup resource sampling."""
+
+from pathlib import Path
+
+import pytest
+
+from nanogridbot.core.resource_sampler import (
+    CgroupStats,
+    ContainerResourceSampler,
+    ResourceUsage,
+    read_cgroup_stats,
+)
+
+CONTAINER_ID = "abc123"
+
+
+def _write_cgroup(
+    path: Path,
+    cpu_usec: int = 0,
+    memory: int = 0,
+    peak: int | None = None,
+    rbytes: int = 0,
+    wbytes: int = 0,
+) -> None:
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "cpu.stat").write_text(f"usage_usec {cpu_usec}\nuser_usec {cpu_usec}\nsystem_usec 0\n")
+    (path / "memory.current").write_text(f"{memory}\n")
+    if peak is not None:
+        (path / "memory.peak").write_text(f"{peak}\n")
+    (path / "io.stat").write_text(
+        f"8:0 rbytes={rbytes} wbytes={wbytes} rios=1 wios=1\n"
+        "8:16 rbytes=100 wbytes=200 rios=1 wios=1\n"
+    )
+
+
+@pytest.fixture
+def cgroup_root(tmp_path):
+    (tmp_path / "cgroup.controllers").write_text("cpu io memory\n")
+    return tmp_path
+
+
+def _sampler(cgroup_root: Path) -> ContainerResourceSampler:
+    async def resolve(name):
+        return CONTAINER_ID if name == "ngb-run-test" else None
+
+    return ContainerResourceSampler(interval=0.01, cgroup_root=cgroup_root, resolve_id=resolve)
+
+
+class TestReadCgroupStats:
+    """Test parsing of cgroup v2 counter files."""
+
+    def test_reads_counters(self, tmp_path):
+        """Test CPU, memory and summed IO counters are read."""
+        _write_cgroup(tmp_path, cpu_usec=1500, memory=4096, peak=8192, rbytes=10, wbytes=20)
+
+        stats = read_cgroup_stats(tmp_path)
+
+        assert stats.cpu_usec == 1500
+        assert stats.memory_bytes == 4096
+        assert stats.memory_peak_bytes == 8192
+        assert stats.io_read_bytes == 110
+        assert stats.io_write_bytes == 220
+
+    def test_optional_files_missing(self, tmp_path):
+        """Test kernels without memory.peak or io.stat are handled."""
+        _write_cgroup(tmp_path, cpu_usec=1, memory=2)
+        (tmp_path / "io.stat").unlink()
+
+        stats = read_cgroup_stats(tmp_path)
+
+        assert stats.memory_peak_bytes is None
+        assert stats.io_read_bytes == 0
+
+    def test_missing_cgroup_raises(self, tmp_path):
+        """Test a removed cgroup raises OSError."""
+        with pytest.raises(OSError):
+            read_cgroup_stats(tmp_path / "gone")
+
+
+class TestResourceUsage:
+    """Test accumulation of samples."""
+
+    def test_cpu_percent_and_averages(self):
+        """Test CPU percent comes from deltas and memory is averaged."""
+        usage = ResourceUsage(name="c", group_folder="g", started_at=0.0)
+
+        usage.add(CgroupStats(cpu_usec=0, memory_bytes=100), now=10.0)
+        usage.add(CgroupStats(cpu_usec=500_000, memory_bytes=300), now=11.0)
+        usage.add(CgroupStats(cpu_usec=600_000, memory_bytes=200), now=12.0)
+
+        assert usage.samples == 3
+        assert usage.cpu_peak_percent == pytest.approx(50.0)
+        assert usage.cpu_percent == pytest.approx(10.0)
+        assert usage.cpu_seconds == pytest.approx(0.6)
+        assert usage.memory_avg_bytes == 200
+        assert usage.memory_peak_bytes == 300
+
+
+class TestContainerResourceSampler:
+    """Test sampling of tracked containers."""
+
+    def test_supported(self, cgroup_root, tmp_path_factory):
+        """Test only cgroup v2 hierarchies are supported."""
+        assert _sampler(cgroup_root).supported()
+        assert not _sampler(tmp_path_factory.mktemp("v1")).supported()
+
+    @pytest.mark.asyncio
+    async def test_systemd_layout(self, cgroup_root):
+        """Test containers are found under the systemd cgroup layout."""
+        path = cgroup_root / "system.slice" / f"docker-{CONTAINER_ID}.scope"
+        _write_cgroup(path, cpu_usec=1000, memory=1024, peak=2048)
+        sampler = _sampler(cgroup_root)
+
+        sampler.track("ngb-run-test", "group1")
+        await sampler.sample_once()
+
+        live = sampler.live()
+        assert len(live) == 1
+        assert live[0]["group_folder"] == "group1"
+        assert live[0]["memory_bytes"] == 1024
+        assert live[0]["memory_peak_bytes"] == 2048
+
+    @pytest.mark.asyncio
+    async def test_untrack_returns_usage(self, cgroup_root):
+        """Test untracking takes a final sample and returns the totals."""
+        path = cgroup_root / "docker" / CONTAINER_ID
+        _write_cgroup(path, cpu_usec=1000, memory=1024)
+        sampler = _sampler(cgroup_root)
+        sampler.track("ngb-run-test", "group1")
+        await sampler.sample_once()
+        _write_cgroup(path, cpu_usec=2_000_000, memory=4096, wbytes=50)
+
+        usage = await sampler.untrack("ngb-run-test")
+
+        assert len(sampler) == 0
+        assert usage is not None
+        assert usage.samples == 2
+        assert usage.cpu_usec == 2_000_000
+        assert usage.memory_peak_bytes == 4096
+        assert usage.io_write_bytes == 250
+
+    @pytest.mark.asyncio
+    async def test_unknown_container(self, cgroup_root):
+        """Test containers without a cgroup are skipped and yield no usage."""
+        sampler = _sampler(cgroup_root)
+        sampler.track("other", "group1")
+
+        await sampler.sample_once()
+
+        assert sampler.live()[0]["samples"] == 0
+        assert await sampler.untrack("other") is None
+        assert await sampler.untrack("never-tracked") is None
+
+    @pytest.mark.asyncio
+    async def test_background_loop(self, cgroup_root):
+        """Test the background task samples at the interval."""
+        import asyncio
+
+        _write_cgroup(cgroup_root / "docker" / CONTAINER_ID, cpu_usec=1, memory=1)
+        sampler = _sampler(cgroup_root)
+        sampler.track("ngb-run-test", "group1")
+
+        await sampler.start()
+        await asyncio.sleep(0.05)
+        await sampler.stop()
+
+        assert sampler.live()[0]["samples"] >= 1
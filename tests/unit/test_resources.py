@@ -0,0 +1,130 @@
+"""Unit tests for container resource classes and admission."""
+
+import pytest
+
+from nanogridbot.core.resources import (
+    RESOURCE_CLASSES,
+    AdmissionController,
+    HostCapacity,
+    read_host_capacity,
+    resource_class_for,
+)
+from nanogridbot.types import ContainerConfig
+
+SMALL = RESOURCE_CLASSES["small"]
+MEDIUM = RESOURCE_CLASSES["medium"]
+LARGE = RESOURCE_CLASSES["large"]
+
+
+def _controller(cpus=4.0, memory_mb=8192, available_mb=None, **kwargs) -> AdmissionController:
+    capacity = HostCapacity(
+        cpus=cpus,
+        memory_mb=memory_mb,
+        available_memory_mb=memory_mb if available_mb is None else available_mb,
+    )
+    kwargs.setdefault("memory_reserve_mb", 0)
+    kwargs.setdefault("allow_downgrade", False)
+    return AdmissionController(capacity_reader=lambda: capacity, **kwargs)
+
+
+class TestResourceClasses:
+    """Test resource class lookup and docker flags."""
+
+    def test_docker_args(self):
+        """Test limits are rendered as docker run flags."""
+        assert MEDIUM.docker_args() == ["--memory", "2g", "--cpus", "1.0"]
+        assert SMALL.docker_args() == ["--memory", "512m", "--cpus", "0.5"]
+
+    def test_class_from_container_config(self):
+        """Test a group's class comes from its container config, else the default."""
+        assert resource_class_for(ContainerConfig(resource_class="large")) is LARGE
+        assert resource_class_for({"resource_class": "small"}) is SMALL
+        assert resource_class_for(None) is MEDIUM
+
+    def test_unknown_class_rejected(self):
+        """Test container configs only accept known classes."""
+        with pytest.raises(ValueError):
+            ContainerConfig(resource_class="huge")
+
+
+class TestReadHostCapacity:
+    """Test reading capacity from /proc and cgroups."""
+
+    def test_cgroup_limits_narrow_host_values(self, tmp_path):
+        """Test cgroup v2 quotas cap CPUs and memory."""
+        meminfo = tmp_path / "meminfo"
+        meminfo.write_text("MemTotal:       16777216 kB\nMemAvailable:    8388608 kB\n")
+        cgroup = tmp_path / "cgroup"
+        cgroup.mkdir()
+        (cgroup / "cpu.max").write_text("50000 100000\n")
+        (cgroup / "memory.max").write_text(str(4 * 1024**3))
+        (cgroup / "memory.current").write_text(str(1024**3))
+
+        capacity = read_host_capacity(cgroup, meminfo)
+
+        assert capacity.cpus == 0.5
+        assert capacity.memory_mb == 4096
+        assert capacity.available_memory_mb == 3072
+
+    def test_unlimited_cgroup(self, tmp_path):
+        """Test host values are used when the cgroup sets no limits."""
+        meminfo = tmp_path / "meminfo"
+        meminfo.write_text("MemTotal:       16777216 kB\nMemAvailable:    8388608 kB\n")
+        cgroup = tmp_path / "cgroup"
+        cgroup.mkdir()
+        (cgroup / "cpu.max").write_text("max 100000\n")
+        (cgroup / "memory.max").write_text("max\n")
+
+        capacity = read_host_capacity(cgroup, meminfo)
+
+        assert capacity.cpus >= 1
+        assert capacity.memory_mb == 16384
+        assert capacity.available_memory_mb == 8192
+
+
+class TestAdmissionController:
+    """Test bin-packing runs into host capacity."""
+
+    def test_packs_until_memory_is_reserved(self):
+        """Test runs are admitted while their memory fits."""
+        controller = _controller(memory_mb=5120)
+
+        assert controller.try_admit("a", MEDIUM) is MEDIUM
+        assert controller.try_admit("b", MEDIUM) is MEDIUM
+        assert controller.try_admit("c", MEDIUM) is None
+        assert controller.deferred == 1
+
+        controller.release("a")
+        assert controller.try_admit("c", MEDIUM) is MEDIUM
+
+    def test_cpu_overcommit(self):
+        """Test CPU reservations may exceed the host by the overcommit factor."""
+        controller = _controller(cpus=1.0, cpu_overcommit=2.0)
+
+        assert controller.try_admit("a", MEDIUM) is MEDIUM
+        assert controller.try_admit("b", MEDIUM) is MEDIUM
+        assert controller.try_admit("c", SMALL) is None
+
+    def test_downgrade_when_busy(self):
+        """Test a run that does not fit gets the largest smaller class that does."""
+        controller = _controller(memory_mb=5120, allow_downgrade=True)
+        controller.try_admit("a", MEDIUM)
+
+        assert controller.try_admit("b", LARGE) is MEDIUM
+        assert controller.try_admit("c", LARGE) is SMALL
+        assert controller.downgraded == 2
+
+    def test_low_free_memory_defers(self):
+        """Test memory used outside the controller's reservations is respected."""
+        controller = _controller(memory_mb=16384, available_mb=1024, memory_reserve_mb=256)
+        controller.try_admit("a", SMALL)
+
+        assert controller.try_admit("b", MEDIUM) is None
+        assert controller.try_admit("b", SMALL) is SMALL
+
+    def test_first_run_always_admitted(self):
+        """Test an idle host admits a run even if its class exceeds capacity."""
+        controller = _controller(cpus=0.5, memory_mb=1024)
+
+        assert controller.try_admit("a", LARGE) is LARGE
+        assert controller.get_stats()["reserved_memory_mb"] == LARGE.memory_mb
@@ -257,6 +257,40 @@ class TestSendResponse:
         channel2.send_message.assert_not_called()
 
 
+class TestOpenReply:
+    """Test opening progressively edited replies."""
+
+    @pytest.mark.asyncio
+    async def test_send_mode_opens_nothing(self, router, mock_channel):
+        """Test results are sent as messages by default."""
+        mock_channel.supports_edit = True
+        router.config.reply_delivery_mode = "send"
+        assert await router.open_reply("jid1") is None
+        mock_channel.send_message.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_edit_mode_posts_placeholder(self, router, mock_channel):
+        """Test edit mode posts the placeholder on a channel that can edit."""
+        mock_channel.supports_edit = True
+        mock_channel.edit_interval = MagicMock(return_value=1.0)
+        mock_channel.send_message = AsyncMock(return_value="m1")
+        router.config.reply_delivery_mode = "edit"
+        router.config.reply_placeholder = "thinking…"
+
+        reply = await router.open_reply("jid1")
+
+        assert reply is not None
+        assert reply.message_id == "m1"
+        mock_channel.send_message.assert_called_once_with("jid1", "thinking…")
+
+    @pytest.mark.asyncio
+    async def test_edit_mode_without_edit_support(self, router, mock_channel):
+        """Test channels that cannot edit fall back to separate messages."""
+        mock_channel.supports_edit = False
+        router.config.reply_delivery_mode = "edit"
+        assert await router.open_reply("jid1") is None
+
+
 class TestBroadcastToGroups:
     """Test broadcast_to_groups method."""
 
@@ -0,0 +1,295 @@
+"""Unit tests for long-lived per-group session containers."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from nanogridbot.core import session_containers
+from nanogridbot.core.container_runner import OUTPUT_END_MARKER, OUTPUT_START_MARKER
+from nanogridbot.core.session_containers import SessionContainerManager
+from nanogridbot.types import ContainerOutput
+
+
+class FakeProcess:
+    """Stand-in for an attached ``docker run`` process."""
+
+    def __init__(self):
+        self.stdout = asyncio.StreamReader()
+        self.stderr = asyncio.StreamReader()
+        self.stdin = MagicMock()
+        self.stdin.drain = AsyncMock()
+        self.returncode = None
+
+    def emit(self, result: str) -> None:
+        """Write one marker-delimited result to stdout."""
+        payload = json.dumps({"status": "success", "result": result})
+        self.stdout.feed_data(f"log line\n{OUTPUT_START_MARKER}\n{payload}\n{OUTPUT_END_MARKER}\n".encode())
+
+    def exit(self) -> None:
+        """Simulate the container exiting."""
+        if self.returncode is None:
+            self.returncode = 0
+            self.stdout.feed_eof()
+            self.stderr.feed_eof()
+
+    async def wait(self) -> int:
+        return self.returncode
+
+    def kill(self) -> None:
+        self.exit()
+
+    def sent_input(self) -> dict:
+        """Get the input JSON written to stdin."""
+        return json.loads(self.stdin.write.call_args[0][0])
+
+
+@pytest.fixture
+def mock_config(tmp_path):
+    """Mock configuration."""
+    config = MagicMock()
+    config.data_dir = tmp_path
+    config.container_timeout = 5
+    config.container_max_output_size = 100000
+    config.container_session_max = 2
+    config.container_session_pause_after = 60
+    config.container_session_idle_ttl = 600
+    return config
+
+
+@pytest.fixture
+def docker():
+    """Fake docker host: spawned processes and CLI calls are recorded."""
+    env = MagicMock()
+    env.processes = []
+    env.commands = []
+
+    async def spawn(*cmd, **kwargs):
+        process = FakeProcess()
+        process.cmd = list(cmd)
+        env.processes.append(process)
+        return process
+
+    async def fake_docker(*args):
+        env.commands.append(args)
+        return True
+
+    async def cleanup(name):
+        env.commands.append(("rm", "-f", name))
+        for process in env.processes:
+            process.exit()
+
+    async def mounts(group_folder, **kwargs):
+        return [(str(env.ipc_root / group_folder), "/workspace/ipc", "rw")]
+
+    with patch.object(session_containers, "_docker", fake_docker), patch(
+        "asyncio.create_subprocess_exec", spawn
+    ), patch(
+        "nanogridbot.core.container_runner.validate_group_mounts", mounts
+    ), patch(
+        "nanogridbot.core.mount_security.create_group_env_file", return_value=None
+    ), patch(
+        "nanogridbot.core.container_runner.build_docker_command", return_value=["docker", "run"]
+    ) as build, patch(
+        "nanogridbot.core.container_runner.cleanup_container", cleanup
+    ):
+        env.build = build
+        yield env
+
+
+@pytest.fixture
+def manager(mock_config, docker, tmp_path):
+    """Create a session container manager."""
+    docker.ipc_root = tmp_path / "ipc"
+    return SessionContainerManager(mock_config)
+
+
+async def first_turn(manager, docker, folder="g1", result="hello"):
+    """Run a group's first turn, answering it from a fresh container."""
+    task = asyncio.create_task(manager.run(folder, "prompt 1", "sess-1", f"telegram:{folder}"))
+    await asyncio.sleep(0.01)
+    docker.processes[-1].emit(result)
+    return await task
+
+
+async def next_turn(manager, process, folder="g1", prompt="prompt 2", result="again"):
+    """Run a later turn, answering it from the given container."""
+    task = asyncio.create_task(manager.run(folder, prompt, "sess-1", f"telegram:{folder}"))
+    await asyncio.sleep(0.01)
+    process.emit(result)
+    return await task
+
+
+class TestTurns:
+    """Test routing turns into session containers."""
+
+    @pytest.mark.asyncio
+    async def test_first_turn_starts_container(self, manager, docker):
+        """Test the first turn starts a named container with the prompt as input."""
+        result = await first_turn(manager, docker)
+
+        assert result.result == "hello"
+        assert len(docker.processes) == 1
+        assert docker.processes[0].sent_input()["prompt"] == "prompt 1"
+        assert docker.processes[0].sent_input()["sessionId"] == "sess-1"
+        cmd = docker.processes[0].cmd
+        assert cmd[cmd.index("--name") + 1].startswith("ngb-session-g1-")
+        assert len(manager) == 1
+        assert manager.started == 1
+
+    @pytest.mark.asyncio
+    async def test_later_turns_use_ipc(self, manager, docker, tmp_path):
+        """Test later turns are written to the group's IPC input, not a new container."""
+        await first_turn(manager, docker)
+        process = docker.processes[0]
+        input_dir = tmp_path / "ipc" / "g1" / "input"
+
+        seen = []
+        original_send = manager._send
+
+        def record_send(session, prompt):
+            original_send(session, prompt)
+            seen.extend(json.loads(p.read_text()) for p in sorted(input_dir.glob("*.json")))
+
+        with patch.object(manager, "_send", record_send):
+            result = await next_turn(manager, process)
+
+        assert result.result == "again"
+        assert len(docker.processes) == 1
+        assert seen == [{"type": "message", "text": "prompt 2"}]
+        assert not list(input_dir.glob(".*.tmp"))
+        assert manager.reused == 1
+
+    @pytest.mark.asyncio
+    async def test_late_results_are_not_returned(self, manager, docker):
+        """Test a result emitted between turns is not mistaken for the next answer."""
+        await first_turn(manager, docker)
+        process = docker.processes[0]
+        process.emit("late")
+        await asyncio.sleep(0.01)
+
+        result = await next_turn(manager, process)
+
+        assert result.result == "again"
+
+    @pytest.mark.asyncio
+    async def test_paused_session_is_resumed(self, manager, docker):
+        """Test a frozen container is unpaused before the turn is routed."""
+        await first_turn(manager, docker)
+        session = manager._sessions["g1"]
+        session.paused = True
+
+        await next_turn(manager, docker.processes[0])
+
+        assert ("unpause", session.name) in docker.commands
+        assert session.paused is False
+
+    @pytest.mark.asyncio
+    async def test_exited_container_reports_error(self, manager, docker):
+        """Test a container exiting mid-turn fails the turn and is dropped."""
+        await first_turn(manager, docker)
+        task = asyncio.create_task(manager.run("g1", "prompt 2", None, "telegram:g1"))
+        await asyncio.sleep(0.01)
+        docker.processes[0].exit()
+
+        result = await task
+
+        assert result.status == "error"
+        assert len(manager) == 0
+
+    @pytest.mark.asyncio
+    async def test_dead_idle_session_is_replaced(self, manager, docker):
+        """Test a container that exited while idle is replaced on the next turn."""
+        await first_turn(manager, docker)
+        docker.processes[0].exit()
+
+        result = await first_turn(manager, docker, result="fresh")
+
+        assert result.result == "fresh"
+        assert len(docker.processes) == 2
+        assert manager.started == 2
+
+    @pytest.mark.asyncio
+    async def test_turn_timeout(self, manager, docker, mock_config):
+        """Test a turn without a result times out and stops the container."""
+        mock_config.container_timeout = 0.05
+        result = await manager.run("g1", "prompt", None, "telegram:g1")
+
+        assert result.status == "error"
+        assert "timed out" in result.error
+        assert len(manager) == 0
+        assert docker.processes[0].returncode is not None
+
+
+class TestEviction:
+    """Test idle expiry and LRU eviction."""
+
+    @pytest.mark.asyncio
+    async def test_idle_sessions_pause_then_stop(self, manager, docker):
+        """Test idle containers are frozen first and stopped after the TTL."""
+        await first_turn(manager, docker)
+        session = manager._sessions["g1"]
+
+        await manager.maintain(now=session.last_used + 61)
+        assert session.paused is True
+        assert docker.commands == [("pause", session.name)]
+
+        await manager.maintain(now=session.last_used + 601)
+        assert len(manager) == 0
+        assert docker.commands[-1] == ("rm", "-f", session.name)
+
+    @pytest.mark.asyncio
+    async def test_lru_session_evicted_at_cap(self, manager, docker, mock_config):
+        """Test the least recently used idle container makes room, frozen first."""
+        await first_turn(manager, docker, "g1")
+        await first_turn(manager, docker, "g2")
+        # Touch g1 so g2 becomes least recently used
+        await next_turn(manager, docker.processes[0], "g1")
+        g2 = manager._sessions["g2"]
+
+        await first_turn(manager, docker, "g3")
+
+        assert list(manager._sessions) == ["g1", "g3"]
+        assert docker.commands == [("pause", g2.name), ("rm", "-f", g2.name)]
+
+    @pytest.mark.asyncio
+    async def test_busy_slots_fall_back_to_one_off_run(self, manager, docker, mock_config):
+        """Test a turn runs in a one-off container when every slot is busy."""
+        mock_config.container_session_max = 1
+        busy = asyncio.create_task(manager.run("g1", "prompt", None, "telegram:g1"))
+        await asyncio.sleep(0.01)
+
+        with patch(
+            "nanogridbot.core.container_runner.run_container_agent",
+            AsyncMock(return_value=ContainerOutput(status="success", result="one-off")),
+        ) as mock_run:
+            result = await manager.run("g2", "prompt", None, "telegram:g2")
+
+        assert result.result == "one-off"
+        mock_run.assert_called_once()
+        docker.processes[0].emit("done")
+        await busy
+
+    @pytest.mark.asyncio
+    async def test_close_and_stop(self, manager, docker):
+        """Test closing a group's session and stopping the manager."""
+        await first_turn(manager, docker, "g1")
+        await first_turn(manager, docker, "g2")
+
+        assert await manager.close("g1") is True
+        assert await manager.close("g1") is False
+        await manager.stop()
+
+        assert len(manager) == 0
+        assert all(p.returncode is not None for p in docker.processes)
+
+    @pytest.mark.asyncio
+    async def test_stats(self, manager, docker):
+        """Test statistics list live sessions."""
+        await first_turn(manager, docker)
+        stats = manager.get_stats()
+
+        assert stats["live"] == 1
+        assert stats["sessions"][0]["group_folder"] == "g1"
+        assert stats["sessions"][0]["turns"] == 1
@@ -0,0 +1,88 @@
+"""Unit tests for the content-addressed skills store."""
+
+import json
+import os
+
+import pytest
+
+from nanogridbot.core.skills_store import MANIFEST_NAME, SkillsStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Store over a source with one skill."""
+    skill = tmp_path / "skills" / "search"
+    (skill / "scripts").mkdir(parents=True)
+    (skill / "SKILL.md").write_text("# Search")
+    (skill / "scripts" / "run.sh").write_text("echo hi")
+    return SkillsStore(tmp_path / "skills", tmp_path / "store")
+
+
+class TestSkillsStore:
+    """Test SkillsStore."""
+
+    def test_snapshot_is_content_addressed(self, store):
+        """Test the digest depends on content, not on modification times."""
+        first = store.snapshot()
+        assert set(first.files) == {"search/SKILL.md", "search/scripts/run.sh"}
+
+        path = store.source / "search" / "SKILL.md"
+        os.utime(path, ns=(1, 1))
+        assert store.snapshot().digest == first.digest
+
+        path.write_text("# Search v2")
+        assert store.snapshot().digest != first.digest
+
+    def test_missing_source(self, tmp_path):
+        """Test a store without a source has nothing to sync."""
+        store = SkillsStore(tmp_path / "missing", tmp_path / "store")
+
+        assert store.snapshot() is None
+        assert store.sync_to(tmp_path / "dest") == 0
+        assert store.shared_dir() is None
+
+    def test_sync_copies_only_changed_files(self, store, tmp_path):
+        """Test an edit copies one file and a removed file is deleted."""
+        dest = tmp_path / "dest"
+        assert store.sync_to(dest) == 2
+        assert store.sync_to(dest) == 0
+
+        (store.source / "search" / "SKILL.md").write_text("# Search v2")
+        (store.source / "search" / "scripts" / "run.sh").unlink()
+        (dest / "search" / "notes.md").write_text("agent notes")
+
+        assert store.sync_to(dest) == 1
+        assert (dest / "search" / "SKILL.md").read_text() == "# Search v2"
+        assert not (dest / "search" / "scripts" / "run.sh").exists()
+        assert (dest / "search" / "notes.md").exists()
+
+    def test_manifest_survives_restart(self, store, tmp_path):
+        """Test a new store trusts an up-to-date destination manifest."""
+        dest = tmp_path / "dest"
+        store.sync_to(dest)
+        manifest = json.loads((dest / MANIFEST_NAME).read_text())
+        assert manifest["digest"] == store.snapshot().digest
+
+        assert SkillsStore(store.source, store.root).sync_to(dest) == 0
+
+    def test_deleted_destination_file_restored(self, store, tmp_path):
+        """Test a file missing from the destination is copied again."""
+        dest = tmp_path / "dest"
+        store.sync_to(dest)
+        (dest / "search" / "SKILL.md").unlink()
+        (store.source / "search" / "scripts" / "run.sh").write_text("echo bye")
+
+        assert SkillsStore(store.source, store.root).sync_to(dest) == 2
+
+    def test_shared_dir_written_once_per_version(self, store):
+        """Test the shared snapshot is reused and old versions are pruned."""
+        first = store.shared_dir()
+        assert store.shared_dir() == first
+        assert store.files_copied == 2
+
+        for version in range(3):
+            (store.source / "search" / "SKILL.md").write_text(f"# v{version}")
+            current = store.shared_dir()
+
+        assert (current / "search" / "SKILL.md").read_text() == "# v2"
+        assert len(list(current.parent.iterdir())) == 2
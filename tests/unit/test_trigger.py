@@ -0,0 +1,110 @@
+"""Unit tests for the trigger engine."""
+
+import re
+
+import pytest
+
+from nanogridbot.core.trigger import TriggerEngine, _split_literal_prefix, compile_trigger
+from nanogridbot.types import RegisteredGroup
+
+
+class TestLiteralPrefix:
+    """Test literal prefix extraction."""
+
+    @pytest.mark.parametrize(
+        ("pattern", "prefix", "rest"),
+        [
+            (r"^@Andy\b", "@Andy", r"\b"),
+            (r"^@Andy", "@Andy", ""),
+            (r"^\@Andy\b", "@Andy", r"\b"),
+            (r"^@An\.dy?", "@An.d", "y?"),
+            (r"^ab{2}", "a", "b{2}"),
+            (r"^(a|b)", "", "(a|b)"),
+            (r"hello", "", "hello"),
+        ],
+    )
+    def test_split(self, pattern, prefix, rest):
+        assert _split_literal_prefix(pattern) == (prefix, rest)
+
+
+class TestCompiledTrigger:
+    """Test that compiled triggers agree with re.search."""
+
+    PATTERNS = [
+        r"^@Andy\b",
+        r"^@Andy",
+        r"^@Andyy*x",
+        r"^@Andy\s+go",
+        r"^ab{2}",
+        r"help",
+        r"^@ß\b",
+    ]
+    CONTENTS = [
+        "@Andy hi",
+        "@andy",
+        "@Andyx",
+        "@Andy_",
+        "@Andy!",
+        "@And",
+        " @Andy",
+        "hello @Andy",
+        "@ANDY go",
+        "@Andyyyx",
+        "abb",
+        "ab",
+        "@ß a",
+        "",
+    ]
+
+    @pytest.mark.parametrize("pattern", PATTERNS)
+    def test_matches_like_regex(self, pattern):
+        trigger = compile_trigger(pattern)
+        for content in self.CONTENTS:
+            expected = bool(re.search(pattern, content, re.IGNORECASE))
+            assert trigger.matches(content) is expected, (pattern, content)
+
+    def test_default_pattern_uses_fast_path(self):
+        trigger = compile_trigger(r"^@Andy\b")
+        assert trigger.prefix == "@andy"
+        assert trigger.exact is True
+        assert trigger.boundary is True
+
+    def test_invalid_pattern_matches_literally(self):
+        trigger = compile_trigger("[urgent")
+        assert trigger.matches("this is [URGENT")
+        assert not trigger.matches("urgent")
+
+
+class TestTriggerEngine:
+    """Test per-group trigger caching."""
+
+    def test_default_trigger(self):
+        engine = TriggerEngine("Andy")
+        group = RegisteredGroup(jid="g1", name="G", folder="g")
+        assert engine.matches(group, "@andy help")
+        assert not engine.matches(group, "hi andy")
+
+    def test_register_and_unregister(self):
+        engine = TriggerEngine("Andy")
+        group = RegisteredGroup(jid="g1", name="G", folder="g", trigger_pattern=r"^!bot\b")
+        engine.register(group)
+        assert engine._groups["g1"].source == r"^!bot\b"
+        assert engine.matches(group, "!bot do it")
+
+        engine.unregister("g1")
+        assert "g1" not in engine._groups
+
+    def test_pattern_change_recompiles(self):
+        engine = TriggerEngine("Andy")
+        group = RegisteredGroup(jid="g1", name="G", folder="g", trigger_pattern=r"^!old")
+        engine.load([group])
+
+        updated = group.model_copy(update={"trigger_pattern": r"^!new"})
+        assert engine.matches(updated, "!new")
+        assert not engine.matches(updated, "!old")
+
+    def test_groups_share_compiled_patterns(self):
+        engine = TriggerEngine("Andy")
+        groups = [RegisteredGroup(jid=f"g{i}", name="G", folder="g") for i in range(3)]
+        engine.load(groups)
+        assert len({id(engine._groups[g.jid]) for g in groups}) == 1